@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DiarioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'diario'
+
+    def ready(self):
+        from diario import signals     # noqa: F401
@@ -1,3 +1,12 @@
 CTA_ENTRADA = "cta_entrada"
 CTA_SALIDA = "cta_salida"
 campos_cuenta = CTA_ENTRADA, CTA_SALIDA
+
+# Separación entre valores consecutivos de Movimiento._orden_dia, para poder
+# intercalar movimientos sin renumerar los demás movimientos del día
+PASO_ORDEN_DIA = 2 ** 20
+
+# Movimiento._posicion combina fecha y _orden_dia en un solo entero:
+# fecha.toordinal() * 2**40 + _orden_dia + 2**39. Para que el orden entre días
+# se mantenga, _orden_dia debe quedar entre -LIMITE_ORDEN_DIA y LIMITE_ORDEN_DIA.
+LIMITE_ORDEN_DIA = 2 ** 39
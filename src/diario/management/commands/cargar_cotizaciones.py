@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import csv
+import json
+from itertools import batched
+from pathlib import Path
+
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from diario.models import Cotizacion, Moneda
+from diario.utils.utils_cotizacion import SerieCotizaciones
+from utils.tiempo import str2date
+
+
+def _leer_registros(archivo: Path) -> list[dict]:
+    """ Lee registros con claves fecha, moneda (sk), importe_compra e
+        importe_venta de un archivo CSV o JSON (lista de objetos).
+    """
+    if archivo.suffix.lower() == ".json":
+        with open(archivo, "r") as f:
+            return json.load(f)
+    with open(archivo, "r", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _importe(valor: str | float | None) -> float | None:
+    return None if valor in (None, "") else float(valor)
+
+
+class Command(BaseCommand):
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "archivo",
+            type=str,
+            help="Archivo CSV o JSON con columnas fecha (YYYY-MM-DD), moneda (sk), "
+                 "importe_compra e importe_venta."
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=1000,
+            help="Cantidad de cotizaciones a escribir por transacción."
+        )
+
+    def handle(self, *args, **kwargs):
+        archivo = Path(kwargs["archivo"])
+        lote = kwargs.get("lote") or 1000
+        ids_monedas = dict(Moneda.todes().values_list("sk", "pk"))
+
+        cotizaciones = []
+        for registro in _leer_registros(archivo):
+            sk_moneda = registro["moneda"]
+            try:
+                id_moneda = ids_monedas[sk_moneda]
+            except KeyError:
+                raise ValueError(f"Moneda {sk_moneda} no existe")
+            fecha = str2date(registro["fecha"])
+            importe_compra = _importe(registro.get("importe_compra"))
+            importe_venta = _importe(registro.get("importe_venta"))
+            if importe_compra is None and importe_venta is None:
+                raise ValueError(f"Cotización de {sk_moneda} al {fecha} sin importes")
+
+            cotizaciones.append(Cotizacion(
+                moneda_id=id_moneda,
+                fecha=fecha,
+                importe_compra=importe_compra if importe_compra is not None else importe_venta,
+                importe_venta=importe_venta if importe_venta is not None else importe_compra,
+                sk=f"{fecha.strftime('%Y%m%d')}{sk_moneda}",
+            ))
+
+        for cotizaciones_lote in batched(cotizaciones, lote):
+            with transaction.atomic():
+                Cotizacion.objects.bulk_create(
+                    cotizaciones_lote,
+                    update_conflicts=True,
+                    unique_fields=["fecha", "moneda"],
+                    update_fields=["importe_compra", "importe_venta"],
+                )
+
+        # bulk_create no emite señales post_save
+        SerieCotizaciones.invalidar()
+        self.stdout.write(f"{len(cotizaciones)} cotizaciones cargadas")
@@ -1,6 +1,6 @@
 from django.core.management import BaseCommand
 
-from diario.models import Cuenta
+from diario.models import Cuenta, Movimiento
 
 
 class Command(BaseCommand):
@@ -11,7 +11,7 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         cuenta_origen = Cuenta.tomar(sk=options["origen"][0])
         cuenta_destino = Cuenta.tomar(sk=options["destino"][0])
-        movs_origen = cuenta_origen.movs()
+        movs_origen = Movimiento.numerar_en_dia(cuenta_origen.movs())
         for mov in movs_origen:
             print(
                 f"Pasando mov {mov.pk}: {mov.orden_dia} del {mov.fecha} - "
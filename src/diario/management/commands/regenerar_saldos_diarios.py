@@ -1,10 +1,57 @@
-from datetime import datetime
+from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import django
 from django.core.management import BaseCommand
+from django.db import connections
 
 from diario.models import Cuenta, Dia
 from utils.tiempo import str2date
 
+TIMEOUT_SQLITE = 60     # Segundos que espera cada proceso a que se libere una base SQLite
+
+
+def _inicializar_worker():
+    django.setup()
+    connections.close_all()
+    for conexion in connections.all():
+        if conexion.vendor == "sqlite":
+            # SQLite admite un solo proceso escribiendo a la vez. En lugar de
+            # fallar con "database is locked", cada proceso espera su turno,
+            # tomando el lock de escritura al empezar cada transacción.
+            conexion.settings_dict["OPTIONS"].update(timeout=TIMEOUT_SQLITE, transaction_mode="IMMEDIATE")
+
+
+def _diferencias(cuenta: Cuenta, desde: Dia | None) -> list[str]:
+    """ Compara los saldos diarios guardados de la cuenta con los que
+        resultan de sus movimientos, sin escribir nada en la base de datos.
+    """
+    guardados = cuenta.saldodiario_set.all()
+    if desde:
+        guardados = guardados.filter(fecha__gte=desde.fecha)
+    importes_guardados = {sd.fecha: sd.importe for sd in guardados}
+    importes_calculados = {sd.fecha: sd.importe for sd in cuenta.calcular_saldos_diarios(desde)}
+
+    return [
+        f"{cuenta.sk} {fecha}: guardado {importes_guardados.get(fecha)} - "
+        f"calculado {importes_calculados.get(fecha)}"
+        for fecha in sorted(importes_guardados.keys() | importes_calculados.keys())
+        if importes_guardados.get(fecha) != importes_calculados.get(fecha)
+    ]
+
+
+def _procesar_cuenta(pk: int, pk_desde: int | None, solo_verificar: bool) -> tuple[str, list[str]]:
+    cuenta = Cuenta.tomar(pk=pk)
+    desde = Dia.tomar(pk=pk_desde) if pk_desde else None
+
+    if solo_verificar:
+        return cuenta.sk, _diferencias(cuenta, desde)
+
+    cuenta.recalcular_saldos_diarios(desde=desde)
+    return cuenta.sk, []
+
 
 class Command(BaseCommand):
 
@@ -21,10 +68,38 @@ class Command(BaseCommand):
             help="Fecha desde la cual recalcular. "
                  "Si no se especifica, se recalcula desde el inicio."
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Cantidad de procesos entre los que repartir las cuentas interactivas. "
+                 "Las cuentas acumulativas se procesan después, en el proceso principal. "
+                 "Con SQLite las escrituras no son simultáneas: cada proceso espera "
+                 f"hasta {TIMEOUT_SQLITE} segundos a que se libere la base de datos."
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            help="Archivo en el que se registran las cuentas ya procesadas. "
+                 "Si existe, se omiten las cuentas registradas en él (para reanudar "
+                 "una ejecución interrumpida). Se elimina al terminar. "
+                 "Se ignora con --verify-only."
+        )
+        parser.add_argument(
+            "--verify-only",
+            action="store_true",
+            help="Informar diferencias entre saldos diarios guardados y calculados "
+                 "sin modificar la base de datos."
+        )
 
     def handle(self, *args, **kwargs):
         cuenta_sk = kwargs.get("cuenta")
         desde_str = kwargs.get("desde")
+        workers = kwargs.get("workers") or 1
+        solo_verificar = kwargs.get("verify_only", False)
+        # La verificación no corrige nada, así que no debe registrar cuentas
+        # como procesadas para una regeneración posterior.
+        checkpoint = Path(kwargs["checkpoint"]) if kwargs.get("checkpoint") and not solo_verificar else None
 
         if cuenta_sk:
             cuentas = Cuenta.filtro(sk=cuenta_sk)
@@ -39,5 +114,56 @@ class Command(BaseCommand):
             raise ValueError("Fecha mal formateiada. Debe ser YYYY-MM-DD")
         dia = Dia.filtro(fecha__gte=desde).first() if desde else None
 
-        for cuenta in cuentas:
-            cuenta.recalcular_saldos_diarios(desde=dia)
+        procesadas = set(checkpoint.read_text().split()) if checkpoint and checkpoint.exists() else set()
+        pendientes = [c for c in cuentas if c.sk not in procesadas]
+        if procesadas:
+            self.stdout.write(f"Reanudando: se omiten {len(procesadas)} cuentas ya procesadas")
+
+        # Las cuentas acumulativas se procesan después de sus subcuentas,
+        # empezando por las más profundas del árbol.
+        interactivas = [c for c in pendientes if not c.es_acumulativa]
+        acumulativas = sorted(
+            [c for c in pendientes if c.es_acumulativa],
+            key=lambda c: len(c.ancestros()),
+            reverse=True
+        )
+
+        self._total = len(pendientes)
+        self._hechas = 0
+        self._con_diferencias = 0
+        args = (dia.pk if dia else None, solo_verificar)
+
+        if workers > 1 and len(interactivas) > 1:
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker) as executor:
+                futuros = [executor.submit(_procesar_cuenta, c.pk, *args) for c in interactivas]
+                for futuro in as_completed(futuros):
+                    self._registrar(*futuro.result(), checkpoint)
+        else:
+            for cuenta in interactivas:
+                self._registrar(*_procesar_cuenta(cuenta.pk, *args), checkpoint)
+
+        for cuenta in acumulativas:
+            self._registrar(*_procesar_cuenta(cuenta.pk, *args), checkpoint)
+
+        if checkpoint:
+            checkpoint.unlink(missing_ok=True)
+
+        if solo_verificar:
+            self.stdout.write(
+                f"{self._con_diferencias} cuentas con diferencias" if self._con_diferencias
+                else "No se encontraron diferencias"
+            )
+
+    def _registrar(self, sk: str, diferencias: list[str], checkpoint: Path | None):
+        self._hechas += 1
+        if diferencias:
+            self._con_diferencias += 1
+            self.stdout.write(f"[{self._hechas}/{self._total}] {sk} - {len(diferencias)} diferencias")
+        else:
+            self.stdout.write(f"[{self._hechas}/{self._total}] {sk} - OK")
+        for diferencia in diferencias:
+            self.stdout.write(f"    {diferencia}")
+        if checkpoint:
+            with open(checkpoint, "a") as archivo:
+                archivo.write(f"{sk}\n")
@@ -1,8 +1,26 @@
+import json
+from collections import defaultdict
 from io import StringIO
 
 from django.core.management import BaseCommand, call_command
 
 
+def _numerar_movimientos(elementos: list[dict]):
+    """ Reemplaza en los movimientos serializados la clave de orden interna
+        (_orden_dia, con huecos) por el número de orden dentro del día
+        (orden_dia), que es el que se usa para volver a cargarlos.
+    """
+    movs_por_dia = defaultdict(list)
+    for elemento in elementos:
+        if elemento["model"] == "diario.movimiento":
+            movs_por_dia[elemento["fields"]["dia"][0]].append(elemento["fields"])
+    for movs in movs_por_dia.values():
+        movs.sort(key=lambda x: x["_orden_dia"])
+        for orden_dia, fields in enumerate(movs):
+            fields["orden_dia"] = orden_dia
+            del fields["_orden_dia"]
+
+
 class Command(BaseCommand):
 
     def handle(self, *args, **kwargs):
@@ -19,9 +37,10 @@ class Command(BaseCommand):
             'diario.movimiento',
             'diario.saldodiario',
             '--natural-foreign',
-            indent=2,
             stdout=serialized_db
         )
+        elementos = json.loads(serialized_db.getvalue())
+        _numerar_movimientos(elementos)
 
         with open('db_full.json', 'w') as db_full:
-            db_full.write(serialized_db.getvalue())
+            json.dump(elementos, db_full, indent=2, ensure_ascii=False)
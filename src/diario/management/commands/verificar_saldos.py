@@ -0,0 +1,25 @@
+from django.core.management import BaseCommand
+
+from diario.utils.utils_saldo import limpiar_pendientes, verificar_saldos
+
+
+class Command(BaseCommand):
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Verificar sólo las cuentas cuyos saldos o movimientos fueron "
+                 "modificados después de su última verificación exitosa."
+        )
+
+    def handle(self, *args, **kwargs):
+        ctas_erroneas = verificar_saldos(incremental=kwargs.get("incremental", False))
+        limpiar_pendientes(ctas_erroneas)
+
+        for cuenta in ctas_erroneas:
+            self.stdout.write(f"{cuenta.sk}: diferencia {cuenta.diferencia}")
+        self.stdout.write(
+            f"{len(ctas_erroneas)} cuentas con saldo erróneo" if ctas_erroneas
+            else "No se encontraron saldos erróneos"
+        )
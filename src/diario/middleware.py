@@ -0,0 +1,12 @@
+from diario.utils.utils_cotizacion import SerieCotizaciones
+
+
+def sincronizar_cotizaciones(get_response):
+    """ Descarta las series de cotizaciones en memoria si fueron modificadas
+        desde otro proceso.
+    """
+    def middleware(request):
+        SerieCotizaciones.sincronizar()
+        return get_response(request)
+
+    return middleware
@@ -0,0 +1,40 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def generar_cierres_mensuales(apps, schema_editor):
+    SaldoDiario = apps.get_model('diario', 'SaldoDiario')
+    SaldoMensual = apps.get_model('diario', 'SaldoMensual')
+
+    ultimos = dict()
+    for saldo in SaldoDiario.objects.select_related('dia').order_by('cuenta_id', 'dia__fecha'):
+        ultimos[(saldo.cuenta_id, saldo.dia.fecha.replace(day=1))] = saldo.pk
+
+    SaldoMensual.objects.bulk_create([
+        SaldoMensual(cuenta_id=cuenta_id, mes=mes, saldo_diario_id=saldo_id)
+        for (cuenta_id, mes), saldo_id in ultimos.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diario', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaldoMensual',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.DateField()),
+                ('cuenta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='diario.cuenta')),
+                ('saldo_diario', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cierre_mensual', to='diario.saldodiario')),
+            ],
+            options={
+                'ordering': ['mes'],
+                'unique_together': {('cuenta', 'mes')},
+            },
+        ),
+        migrations.RunPython(generar_cierres_mensuales, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copiar_fechas(apps, schema_editor):
+    Dia = apps.get_model('diario', 'Dia')
+    fecha_dia = Subquery(Dia.objects.filter(pk=OuterRef('dia_id')).values('fecha')[:1])
+
+    apps.get_model('diario', 'SaldoDiario').objects.update(fecha=fecha_dia)
+    apps.get_model('diario', 'Movimiento').objects.update(_fecha=fecha_dia)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diario', '0002_saldomensual'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='saldodiario',
+            name='fecha',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='movimiento',
+            name='_fecha',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(copiar_fechas, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='saldodiario',
+            options={'ordering': ['fecha']},
+        ),
+        migrations.AlterModelOptions(
+            name='movimiento',
+            options={'ordering': ('_fecha', 'orden_dia')},
+        ),
+        migrations.AddIndex(
+            model_name='saldodiario',
+            index=models.Index(fields=['cuenta', 'fecha'], name='saldodiario_cuenta_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movimiento',
+            index=models.Index(fields=['_fecha', 'orden_dia'], name='movimiento_fecha_orden_idx'),
+        ),
+    ]
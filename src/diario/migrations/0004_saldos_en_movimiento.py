@@ -0,0 +1,45 @@
+from django.db import migrations, models
+
+
+def calcular_saldos_en_movimientos(apps, schema_editor):
+    Cuenta = apps.get_model('diario', 'Cuenta')
+    Movimiento = apps.get_model('diario', 'Movimiento')
+
+    for cuenta in Cuenta.objects.all():
+        movs = Movimiento.objects.filter(
+            models.Q(cta_entrada_id=cuenta.pk) | models.Q(cta_salida_id=cuenta.pk)
+        ).select_related('cta_entrada', 'cta_salida').order_by('_fecha', 'orden_dia')
+
+        total = 0
+        movs_por_sentido = {'entrada': [], 'salida': []}
+        for mov in movs:
+            sentido = 'entrada' if mov.cta_entrada_id == cuenta.pk else 'salida'
+            cuenta_mov = getattr(mov, f'cta_{sentido}')
+            importe = round(mov._importe * (1 if cuenta_mov.moneda_id == mov.moneda_id else mov._cotizacion), 2)
+            total = round(total + (importe if sentido == 'entrada' else -importe), 2)
+            setattr(mov, f'saldo_cta_{sentido}', total)
+            movs_por_sentido[sentido].append(mov)
+
+        for sentido, movs_sentido in movs_por_sentido.items():
+            Movimiento.objects.bulk_update(movs_sentido, [f'saldo_cta_{sentido}'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diario', '0003_fecha_saldodiario_movimiento'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movimiento',
+            name='saldo_cta_entrada',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='movimiento',
+            name='saldo_cta_salida',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(calcular_saldos_en_movimientos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def marcar_todas_las_cuentas(apps, schema_editor):
+    Cuenta = apps.get_model('diario', 'Cuenta')
+    VerificacionPendiente = apps.get_model('diario', 'VerificacionPendiente')
+
+    VerificacionPendiente.objects.bulk_create([
+        VerificacionPendiente(cuenta_id=pk) for pk in Cuenta.objects.values_list('pk', flat=True)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diario', '0004_saldos_en_movimiento'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VerificacionPendiente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cuenta', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='verificacion_pendiente', to='diario.cuenta')),
+            ],
+        ),
+        migrations.RunPython(marcar_todas_las_cuentas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def contar_movimientos(apps, schema_editor):
+    Dia = apps.get_model('diario', 'Dia')
+    Movimiento = apps.get_model('diario', 'Movimiento')
+    cantidad = Subquery(
+        Movimiento.objects.filter(dia_id=OuterRef('pk'))
+        .order_by().values('dia_id').annotate(c=Count('pk')).values('c')[:1]
+    )
+
+    Dia.objects.update(cantidad_movs=Coalesce(cantidad, 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diario', '0005_verificacionpendiente'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dia',
+            name='cantidad_movs',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(contar_movimientos, migrations.RunPython.noop),
+    ]
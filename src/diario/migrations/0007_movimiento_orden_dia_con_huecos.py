@@ -0,0 +1,54 @@
+from django.db import migrations, models
+from django.db.models import F
+
+PASO_ORDEN_DIA = 2 ** 20
+
+
+def espaciar_orden_dia(apps, schema_editor):
+    Movimiento = apps.get_model('diario', 'Movimiento')
+    Movimiento.objects.update(_orden_dia=(F('_orden_dia') + 1) * PASO_ORDEN_DIA)
+
+
+def compactar_orden_dia(apps, schema_editor):
+    Movimiento = apps.get_model('diario', 'Movimiento')
+    dia_actual = None
+    movs = list(Movimiento.objects.order_by('dia_id', '_orden_dia').only('pk', 'dia_id', '_orden_dia'))
+    for mov in movs:
+        if mov.dia_id != dia_actual:
+            dia_actual, numero = mov.dia_id, 0
+        mov._orden_dia = numero
+        numero += 1
+    Movimiento.objects.bulk_update(movs, ['_orden_dia'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diario', '0006_dia_cantidad_movs'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='movimiento',
+            name='movimiento_fecha_orden_idx',
+        ),
+        migrations.RenameField(
+            model_name='movimiento',
+            old_name='orden_dia',
+            new_name='_orden_dia',
+        ),
+        migrations.AlterField(
+            model_name='movimiento',
+            name='_orden_dia',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(espaciar_orden_dia, compactar_orden_dia),
+        migrations.AlterModelOptions(
+            name='movimiento',
+            options={'ordering': ('_fecha', '_orden_dia')},
+        ),
+        migrations.AddIndex(
+            model_name='movimiento',
+            index=models.Index(fields=['_fecha', '_orden_dia'], name='movimiento_fecha_orden_idx'),
+        ),
+    ]
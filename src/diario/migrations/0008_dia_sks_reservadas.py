@@ -0,0 +1,39 @@
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def reservar_sks_existentes(apps, schema_editor):
+    """ Para cada día, reserva los números de sk ya usados por movimientos
+        existentes. Las sk antiguas de un día con muchos movimientos pueden
+        haber pasado al rango del día siguiente (p. ej. '2024010200' para el
+        movimiento 100 del 1/1/2024), por lo que se toma en cuenta el rango
+        en el que cae cada sk, no el día del movimiento.
+    """
+    Dia = apps.get_model('diario', 'Dia')
+    Movimiento = apps.get_model('diario', 'Movimiento')
+    reservadas = defaultdict(int)
+    for sk in Movimiento.objects.exclude(sk=None).values_list('sk', flat=True):
+        if sk.isdigit() and len(sk) >= 10:
+            reservadas[sk[:8]] = max(reservadas[sk[:8]], int(sk[8:]) + 1)
+
+    dias = list(Dia.objects.filter(sk__in=reservadas.keys()))
+    for dia in dias:
+        dia.sks_reservadas = reservadas[dia.sk]
+    Dia.objects.bulk_update(dias, ['sks_reservadas'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diario', '0007_movimiento_orden_dia_con_huecos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dia',
+            name='sks_reservadas',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(reservar_sks_existentes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+LIMITE_ORDEN_DIA = 2 ** 39
+
+
+def calcular_posiciones(apps, schema_editor):
+    Movimiento = apps.get_model('diario', 'Movimiento')
+    movs = list(Movimiento.objects.only('pk', '_fecha', '_orden_dia'))
+    for mov in movs:
+        mov._posicion = (mov._fecha.toordinal() << 40) + mov._orden_dia + LIMITE_ORDEN_DIA
+    Movimiento.objects.bulk_update(movs, ['_posicion'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diario', '0008_dia_sks_reservadas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movimiento',
+            name='_posicion',
+            field=models.BigIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(calcular_posiciones, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='movimiento',
+            options={'ordering': ('_posicion',)},
+        ),
+    ]
@@ -4,4 +4,6 @@ from diario.models.dia import Dia
 from diario.models.moneda import Moneda
 from diario.models.movimiento import Movimiento, MiDateField
 from diario.models.saldo_diario import SaldoDiario
+from diario.models.saldo_mensual import SaldoMensual
 from diario.models.titular import Titular
+from diario.models.verificacion_pendiente import VerificacionPendiente
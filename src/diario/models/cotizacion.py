@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, timedelta
 from typing import Iterable, TYPE_CHECKING
 
 from django.core.exceptions import EmptyResultSet, ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models import OuterRef, Q, Subquery
 from django.urls import reverse
 
 from vvmodel.cleaners import Cleaner
@@ -102,6 +103,82 @@ class Cotizacion(MiModel):
 
         return cotizaciones
 
+    @classmethod
+    def indexar_rango(
+            cls,
+            cuentas: Iterable[Cuenta],
+            monedas: Iterable[Moneda],
+            desde: date,
+            hasta: date
+    ) -> dict[tuple[int, int, date], float]:
+        """ Devuelve la cotización de la moneda de cada cuenta en cada una de
+            las monedas dadas, para cada fecha entre <desde> y <hasta>
+            inclusive, en la forma {(id_moneda_origen, id_moneda_destino, fecha): cotización}.
+            Hace una sola query (ver importes_por_dia).
+        """
+        monedas = list(monedas)
+        ids_monedas_origen = {c.moneda_id for c in cuentas}
+        importes = cls.importes_por_dia({*ids_monedas_origen, *[m.pk for m in monedas]}, desde, hasta)
+
+        resultado = dict()
+        for i in range((hasta - desde).days + 1):
+            fecha = desde + timedelta(i)
+            for id_moneda_origen in ids_monedas_origen:
+                for moneda_destino in monedas:
+                    cot_orig = importes[id_moneda_origen][i]
+                    cot_dest = importes[moneda_destino.pk][i]
+                    if id_moneda_origen != moneda_destino.pk and cot_orig and cot_dest:
+                        resultado[(id_moneda_origen, moneda_destino.pk, fecha)] = cot_orig[1] / cot_dest[0]
+                    else:
+                        resultado[(id_moneda_origen, moneda_destino.pk, fecha)] = 1.0
+
+        return resultado
+
+    @classmethod
+    def importes_por_dia(
+            cls,
+            ids_monedas: Iterable[int],
+            desde: date,
+            hasta: date
+    ) -> dict[int, list[tuple[float, float] | None]]:
+        """ Devuelve, para cada moneda, una lista con los importes (compra,
+            venta) de la cotización vigente en cada día entre <desde> y
+            <hasta> inclusive (None si no hay cotización a ese día).
+            Trae en una sola query las cotizaciones del rango más la última
+            anterior a <desde> de cada moneda, y las recorre en orden de fecha
+            arrastrando la última cotización conocida.
+        """
+        from diario.models import Moneda
+
+        ids_monedas = set(ids_monedas)
+        ultima_anterior = cls.filtro(
+            moneda_id=OuterRef("pk"),
+            fecha__lt=desde,
+        ).order_by("-fecha").values("pk")[:1]
+        ids_ultimas_anteriores = Moneda.filtro(
+            pk__in=ids_monedas
+        ).annotate(ultima=Subquery(ultima_anterior)).values("ultima")
+
+        cotizaciones = iter(cls.filtro(
+            Q(fecha__gte=desde, fecha__lte=hasta) | Q(pk__in=ids_ultimas_anteriores),
+            moneda_id__in=ids_monedas,
+        ).order_by("fecha").values_list("moneda_id", "fecha", "importe_compra", "importe_venta"))
+
+        vigentes = dict()
+        resultado = {id_moneda: [] for id_moneda in ids_monedas}
+        siguiente = next(cotizaciones, None)
+        fecha = desde
+        while fecha <= hasta:
+            while siguiente is not None and siguiente[1] <= fecha:
+                id_moneda, _, importe_compra, importe_venta = siguiente
+                vigentes[id_moneda] = (importe_compra, importe_venta)
+                siguiente = next(cotizaciones, None)
+            for id_moneda in ids_monedas:
+                resultado[id_moneda].append(vigentes.get(id_moneda))
+            fecha += timedelta(1)
+
+        return resultado
+
     def save(self, *args, **kwargs):
         # Generar clave secundaria
         if self.sk is None:
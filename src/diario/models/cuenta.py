@@ -15,7 +15,9 @@ from diario.models.dia import Dia
 from diario.models.moneda import Moneda
 from diario.models.movimiento import Movimiento
 from diario.models.saldo_diario import SaldoDiario
+from diario.models.saldo_mensual import SaldoMensual
 from diario.models.titular import Titular
+from diario.models.verificacion_pendiente import VerificacionPendiente
 from diario.settings_app import MONEDA_BASE, TITULAR_PRINCIPAL
 from vvmodel.cleaners import Cleaner
 from diario.utils.utils_moneda import id_moneda_base
@@ -231,16 +233,19 @@ class Cuenta(PolymorphModel):
             return None
 
     def saldo_en_mov(self, movimiento: Movimiento) -> float:
-        movs_dia = movimiento.dia.movs(self)
-        movs_posteriores = movs_dia.filter(orden_dia__gt=movimiento.orden_dia)
-        suma_importes_posteriores = sum(x.importe_cta(self.sentido_en_mov(x)) for x in movs_posteriores)
-        saldo_diario = SaldoDiario.filtro(cuenta=self, dia__fecha__lte=movimiento.dia.fecha).last()
-        try:
-            importe_sd = saldo_diario.importe
-        except AttributeError:
-            importe_sd = 0
+        """ Devuelve el saldo de la cuenta guardado en su último movimiento
+            directo hasta <movimiento> inclusive.
+        """
+        ultimo_mov = Cuenta.movs(self).filter(
+            _posicion__lte=movimiento._posicion
+        ).order_by("-_posicion").values_list(
+            "cta_entrada_id", "saldo_cta_entrada", "saldo_cta_salida"
+        ).first()
 
-        return importe_sd - suma_importes_posteriores
+        if ultimo_mov is None:
+            return 0
+        cta_entrada_id, saldo_cta_entrada, saldo_cta_salida = ultimo_mov
+        return saldo_cta_entrada if cta_entrada_id == self.pk else saldo_cta_salida
 
     def saldo(
             self,
@@ -263,10 +268,7 @@ class Cuenta(PolymorphModel):
         if movimiento:
             return round(self.saldo_en_mov(movimiento) * cotizacion, 2)
         if dia:
-            try:
-                saldo = self.saldodiario_set.get(dia=dia)
-            except SaldoDiario.DoesNotExist:
-                saldo = SaldoDiario.anterior_a(cuenta=self, dia=dia)
+            saldo = SaldoDiario.ultimo_al(self, dia.fecha)
         else:
             try:
                 saldo = self.ultimo_saldo
@@ -284,20 +286,70 @@ class Cuenta(PolymorphModel):
 
     @transaction.atomic
     def recalcular_saldos_diarios(self, desde: Dia | None = None):
-        filtro = {"dia__gte": desde} if desde else None
-        saldos = self.saldodiario_set.filter(**filtro) if filtro \
-            else self.saldodiario_set.all()
-        movimientos = self.movs().filter(**filtro) if filtro else self.movs()
+        """ Regenera los saldos diarios de la cuenta (a partir de <desde>, si
+            se especifica) con un solo DELETE y un solo bulk_create, y a
+            continuación sus cierres mensuales.
+        """
+        saldos_nuevos, movimientos = self._calcular_saldos(desde)
 
-        for saldo in saldos:
-            saldo.delete()
+        saldos = self.saldodiario_set.all()
+        if desde:
+            saldos = saldos.filter(fecha__gte=desde.fecha)
+        saldos.delete()
 
-        for mov in movimientos:
-            SaldoDiario.calcular(
-                mov,
-                "cta_entrada" if self == mov.cta_entrada else "cta_salida"
+        SaldoDiario.objects.bulk_create(saldos_nuevos)
+        SaldoMensual.regenerar(self, desde.fecha if desde else None)
+        VerificacionPendiente.marcar([self.pk])
+
+        for sentido in "entrada", "salida":
+            Movimiento.objects.bulk_update(
+                [mov for mov in movimientos if getattr(mov, f"cta_{sentido}_id") == self.pk],
+                [f"saldo_cta_{sentido}"]
             )
 
+    def calcular_saldos_diarios(self, desde: Dia | None = None) -> list[SaldoDiario]:
+        """ Recorre una sola vez los movimientos de la cuenta ordenados por
+            fecha y orden_dia, acumulando el saldo, y devuelve un saldo diario
+            (no guardado) por cada día con movimientos.
+            Sólo se toman en cuenta los movimientos directos de la cuenta (en
+            cuentas acumulativas, los anteriores a su conversión).
+        """
+        return self._calcular_saldos(desde)[0]
+
+    def _calcular_saldos(self, desde: Dia | None = None) -> tuple[list[SaldoDiario], list[Movimiento]]:
+        """ Devuelve los saldos diarios calculados por calcular_saldos_diarios
+            y los movimientos recorridos, con el saldo de la cuenta en cada
+            uno asignado a saldo_cta_entrada o saldo_cta_salida.
+        """
+        movimientos = Cuenta.movs(self).select_related(
+            "dia", "moneda", "cta_entrada__moneda", "cta_salida__moneda"
+        )
+        total = 0
+        if desde:
+            movimientos = movimientos.filter(_fecha__gte=desde.fecha)
+            try:
+                total = SaldoDiario.anterior_a(cuenta=self, dia=desde).importe
+            except AttributeError:  # No hay saldo diario anterior
+                pass
+
+        saldos = []
+        movs = []
+        for mov in movimientos:
+            sentido = "entrada" if mov.cta_entrada_id == self.pk else "salida"
+            total = round(total + mov.importe_cta(sentido), 2)
+            setattr(mov, f"saldo_cta_{sentido}", total)
+            movs.append(mov)
+            if saldos and saldos[-1].dia_id == mov.dia_id:
+                saldos[-1].importe = total
+            else:
+                saldos.append(
+                    SaldoDiario(
+                        cuenta=self, dia=mov.dia, fecha=mov.dia.fecha, importe=total, sk=f"{mov.dia.sk}{self.sk}"
+                    )
+                )
+
+        return saldos, movs
+
     @property
     def ultimo_saldo(self) -> SaldoDiario:
         return self.saldodiario_set.last()
@@ -337,17 +389,24 @@ class Cuenta(PolymorphModel):
         super().delete(*args, **kwargs)
 
     def movs(self, order_by: list[str] = None) -> models.QuerySet[Movimiento]:
-        order_by = order_by or ['dia', 'orden_dia']
+        order_by = order_by or ["_posicion"]
         movs = self.entradas.all() | self.salidas.all()
         return movs.order_by(*order_by)
 
     def dias(self) -> models.QuerySet[Dia]:
         """ Devuelve días en los que haya movimientos propios y de sus subcuentas
             ordenados por fecha.
+            Una cuenta tiene un saldo diario por cada día en el que tiene
+            movimientos, de modo que los días se toman de los saldos diarios
+            (índice cuenta-fecha) sin recorrer los movimientos.
         """
-        fechas = [mov.dia.fecha for mov in self.movs()]
+        fechas = SaldoDiario.filtro(cuenta_id__in=self._ids_con_movimientos()).values("fecha")
         return Dia.filtro(fecha__in=fechas)
 
+    def _ids_con_movimientos(self) -> list[int]:
+        """ Ids de las cuentas cuyos movimientos se consideran propios """
+        return [self.pk]
+
     def movs_en_fecha(self, dia: Dia) -> models.QuerySet[Movimiento]:
         """ Devuelve movimientos propios y de sus subcuentas en una fecha dada.
         Ver comentario anterior."""
@@ -358,10 +417,13 @@ class Cuenta(PolymorphModel):
 
     def total_movs(self) -> float:
         """ Devuelve suma de los importes de los movimientos de la cuenta"""
-        total_entradas = sum([x.importe_cta_entrada for x in self.entradas.all()])
-        total_salidas = sum([x.importe_cta_salida for x in self.salidas.all()])
+        total = 0
+        for sentido in "entrada", "salida":
+            total += getattr(self, f"{sentido}s").aggregate(
+                total=models.Sum(Movimiento.expresion_importe_cta(sentido))
+            )["total"] or 0
 
-        return round(total_entradas + total_salidas, 2)
+        return round(total, 2)
 
     def tiene_madre(self) -> bool:
         return self.cta_madre is not None
@@ -468,6 +530,7 @@ class CuentaInteractiva(Cuenta):
             # no es cuenta crédito
             return None
 
+    @transaction.atomic
     @transaction.atomic
     def agregar_mov_correctivo(self) -> Optional[Movimiento]:
         if self.saldo_ok():
@@ -489,6 +552,9 @@ class CuentaInteractiva(Cuenta):
         saldo = self.ultimo_saldo
         saldo.importe = importe
         saldo.save()
+        # Los saldos en movimientos del día se calcularon con el saldo diario
+        # anterior a restituir su importe
+        mov._actualizar_saldos_en_movs({(self.pk, saldo.dia_id)})
         return mov
 
     def saldo_ok(self) -> bool:
@@ -708,6 +774,9 @@ class CuentaAcumulativa(Cuenta):
 
         return remove_duplicates(titulares)
 
+    def _ids_con_movimientos(self) -> list[int]:
+        return [self.pk] + [c.pk for c in self.arbol_de_subcuentas()]
+
     def arbol_de_subcuentas(self) -> Set[Cuenta]:
         todas_las_subcuentas = set(self.subcuentas.all())
         for cuenta in self.subcuentas.all():
@@ -766,7 +835,7 @@ class CuentaAcumulativa(Cuenta):
 
     def movs(self, order_by: list[str] = None) -> models.QuerySet[Movimiento]:
         """ Devuelve movimientos propios y de sus subcuentas"""
-        order_by = order_by or ["dia", "orden_dia"]
+        order_by = order_by or ["_posicion"]
         result = super().movs(order_by=order_by)
         for sc in self.subcuentas.all():
             result = result | sc.movs(order_by=order_by)
@@ -775,7 +844,7 @@ class CuentaAcumulativa(Cuenta):
     def movs_directos(self, order_by: list[str] = None) -> models.QuerySet[Movimiento]:
         """ Devuelve entradas y salidas de la cuenta sin los de sus subcuentas
         """
-        order_by = order_by or ["dia", "orden_dia"]
+        order_by = order_by or ["_posicion"]
         return super().movs(order_by=order_by)
 
     def movs_directos_en_fecha(self, dia: Dia) -> models.QuerySet[Movimiento]:
@@ -784,7 +853,7 @@ class CuentaAcumulativa(Cuenta):
 
     def fecha_ultimo_mov_directo(self) -> Optional[date]:
         try:
-            return self.movs_directos().order_by('dia').last().fecha
+            return self.movs_directos().order_by('_fecha').last().fecha
         except AttributeError:
             return None
 
@@ -804,9 +873,6 @@ class CuentaAcumulativa(Cuenta):
             moneda=self.moneda,
         )
 
-    def recalcular_saldos_diarios(self, desde: Dia | None = None):
-        raise AttributeError("No se permite recalcular saldos de cuenta acumulativa")
-
     # Protected
 
     def _desactivar_subcuentas(self):
@@ -4,7 +4,7 @@ from datetime import date, timedelta
 from typing import Optional, Self, TYPE_CHECKING
 
 from django.db import models
-from django.db.models import Count, QuerySet
+from django.db.models import F, QuerySet
 
 from vvmodel.models import MiModel
 
@@ -21,6 +21,8 @@ class DiaManager(models.Manager):
 class Dia (MiModel):
     fecha = models.DateField(unique=True)
     sk = models.CharField(max_length=15, unique=True, null=True, blank=True)
+    cantidad_movs = models.PositiveIntegerField(default=0, db_index=True)   # Mantenido por Movimiento
+    sks_reservadas = models.PositiveIntegerField(default=0)     # Números de sk de movimiento usados en el día
 
     movimiento_set: MovimientoManager   # related name para Movimiento.dia
 
@@ -48,6 +50,13 @@ class Dia (MiModel):
     def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
         if self.sk is None:
             self.sk = self.fecha.strftime("%Y%m%d")
+        if not self._state.adding and update_fields is None:
+            # Los contadores se actualizan sólo desde la base de datos, para no
+            # pisarlos con el valor de una instancia desactualizada.
+            update_fields = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in ("cantidad_movs", "sks_reservadas")
+            ]
         super().save(force_insert=force_insert, force_update=force_update, using=using, update_fields=update_fields)
 
     @classmethod
@@ -76,8 +85,29 @@ class Dia (MiModel):
     def con_movimientos(cls, cuenta: Cuenta | None = None) -> QuerySet[Self]:
         if cuenta:
             return cuenta.dias()
-        dias = Dia.objects.annotate(mov_count=Count('movimiento_set'))
-        return dias.filter(mov_count__gt=0).order_by('fecha')
+        return cls.filtro(cantidad_movs__gt=0).order_by('fecha')
+
+    @classmethod
+    def sumar_movimientos(cls, id_dia: int, cantidad: int, reservar_sks: int = 0) -> list[str]:
+        """ Suma <cantidad> (que puede ser negativa) al contador de movimientos
+            del día, con un UPDATE atómico.
+            Si <reservar_sks> es mayor que 0, reserva en el mismo UPDATE esa
+            cantidad de sk para movimientos nuevos y las devuelve. Las sk se
+            forman con la sk del día y un número que nunca se reutiliza, de
+            modo que no pueden repetirse.
+        """
+        cls.filtro(pk=id_dia).update(
+            cantidad_movs=F('cantidad_movs') + cantidad,
+            sks_reservadas=F('sks_reservadas') + reservar_sks,
+        )
+        if reservar_sks == 0:
+            return []
+        sk, reservadas = cls.filtro(pk=id_dia).values_list("sk", "sks_reservadas").get()
+        return [cls.sk_movimiento(sk, numero) for numero in range(reservadas - reservar_sks, reservadas)]
+
+    @staticmethod
+    def sk_movimiento(sk_dia: str, numero: int) -> str:
+        return f"{sk_dia}{numero:02d}"
 
     @property
     def movimientos(self) -> models.QuerySet['Movimiento']:
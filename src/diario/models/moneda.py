@@ -10,6 +10,7 @@ from django.urls import reverse
 from diario.models import Cotizacion
 from diario.models.dia import Dia
 from diario.settings_app import MONEDA_BASE
+from diario.utils.utils_cotizacion import SerieCotizaciones
 from vvmodel.models import MiModel
 
 if TYPE_CHECKING:
@@ -57,20 +58,16 @@ class Moneda(MiModel):
         try:
             return self._cotizacion.importe_compra
         except AttributeError:
-            try:
-                return self.cotizaciones.last().importe_compra
-            except (ValueError, AttributeError):
-                return 1
+            importes = SerieCotizaciones.ultima(self.pk)
+            return importes[0] if importes else 1
 
     @property
     def cotizacion_venta(self) -> float:
         try:
             return self._cotizacion.importe_venta
         except AttributeError:
-            try:
-                return self.cotizaciones.last().importe_venta
-            except (ValueError, AttributeError):
-                return 1
+            importes = SerieCotizaciones.ultima(self.pk)
+            return importes[1] if importes else 1
 
     @property
     def cotizacion(self) -> float:
@@ -91,8 +88,12 @@ class Moneda(MiModel):
         return cls.tomar(sk=MONEDA_BASE)
 
     def cotizacion_al(self, fecha: date, compra: bool) -> float:
-        cotizacion = Cotizacion.tomar(moneda=self, fecha=fecha)
-        return cotizacion.importe_compra if compra else cotizacion.importe_venta
+        fecha = fecha or date.today()
+        importes = SerieCotizaciones.al(self.pk, fecha)
+        if importes is None:
+            raise EmptyResultSet(f"No hay cotizaciones de {self} anteriores al {fecha}")
+        importe_compra, importe_venta = importes
+        return importe_compra if compra else importe_venta
 
     def cotizacion_compra_al(self, fecha: date) -> float:
         return self.cotizacion_al(fecha, compra=True)
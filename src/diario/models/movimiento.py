@@ -1,18 +1,20 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, List, Tuple, Optional, Self, cast
+from typing import TYPE_CHECKING, Iterable, List, Tuple, Optional, Self, cast
 
+from collections import defaultdict
 from datetime import date
 
-from django.core.exceptions import ValidationError
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Round, RowNumber
 from django.urls import reverse
 
 from vvmodel.cleaners import Cleaner
-from vvmodel.fields import PositionField
 from vvmodel.models import MiModel
 from utils import errors
-from utils.tiempo import Posicion
+from utils.tiempo import Posicion, str2date
 from utils.varios import el_que_no_es
 
 from diario.consts import *
@@ -47,7 +49,7 @@ class MiDateField(models.DateField):
 
 class MovimientoManager(models.Manager):
     def get_by_natural_key(self, dia, orden_dia):
-        return self.get(dia=dia, orden_dia=orden_dia)
+        return self.get(dia=dia, pk__in=Movimiento.ids_en_orden_dia(dia, orden_dia))
 
 
 class MovimientoCleaner(Cleaner):
@@ -182,9 +184,42 @@ class MovimientoCleaner(Cleaner):
                     )
 
 
+class MovimientoCleanerEnLote(MovimientoCleaner):
+    """ Validaciones de MovimientoCleaner aplicables a movimientos nuevos que
+        no requieren consultar la base de datos. Usado por
+        Movimiento.crear_muchos.
+    """
+    validaciones = (
+        "debe_haber_al_menos_una_cuenta_y_deben_ser_distintas",
+        "no_se_permiten_movimentos_con_importe_cero",
+        "no_se_admiten_movimientos_nuevos_sobre_cuentas_acumulativas",
+        "no_se_admiten_movimientos_sobre_cuentas_inactivas",
+        "definir_moneda",
+        "no_se_permite_moneda_distinta_de_las_de_cuentas",
+        "no_se_permite_fecha_anterior_a_creacion_de_cuenta",
+        "restricciones_con_cuenta_credito",
+    )
+
+    def __init__(self, obj: Movimiento):
+        Cleaner.__init__(self, obj=obj)
+        self.viejo = None
+
+    def no_se_admiten_movimientos_sobre_cuentas_inactivas(self):
+        # Se usa el estado de las cuentas recibidas, sin volver a leerlas
+        for cuenta in self.obj.cta_entrada, self.obj.cta_salida:
+            if cuenta and not cuenta.activa:
+                raise errors.ErrorMovimientoConCuentaInactiva()
+
+    def validar(self):
+        for validacion in self.validaciones:
+            getattr(self, validacion)()
+
+
 class Movimiento(MiModel):
     dia = models.ForeignKey(Dia, on_delete=models.CASCADE, null=True, blank=True, related_name="movimiento_set")
-    orden_dia = PositionField(campo_colector="dia", colector_ordenado=True)
+    _fecha = models.DateField(null=True, blank=True)    # Copia de dia.fecha, para evitar joins con Dia
+    _orden_dia = models.BigIntegerField(default=0)  # Clave de orden dentro del día, con huecos (ver orden_dia)
+    _posicion = models.BigIntegerField(default=0, db_index=True)    # Clave de orden global (ver calcular_posicion)
     concepto = models.CharField(max_length=120)
     detalle = models.TextField(blank=True, null=True)
     _importe = models.FloatField()
@@ -208,6 +243,8 @@ class Movimiento(MiModel):
         validators=[es_campo_cuenta_o_none]
     )
     es_automatico = models.BooleanField(default=False)
+    saldo_cta_entrada = models.FloatField(null=True, blank=True)    # Saldo de cta_entrada después del movimiento
+    saldo_cta_salida = models.FloatField(null=True, blank=True)     # Saldo de cta_salida después del movimiento
 
     objects = MovimientoManager()
     form_fields = (
@@ -216,9 +253,13 @@ class Movimiento(MiModel):
 
     cleaner = MovimientoCleaner
     viejo: Self = None
+    _valores_guardados: dict | None = None     # Valores de los campos al leer o guardar el movimiento
+    _numero_en_dia: int | None = None   # orden_dia calculado o pedido
+    _reubicar: bool = False             # Se asignó orden_dia y hay que ubicar el movimiento en el día
 
     class Meta:
-        ordering = ('dia', 'orden_dia')
+        ordering = ('_posicion', )
+        indexes = [models.Index(fields=['_fecha', '_orden_dia'], name='movimiento_fecha_orden_idx')]
 
     def get_absolute_url(self) -> str:
         return reverse("movimiento", args=[self.sk])
@@ -251,6 +292,30 @@ class Movimiento(MiModel):
     def natural_key(self):
         return self.dia.natural_key() + (self.orden_dia, )
 
+    @property
+    def orden_dia(self) -> int | None:
+        """ Número de orden del movimiento dentro de su día, empezando por 0.
+            No se guarda: se calcula a partir de _orden_dia, cuyos valores
+            dejan huecos entre movimientos consecutivos para que intercalar,
+            mover o eliminar un movimiento no obligue a renumerar los demás.
+            Se asigna al guardar el movimiento o al numerarlo junto con otros
+            (ver numerar_en_dia, para mostrar muchos movimientos sin una query
+            por cada uno). Si no, se calcula al accederlo y se conserva.
+        """
+        if self._numero_en_dia is None and not self._state.adding:
+            self._numero_en_dia = Movimiento.objects.filter(
+                dia_id=self.dia_id, _orden_dia__lt=self._orden_dia
+            ).count()
+        return self._numero_en_dia
+
+    @orden_dia.setter
+    def orden_dia(self, valor: int | None):
+        """ Al guardar, el movimiento se ubicará en la posición <valor> de su
+            día (None: al final si es nuevo, o donde está si ya existía).
+        """
+        self._numero_en_dia = valor
+        self._reubicar = valor is not None
+
     @property
     def importe(self) -> float:
         return self._importe
@@ -336,9 +401,18 @@ class Movimiento(MiModel):
         except AttributeError:
             return None
 
+    @staticmethod
+    def calcular_posicion(fecha: date, orden_dia: int) -> int:
+        """ Devuelve un entero que ordena los movimientos por fecha y, dentro
+            de cada fecha, por _orden_dia, para que las preguntas "antes" o
+            "después de este movimiento" se resuelvan con un solo rango sobre
+            el índice de _posicion.
+        """
+        return (fecha.toordinal() << 40) + orden_dia + LIMITE_ORDEN_DIA
+
     @property
     def posicion(self) -> Posicion:
-        return Posicion(fecha=self.fecha, orden_dia=self.orden_dia)
+        return Posicion(fecha=self.fecha, orden_dia=self._orden_dia)
 
     @property
     def cotizacion(self) -> float:
@@ -376,10 +450,143 @@ class Movimiento(MiModel):
 
         return movimiento
 
+    @classmethod
+    @transaction.atomic
+    def crear_muchos(cls, datos: Iterable[dict], lote: int = 1000) -> list[Movimiento]:
+        """ Crea movimientos nuevos en bloque, a partir de diccionarios con los
+            mismos argumentos que Movimiento.crear (concepto, importe,
+            cta_entrada, cta_salida, fecha, esgratis, detalle, moneda...).
+            - Valida los movimientos en memoria (MovimientoCleanerEnLote).
+            - Crea los días faltantes y los movimientos con bulk_create,
+              agregando los movimientos al final de cada día en el orden
+              recibido.
+            - Genera en el mismo bloque los contramovimientos de crédito de
+              los movimientos entre titulares.
+            - Al final recalcula una sola vez los saldos diarios de cada
+              cuenta afectada, a partir de la fecha de su primer movimiento
+              nuevo, y toma los saldos resultantes en los movimientos creados.
+            La cantidad de queries no depende de la cantidad de movimientos,
+            salvo por las cuentas crédito de cada par de titulares.
+            No admite movimientos que conviertan cuentas en acumulativas.
+            Devuelve los movimientos creados en el orden recibido, sin los
+            contramovimientos.
+        """
+        movimientos = []
+        fechas = []
+        for kwargs in datos:
+            kwargs = dict(kwargs)
+            esgratis = kwargs.pop("esgratis", False)
+            fecha = kwargs.pop("fecha", None)
+            dia = kwargs.pop("dia", None)
+            importe = float(kwargs.pop("importe"))
+            cta_entrada = kwargs.pop(CTA_ENTRADA, None)
+            cta_salida = kwargs.pop(CTA_SALIDA, None)
+            if importe < 0:
+                importe, cta_entrada, cta_salida = -importe, cta_salida, cta_entrada
+
+            movimiento = cls(importe=importe, cta_entrada=cta_entrada, cta_salida=cta_salida, **kwargs)
+            movimiento.esgratis = esgratis
+            movimientos.append(movimiento)
+            fechas.append(dia.fecha if dia else str2date(fecha) if isinstance(fecha, str) else fecha)
+
+        if not movimientos:
+            return []
+
+        if None in fechas:  # Como MovimientoCleaner.dia_none_se_reemplaza_por_ultimo_dia
+            ultimo_dia = Dia.ultime()
+            fecha_por_defecto = ultimo_dia.fecha if ultimo_dia else date.today()
+            fechas = [fecha or fecha_por_defecto for fecha in fechas]
+
+        dias = cls._tomar_o_crear_dias(fechas)
+        for movimiento, fecha in zip(movimientos, fechas):
+            movimiento.dia = dias[fecha]
+            movimiento._fecha = movimiento.dia.fecha
+            MovimientoCleanerEnLote(movimiento).validar()
+            movimiento._calcular_cotizacion()
+
+        contramovimientos = cls._generar_contramovimientos(movimientos)
+        nuevos = [
+            mov for movimiento in movimientos
+            for mov in (contramovimientos.get(id(movimiento)), movimiento)
+            if mov is not None
+        ]
+        cls._asignar_orden_dia_y_sk(nuevos)
+
+        cls.objects.bulk_create(contramovimientos.values(), batch_size=lote)
+        for movimiento in movimientos:
+            contramov = contramovimientos.get(id(movimiento))
+            if contramov is not None:
+                movimiento.id_contramov = contramov.pk
+        cls.objects.bulk_create(movimientos, batch_size=lote)
+        for mov in nuevos:
+            mov._tomar_valores_guardados()
+
+        cantidades = defaultdict(int)
+        for mov in nuevos:
+            cantidades[mov.dia_id] += 1
+        ids_por_cantidad = defaultdict(list)
+        for id_dia, cantidad in cantidades.items():
+            ids_por_cantidad[cantidad].append(id_dia)
+        for cantidad, ids_dias in ids_por_cantidad.items():
+            Dia.filtro(pk__in=ids_dias).update(
+                cantidad_movs=F("cantidad_movs") + cantidad,
+                sks_reservadas=F("sks_reservadas") + cantidad,
+            )
+
+        desde = dict()
+        cuentas = dict()
+        for mov in nuevos:
+            for cuenta in mov.cta_entrada, mov.cta_salida:
+                if cuenta is not None and (cuenta.pk not in desde or mov.fecha < desde[cuenta.pk].fecha):
+                    desde[cuenta.pk] = mov.dia
+                    cuentas[cuenta.pk] = cuenta
+        for pk, cuenta in cuentas.items():
+            cuenta.recalcular_saldos_diarios(desde=desde[pk])
+        cls._tomar_saldos_en_movs(nuevos, lote)
+
+        cls._actualizar_creditos(movimientos, contramovimientos)
+
+        return movimientos
+
+    @classmethod
+    def numerar_en_dia(cls, movs: Iterable[Movimiento]) -> list[Movimiento]:
+        """ Asigna a cada movimiento de <movs> su orden_dia y los devuelve en
+            una lista. Los números se calculan con una sola query sobre todos
+            los movimientos de sus días, de modo que son correctos aunque <movs>
+            no incluya todos los movimientos de cada día.
+        """
+        movs = list(movs)
+        ids_dias = {mov.dia_id for mov in movs if mov.pk is not None}
+        if not ids_dias:
+            return movs
+        numeros = dict(
+            cls.objects.filter(dia_id__in=ids_dias).annotate(
+                numero=models.Window(RowNumber(), partition_by="dia", order_by="_orden_dia")
+            ).values_list("pk", "numero")
+        )
+        for mov in movs:
+            if mov.pk in numeros:
+                mov._numero_en_dia = numeros[mov.pk] - 1
+        return movs
+
+    @classmethod
+    def ids_en_orden_dia(cls, dia: Dia | int | None, orden_dia: int) -> models.QuerySet:
+        """ Devuelve una queryset con la pk del movimiento ubicado en la
+            posición <orden_dia> de <dia> (o de cada día, si <dia> es None),
+            para filtrar movimientos por orden_dia.
+        """
+        if dia is not None:
+            return cls.objects.filter(dia=dia).order_by("_orden_dia").values("pk")[orden_dia:orden_dia+1]
+        return cls.objects.annotate(
+            numero=models.Window(RowNumber(), partition_by="dia", order_by="_orden_dia")
+        ).filter(numero=orden_dia+1).values("pk")
+
     @classmethod
     def filtro(cls, *args, **kwargs) -> models.QuerySet[Self]:
         if "fecha" in kwargs.keys():
             kwargs["dia"] = Dia.tomar(fecha=kwargs.pop("fecha"))
+        if "orden_dia" in kwargs.keys():
+            kwargs["pk__in"] = cls.ids_en_orden_dia(kwargs.get("dia"), kwargs.pop("orden_dia"))
 
         return super().filtro(*args, **kwargs)
 
@@ -387,6 +594,8 @@ class Movimiento(MiModel):
     def tomar(cls, **kwargs) -> Movimiento:
         if "fecha" in kwargs.keys():
             kwargs["dia"] = Dia.tomar(fecha=kwargs.pop("fecha"))
+        if "orden_dia" in kwargs.keys():
+            kwargs["pk__in"] = cls.ids_en_orden_dia(kwargs.get("dia"), kwargs.pop("orden_dia"))
 
         mov = super().tomar(**kwargs)
 
@@ -410,6 +619,7 @@ class Movimiento(MiModel):
                 errors.MOVIMIENTO_CON_CA_ELIMINADO)
 
         super().delete(*args, **kwargs)
+        Dia.sumar_movimientos(self.dia_id, -1)
 
         for sentido in ("entrada", "salida"):
             cuenta = getattr(self, f"cta_{sentido}")
@@ -421,6 +631,8 @@ class Movimiento(MiModel):
                     saldo_diario.importe -= self.importe_cta(sentido)
                     saldo_diario.clean_save()
 
+        self._actualizar_saldos_en_movs(self._cuentas_y_dia())
+
         if self.id_contramov:
             self._eliminar_contramovimiento()
 
@@ -464,6 +676,14 @@ class Movimiento(MiModel):
             if self.es_prestamo_o_devolucion():
                 self._gestionar_transferencia()
 
+            self._fecha = self.fecha
+            self._ubicar_en_dia()
+            self._posicion = self.calcular_posicion(self._fecha, self._orden_dia)
+            # La sk se reserva antes de insertar, para guardar el movimiento
+            # con una sola escritura
+            sks = Dia.sumar_movimientos(self.dia_id, 1, reservar_sks=1 if self.sk is None else 0)
+            if sks:
+                self.sk, = sks
             super().save(*args, **kwargs)
 
             if self.cta_entrada:
@@ -471,6 +691,8 @@ class Movimiento(MiModel):
             if self.cta_salida:
                 SaldoDiario.calcular(self, "salida")
 
+            self._actualizar_saldos_en_movs(self._cuentas_y_dia())
+
         else:  # Movimiento existente
             self.viejo = self.tomar_de_bd()
 
@@ -503,20 +725,39 @@ class Movimiento(MiModel):
 
             self._recalcular_saldos_diarios()
 
+            self._fecha = self.fecha
+            if self.dia_id != self.viejo.dia_id and not self._reubicar:
+                # Si pasa a un día posterior va al principio, si no al final
+                self._numero_en_dia = 0 if self._fecha > self.viejo._fecha else None
+                self._reubicar = True
+            reubicado = self._reubicar
+            if reubicado:
+                self._ubicar_en_dia()
+                self._posicion = self.calcular_posicion(self._fecha, self._orden_dia)
+            if self.sk is None:
+                self.sk, = Dia.sumar_movimientos(self.dia_id, 0, reservar_sks=1)
+            if kwargs.get("update_fields") is None:
+                kwargs["update_fields"] = self._campos_a_guardar(reubicado)
             super().save(*args, **kwargs)
 
+            if self.dia_id != self.viejo.dia_id:
+                Dia.sumar_movimientos(self.viejo.dia_id, -1)
+                Dia.sumar_movimientos(self.dia_id, 1)
+
             if self.cambia_campo(
-                    '_importe', '_cotizacion', CTA_ENTRADA, CTA_SALIDA, 'dia', 'orden_dia',
+                    '_importe', '_cotizacion', CTA_ENTRADA, CTA_SALIDA, 'dia', '_orden_dia',
                     contraparte=self.viejo
             ):
                 self._actualizar_fechas_conversion()
+                self._actualizar_saldos_en_movs(self._cuentas_y_dia() | self.viejo._cuentas_y_dia())
 
-        # Si no existe sk, generarla
-        if self.sk is None:
-            self.sk = f"{self.dia.sk}{self.orden_dia:02d}"
-            while Movimiento.filtro(sk=self.sk).exists():
-                self.sk = str(int(self.sk) + 1)
-            Movimiento.filtro(pk=self.pk).update(sk=self.sk)
+        self._tomar_valores_guardados()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._tomar_valores_guardados()
+        return instance
 
     def refresh_from_db(self, using: str = None, fields: List[str] = None):
         super().refresh_from_db()
@@ -524,10 +765,64 @@ class Movimiento(MiModel):
             cuenta = getattr(self, campo_cuenta)
             if cuenta:
                 setattr(self, campo_cuenta, cuenta.como_subclase())
+        self._numero_en_dia = None
+        self._reubicar = False
+        self._tomar_valores_guardados()
+
+    def tomar_de_bd(self) -> Self | None:
+        """ Devuelve el movimiento tal como está guardado, reconstruido a
+            partir de los valores tomados al leerlo o guardarlo por última vez,
+            sin volver a consultar la base de datos.
+            Comparte con self el día y la moneda ya cargados si no cambiaron.
+            Las cuentas se vuelven a leer al accederlas, porque pueden haberse
+            convertido en acumulativas.
+        """
+        if self._state.adding:
+            return None
+        if self._valores_guardados is None:     # p. ej. movimiento leído con campos diferidos
+            return super().tomar_de_bd()
+
+        guardado = self.__class__.from_db(
+            self._state.db, list(self._valores_guardados), list(self._valores_guardados.values())
+        )
+        for nombre in "dia", "moneda":
+            campo = self._meta.get_field(nombre)
+            if campo.is_cached(self) and getattr(self, campo.attname) == self._valores_guardados[campo.attname]:
+                campo.set_cached_value(guardado, campo.get_cached_value(self))
+        return guardado
+
+    def cambia_campo(self, *campos: str, contraparte: Movimiento | None = None) -> bool:
+        """ Devuelve True si alguno de los campos dados tiene un valor distinto
+            del de <contraparte> (por defecto, el movimiento guardado) o si el
+            movimiento es nuevo. Los campos relacionados se comparan por id,
+            sin cargar los objetos relacionados.
+        """
+        contraparte = contraparte or self.tomar_de_bd()
+        attnames = []
+        for campo in campos:
+            try:
+                attnames.append(self._meta.get_field(campo).attname)
+            except FieldDoesNotExist:
+                raise ValueError(f"Campo inexistente: {campo}")
+        if contraparte is None:
+            return True
+        return any(getattr(self, attname) != getattr(contraparte, attname) for attname in attnames)
 
     def importe_en(self, otra_moneda: Moneda, compra: bool = False) -> float:
         return round(self.importe * self.moneda.cotizacion_en(otra_moneda, compra), 2)
 
+    @staticmethod
+    def expresion_importe_cta(sentido: str) -> models.Expression:
+        """ Expresión equivalente a importe_cta_<sentido>, para usar en
+            anotaciones y agregaciones.
+        """
+        importe = models.Case(
+            models.When(**{f"cta_{sentido}__moneda_id": F("moneda_id")}, then=F("_importe")),
+            default=Round(F("_importe") * F("_cotizacion"), 2),
+            output_field=models.FloatField(),
+        )
+        return importe if sentido == "entrada" else -importe
+
     def importe_cta(self, sentido: str) -> float:
         try:
             return getattr(self, f"importe_cta_{sentido}")
@@ -568,21 +863,7 @@ class Movimiento(MiModel):
         return False
 
     def es_anterior_a(self, otro: Movimiento) -> bool:
-        return self.posicion < otro.posicion
-
-    def desplazar_otros_movs_del_dia(
-            self,
-            desde: int,
-            hasta: int | None=None,
-            incremento: int = 1,
-            exclude_self: bool =False):
-        movs = self.dia.movs().filter(orden_dia__gte=desde)
-        if hasta is not None:
-            movs = movs.filter(orden_dia__lt=hasta)
-        if exclude_self:
-            movs = movs.exclude(pk=self.pk)
-        for mov in movs:
-            Movimiento.filtro(pk=mov.pk).update(orden_dia=mov.orden_dia+incremento)
+        return self._posicion < otro._posicion
 
     def cambia_cuenta_por_cuenta_en_otra_moneda(self, moneda_del_movimiento: bool = True) -> bool:
         """ Devuelve true si alguna de las cuentas cambia por una cuenta en otra moneda.
@@ -653,11 +934,135 @@ class Movimiento(MiModel):
             En este último paso, es necesario "informarle" al movimiento que
             su cuenta de salida/entrada se ha convertido en acumulativa, para que la
             trate como tal.
+            Se averigua con una sola query qué cuentas son acumulativas, y
+            sólo se vuelven a leer las que no coinciden con la clase cargada.
+        """
+        from diario.models import CuentaInteractiva, CuentaAcumulativa
+
+        cuentas = {
+            campo_cuenta: getattr(self, campo_cuenta)
+            for campo_cuenta in campos_cuenta
+            if getattr(self, f"{campo_cuenta}_id") is not None
+        }
+        if not cuentas:
+            return
+        ids_acumulativas = set(
+            CuentaAcumulativa.filtro(pk__in=[c.pk for c in cuentas.values()]).values_list("pk", flat=True)
+        )
+        for campo_cuenta, cuenta in cuentas.items():
+            if not isinstance(cuenta, (CuentaInteractiva, CuentaAcumulativa)) or \
+                    cuenta.es_acumulativa != (cuenta.pk in ids_acumulativas):
+                setattr(self, campo_cuenta, cuenta.tomar_del_sk())
+
+    def _ubicar_en_dia(self):
+        """ Asigna a _orden_dia un valor entre los de los movimientos que
+            quedarán antes y después del movimiento en su día, en la posición
+            pedida (o al final), sin modificar los demás movimientos.
+            Sólo si no queda lugar entre los valores vecinos, o si el valor se
+            sale del rango admitido por _posicion, se renumera el día, dejando
+            otra vez huecos de PASO_ORDEN_DIA.
+        """
+        otros = Movimiento.objects.filter(dia_id=self.dia_id).exclude(pk=self.pk).order_by("_orden_dia")
+        numero = self._numero_en_dia
+        vecinos = [] if numero is None else \
+            list(otros.values_list("_orden_dia", flat=True)[max(numero - 1, 0):numero + 1])
+
+        if numero == 0:
+            self._orden_dia = vecinos[0] - PASO_ORDEN_DIA if vecinos else PASO_ORDEN_DIA
+        elif vecinos:
+            anterior, siguiente = vecinos if len(vecinos) == 2 else (vecinos[0], None)
+            if siguiente is None:
+                self._orden_dia = anterior + PASO_ORDEN_DIA
+            elif siguiente - anterior > 1:
+                self._orden_dia = (anterior + siguiente) // 2
+            else:
+                self._renumerar_dia(otros, numero)
+        else:   # Al final del día
+            ultimo = otros.aggregate(ultimo=models.Max("_orden_dia"), cantidad=models.Count("pk"))
+            self._orden_dia = (ultimo["ultimo"] or 0) + PASO_ORDEN_DIA
+            numero = ultimo["cantidad"]
+
+        if not -LIMITE_ORDEN_DIA < self._orden_dia < LIMITE_ORDEN_DIA:
+            self._renumerar_dia(otros, numero)
+
+        self._numero_en_dia = numero
+        self._reubicar = False
+
+    def _renumerar_dia(self, otros: models.QuerySet[Movimiento], numero: int):
+        """ Vuelve a asignar _orden_dia a los demás movimientos del día con
+            huecos de PASO_ORDEN_DIA, dejando libre la posición <numero> para
+            este movimiento.
         """
-        self.cta_salida = self.cta_salida.tomar_del_sk() \
-            if self.cta_salida else None
-        self.cta_entrada = self.cta_entrada.tomar_del_sk() \
-            if self.cta_entrada else None
+        movs = list(otros.only("pk", "_fecha", "_orden_dia"))
+        for i, mov in enumerate(movs):
+            mov._orden_dia = (i + 1 + (i >= numero)) * PASO_ORDEN_DIA
+            mov._posicion = self.calcular_posicion(mov._fecha, mov._orden_dia)
+        Movimiento.objects.bulk_update(movs, ["_orden_dia", "_posicion"])
+        self._orden_dia = (numero + 1) * PASO_ORDEN_DIA
+
+    def _campos_a_guardar(self, reubicado: bool) -> list[str]:
+        """ Campos que se escriben al guardar un movimiento existente.
+            Los saldos en movimiento se actualizan sólo desde la base de datos
+            (ver _actualizar_saldos_en_movs y SaldoDiario._actualizar_posteriores),
+            para no pisarlos con el valor de una instancia desactualizada.
+            Lo mismo _orden_dia y _posicion, que pueden cambiar al renumerarse
+            el día, salvo que se acabe de ubicar el movimiento en su día.
+        """
+        excluidos = {"saldo_cta_entrada", "saldo_cta_salida"}
+        if not reubicado:
+            excluidos |= {"_orden_dia", "_posicion"}
+        return [
+            f.name for f in self._meta.concrete_fields
+            if not f.primary_key and f.name not in excluidos
+        ]
+
+    def _tomar_valores_guardados(self):
+        valores = {
+            campo.attname: self.__dict__[campo.attname]
+            for campo in self._meta.concrete_fields
+            if campo.attname in self.__dict__
+        }
+        self._valores_guardados = valores if len(valores) == len(self._meta.concrete_fields) else None
+
+    def _cuentas_y_dia(self) -> set[tuple[int, int]]:
+        return {
+            (cuenta_id, self.dia_id)
+            for cuenta_id in (self.cta_entrada_id, self.cta_salida_id)
+            if cuenta_id is not None
+        }
+
+    def _actualizar_saldos_en_movs(self, cuentas_y_dias: set[tuple[int, int]]):
+        """ Recalcula saldo_cta_entrada y saldo_cta_salida de los movimientos
+            de cada cuenta en cada día, recorriendo los movimientos del día
+            hacia atrás a partir del saldo diario de la cuenta.
+            Los saldos en movimientos de días posteriores se desplazan junto
+            con los saldos diarios (ver SaldoDiario._actualizar_posteriores).
+        """
+        for cuenta_id, dia_id in cuentas_y_dias:
+            importe = SaldoDiario.filtro(
+                cuenta_id=cuenta_id, dia_id=dia_id
+            ).values_list("_importe", flat=True).first()
+            if importe is None:     # La cuenta ya no tiene movimientos en el día
+                continue
+
+            movs = Movimiento.filtro(
+                models.Q(cta_entrada_id=cuenta_id) | models.Q(cta_salida_id=cuenta_id),
+                dia_id=dia_id,
+            ).select_related(
+                "moneda", "cta_entrada__moneda", "cta_salida__moneda"
+            ).order_by("-_orden_dia")
+
+            movs_por_sentido = {"entrada": [], "salida": []}
+            for mov in movs:
+                sentido = "entrada" if mov.cta_entrada_id == cuenta_id else "salida"
+                setattr(mov, f"saldo_cta_{sentido}", round(importe, 2))
+                if mov.pk == self.pk:
+                    setattr(self, f"saldo_cta_{sentido}", round(importe, 2))
+                movs_por_sentido[sentido].append(mov)
+                importe -= mov.importe_cta(sentido)
+
+            for sentido, movs_sentido in movs_por_sentido.items():
+                Movimiento.objects.bulk_update(movs_sentido, [f"saldo_cta_{sentido}"])
 
     def _recalcular_saldos_diarios(self):
         for campo_cuenta in campos_cuenta:
@@ -671,7 +1076,10 @@ class Movimiento(MiModel):
                     campo_opuesto = el_que_no_es(campo_cuenta, *campos_cuenta)
                     cta_nueva_opuesta = getattr(self, campo_opuesto)
 
-                    if movs_dia_cta_vieja.count() < 2 and cta_vieja not in (cta_nueva, cta_nueva_opuesta):
+                    if movs_dia_cta_vieja.count() < 2 and (
+                            self.dia != self.viejo.dia or
+                            cta_vieja not in (cta_nueva, cta_nueva_opuesta)
+                    ):
                         saldo_cta_vieja.eliminar()
                     else:
                         saldo_cta_vieja.importe -= getattr(self.viejo, f"importe_{campo_cuenta}")
@@ -702,7 +1110,7 @@ class Movimiento(MiModel):
             return False
 
         # Si cambia moneda, se recalcula cotización
-        if self.moneda != self.viejo.moneda:
+        if self.moneda_id != self.viejo.moneda_id:
             return True
 
         for campo_cuenta in campos_cuenta:
@@ -793,12 +1201,13 @@ class Movimiento(MiModel):
         self._crear_movimiento_credito()
         self._regenerar_nombres_de_cuentas_credito()
 
-    def _crear_movimiento_credito(self, orden_dia=None):
+    def _crear_movimiento_credito(self, orden_dia=None, sk=None):
         cuenta_acreedora, cuenta_deudora = self.recuperar_cuentas_credito()
 
         contramov = Movimiento.crear(
             fecha=self.fecha,
             orden_dia=orden_dia,
+            sk=sk,
             concepto=self.concepto,
             detalle=self._detalle_movimiento_credito(cuenta_acreedora, cuenta_deudora),
             importe=self.importe,
@@ -861,25 +1270,155 @@ class Movimiento(MiModel):
             tit2.acreedores.remove(tit1)
 
     def _regenerar_contramovimiento(self):
-        contramov = Movimiento.tomar(id=self.id_contramov)
+        contramov, = Movimiento.numerar_en_dia([Movimiento.tomar(id=self.id_contramov)])
+        orden_dia = contramov.orden_dia
         self._eliminar_contramovimiento(contramov)
-        self._crear_movimiento_credito(orden_dia=contramov.orden_dia)
+        self._crear_movimiento_credito(orden_dia=orden_dia, sk=contramov.sk)
 
     def _detalle_movimiento_credito(self,
                                      cuenta_emisora: CuentaInteractiva,
                                      cuenta_receptora: CuentaInteractiva) -> str:
+        return self._detalle_credito(cuenta_emisora.saldo(), cuenta_receptora.saldo())
 
-        if cuenta_emisora.saldo() > 0:  # (1)
+    def _detalle_credito(self, saldo_emisora: float, saldo_receptora: float) -> str:
+        if saldo_emisora > 0:  # (1)
             detalle = 'Aumento de crédito'
-        elif cuenta_emisora.saldo() < 0:
-            detalle = 'Cancelación de crédito' if self.importe == cuenta_receptora.saldo() \
-                else 'Pago en exceso de crédito' if self.importe > cuenta_receptora.saldo() \
+        elif saldo_emisora < 0:
+            detalle = 'Cancelación de crédito' if self.importe == saldo_receptora \
+                else 'Pago en exceso de crédito' if self.importe > saldo_receptora \
                 else 'Pago a cuenta de crédito'
         else:
             detalle = 'Constitución de crédito'
 
         return detalle
 
+    # Métodos de crear_muchos
+
+    @staticmethod
+    def _tomar_o_crear_dias(fechas: Iterable[date]) -> dict[date, Dia]:
+        """ Devuelve los días de las fechas dadas, creando los que no existan
+            con un solo bulk_create.
+        """
+        fechas = set(fechas)
+        dias = {dia.fecha: dia for dia in Dia.filtro(fecha__in=fechas)}
+        faltantes = fechas - dias.keys()
+        if faltantes:
+            Dia.objects.bulk_create([Dia(fecha=f, sk=f.strftime("%Y%m%d")) for f in faltantes])
+            dias.update({dia.fecha: dia for dia in Dia.filtro(fecha__in=faltantes)})
+        return dias
+
+    @staticmethod
+    def _generar_contramovimientos(movimientos: list[Movimiento]) -> dict[int, Movimiento]:
+        """ Genera (sin guardar) el contramovimiento de crédito de cada
+            movimiento entre titulares, en la forma {id(movimiento): contramov}.
+            Las cuentas crédito se recuperan una vez por par de titulares, y
+            sus saldos se siguen en memoria para determinar el detalle de
+            cada contramovimiento.
+        """
+        cuentas_credito = dict()
+        saldos = dict()
+        contramovimientos = dict()
+        for movimiento in movimientos:
+            if not movimiento.es_prestamo_o_devolucion():
+                continue
+            clave = (movimiento.emisor.pk, movimiento.receptor.pk)
+            if clave not in cuentas_credito:
+                cuentas_credito[clave] = movimiento.recuperar_cuentas_credito()
+            cuenta_acreedora, cuenta_deudora = cuentas_credito[clave]
+            for cuenta in cuenta_acreedora, cuenta_deudora:
+                if cuenta.pk not in saldos:
+                    saldos[cuenta.pk] = cuenta.saldo()
+
+            contramovimientos[id(movimiento)] = Movimiento(
+                dia=movimiento.dia,
+                _fecha=movimiento.dia.fecha,
+                concepto=movimiento.concepto,
+                detalle=movimiento._detalle_credito(saldos[cuenta_acreedora.pk], saldos[cuenta_deudora.pk]),
+                importe=movimiento.importe,
+                moneda=cuenta_acreedora.moneda,
+                cotizacion=1.0,
+                cta_entrada=cuenta_acreedora,
+                cta_salida=cuenta_deudora,
+                es_automatico=True,
+            )
+            saldos[cuenta_acreedora.pk] = round(saldos[cuenta_acreedora.pk] + movimiento.importe, 2)
+            saldos[cuenta_deudora.pk] = round(saldos[cuenta_deudora.pk] - movimiento.importe, 2)
+
+        return contramovimientos
+
+    @staticmethod
+    def _asignar_orden_dia_y_sk(movimientos: list[Movimiento]):
+        """ Agrega los movimientos al final de sus días, en el orden dado, y
+            les asigna sk como Movimiento.save, a partir de los números de sk
+            reservados de cada día (ver crear_muchos, que actualiza la
+            reserva). Los días deben estar recién leídos de la base de datos.
+        """
+        ids_dias = {mov.dia_id for mov in movimientos}
+        ultimo = defaultdict(int)
+        cantidad = defaultdict(int)
+        for id_dia, ultimo_dia, cantidad_dia in Movimiento.filtro(dia_id__in=ids_dias).order_by().values(
+                "dia_id").annotate(ultimo=models.Max("_orden_dia"), cantidad=models.Count("pk")).values_list(
+                "dia_id", "ultimo", "cantidad"):
+            ultimo[id_dia] = ultimo_dia
+            cantidad[id_dia] = cantidad_dia
+        for mov in movimientos:
+            ultimo[mov.dia_id] += PASO_ORDEN_DIA
+            mov._orden_dia = ultimo[mov.dia_id]
+            mov._posicion = Movimiento.calcular_posicion(mov._fecha, mov._orden_dia)
+            mov._numero_en_dia = cantidad[mov.dia_id]
+            cantidad[mov.dia_id] += 1
+
+        reservadas = defaultdict(int)
+        for mov in movimientos:
+            if mov.sk is None:
+                mov.sk = Dia.sk_movimiento(mov.dia.sk, mov.dia.sks_reservadas + reservadas[mov.dia_id])
+            reservadas[mov.dia_id] += 1
+
+    @staticmethod
+    def _tomar_saldos_en_movs(movimientos: list[Movimiento], lote: int):
+        """ Copia en los movimientos creados los saldos en movimiento que
+            recalcular_saldos_diarios guarda en la base de datos, con una
+            query por lote.
+        """
+        for i in range(0, len(movimientos), lote):
+            movs_lote = {mov.pk: mov for mov in movimientos[i:i + lote]}
+            for pk, saldo_cta_entrada, saldo_cta_salida in Movimiento.filtro(
+                    pk__in=movs_lote.keys()
+            ).values_list("pk", "saldo_cta_entrada", "saldo_cta_salida"):
+                movs_lote[pk].saldo_cta_entrada = saldo_cta_entrada
+                movs_lote[pk].saldo_cta_salida = saldo_cta_salida
+                movs_lote[pk]._tomar_valores_guardados()
+
+    @staticmethod
+    def _actualizar_creditos(movimientos: list[Movimiento], contramovimientos: dict[int, Movimiento]):
+        """ Actualiza una vez por par de titulares, con los saldos ya
+            recalculados, lo que Movimiento.save actualiza en cada préstamo o
+            devolución: relación deudor-acreedor entre los titulares, nombres
+            de las cuentas crédito y desactivación de cuentas crédito sin saldo.
+        """
+        pares = dict()
+        for movimiento in movimientos:
+            if id(movimiento) in contramovimientos:
+                pares[frozenset((movimiento.emisor.pk, movimiento.receptor.pk))] = movimiento
+
+        for movimiento in pares.values():
+            emisor, receptor = movimiento.emisor, movimiento.receptor
+            cuenta_emisor = emisor.cuenta_credito_con(receptor)
+            saldo = cuenta_emisor.saldo()
+
+            emisor.deudores.remove(receptor)
+            receptor.deudores.remove(emisor)
+            if saldo > 0:
+                emisor.deudores.add(receptor)
+            elif saldo < 0:
+                receptor.deudores.add(emisor)
+
+            movimiento._regenerar_nombres_de_cuentas_credito()
+            if saldo == 0:
+                for cuenta in cuenta_emisor, receptor.cuenta_credito_con(emisor):
+                    cuenta.activa = False
+                    cuenta.clean_save()
+
 
 '''
 (1) cuenta_acreedora y cuenta_deudora lo son con respecto al movimiento, no en
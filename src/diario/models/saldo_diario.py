@@ -1,10 +1,16 @@
 from __future__ import annotations
+from collections import defaultdict
+from datetime import date, timedelta
 from typing import TYPE_CHECKING, Self, Iterable
 
 from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Round
 
 from vvmodel.models import MiModel
 
+from utils.tiempo import primero_de_mes
+
 if TYPE_CHECKING:
     from diario.models import Movimiento, Cuenta, Dia
 
@@ -12,12 +18,14 @@ if TYPE_CHECKING:
 class SaldoDiario(MiModel):
     cuenta = models.ForeignKey('diario.Cuenta', on_delete=models.CASCADE)
     dia = models.ForeignKey('diario.Dia', on_delete=models.CASCADE)
+    fecha = models.DateField(null=True, blank=True)     # Copia de dia.fecha, para evitar joins con Dia
     _importe = models.FloatField()
     sk = models.CharField(max_length=25, null=True, blank=True, unique=True)
 
     class Meta:
         unique_together = ['cuenta', 'dia']
-        ordering = ['dia']
+        ordering = ['fecha']
+        indexes = [models.Index(fields=['cuenta', 'fecha'], name='saldodiario_cuenta_fecha_idx')]
 
     def __str__(self):
         return f"{self.cuenta} al {self.dia}: {self.importe}"
@@ -32,7 +40,7 @@ class SaldoDiario(MiModel):
 
     @classmethod
     def anterior_a(cls, cuenta: Cuenta, dia: Dia):
-        return cls.filtro(cuenta_id=cuenta.pk, dia__fecha__lt=dia.fecha).last()
+        return cls.ultimo_al(cuenta, dia.fecha, inclusive=False)
 
     @classmethod
     def calcular(cls, mov: Movimiento, sentido: str | None = None):
@@ -68,54 +76,142 @@ class SaldoDiario(MiModel):
         return saldo_diario
 
     @classmethod
-    def indexar_por_dia(cls, cuentas: Iterable[Cuenta], dia: Dia):
-        saldos_diarios = {
-            sd.cuenta_id: sd.importe
-            for sd in SaldoDiario.filtro(cuenta__in=cuentas, dia=dia)
-        }
-
-        cuentas_sin_sd = [c for c in cuentas if c.pk not in saldos_diarios]
-        if cuentas_sin_sd:
-            sds_anteriores = SaldoDiario.filtro(
-                cuenta__in=cuentas_sin_sd,
-                dia__fecha__lt=dia.fecha,
-            ).order_by('cuenta_id', '-dia__fecha')
-            vistos = set()
-            for sd in sds_anteriores:
-                if sd.cuenta_id not in vistos:
-                    saldos_diarios[sd.cuenta_id] = sd.importe
-                    vistos.add(sd.cuenta_id)
-
-        return saldos_diarios
+    def indexar_por_dia(cls, cuentas: Iterable[Cuenta], dia: Dia) -> dict[int, float]:
+        """ Devuelve el importe del último saldo diario de cada cuenta al día
+            dado. El último saldo de cada cuenta se busca con una subconsulta
+            correlacionada, de modo que se trae una sola fila por cuenta.
+        """
+        return cls._ultimos_importes([c.pk for c in cuentas], dia.fecha)
+
+    @classmethod
+    def indexar_por_rango(cls, cuentas: Iterable[Cuenta], dias: Iterable[Dia]) -> dict[tuple[int, int], float]:
+        """ Devuelve el saldo de cada cuenta al final de cada uno de los días
+            dados, en la forma {(cuenta_id, dia_id): importe}. El saldo de una
+            cuenta acumulativa es la suma de los de sus subcuentas interactivas.
+            Hace tres queries, independientemente de la cantidad de cuentas y
+            de días.
+        """
+        from diario.models import Cuenta
+
+        dias = sorted(dias, key=lambda d: d.fecha)
+        if not dias:
+            return dict()
+
+        subcuentas = defaultdict(list)
+        for pk, cta_madre_id in Cuenta.todes().values_list("pk", "cta_madre_id"):
+            if cta_madre_id is not None:
+                subcuentas[cta_madre_id].append(pk)
+
+        def hojas(pk: int) -> list[int]:
+            if pk not in subcuentas:
+                return [pk]
+            return [hoja for subcuenta in subcuentas[pk] for hoja in hojas(subcuenta)]
+
+        hojas_por_cuenta = {c.pk: hojas(c.pk) for c in cuentas}
+        ids_hojas = {hoja for hojas_cuenta in hojas_por_cuenta.values() for hoja in hojas_cuenta}
+
+        importes = cls._ultimos_importes(ids_hojas, dias[0].fecha)
+        saldos_posteriores = iter(cls.filtro(
+            cuenta_id__in=ids_hojas,
+            fecha__gt=dias[0].fecha,
+            fecha__lte=dias[-1].fecha,
+        ).values_list("cuenta_id", "fecha", "_importe"))
+
+        resultado = dict()
+        siguiente = next(saldos_posteriores, None)
+        for dia in dias:
+            while siguiente is not None and siguiente[1] <= dia.fecha:
+                importes[siguiente[0]] = siguiente[2]
+                siguiente = next(saldos_posteriores, None)
+            for cuenta_id, hojas_cuenta in hojas_por_cuenta.items():
+                resultado[(cuenta_id, dia.pk)] = round(sum(importes.get(h, 0) for h in hojas_cuenta), 2)
+
+        return resultado
+
+    @classmethod
+    def importes_por_dia(cls, ids_cuentas: Iterable[int], desde: date, hasta: date) -> dict[int, list[float]]:
+        """ Devuelve, para cada cuenta, una lista con su saldo al final de
+            cada día entre <desde> y <hasta> inclusive, arrastrando el último
+            saldo conocido en los días sin saldo diario. Hace dos queries,
+            independientemente de la cantidad de cuentas y de días.
+        """
+        ids_cuentas = set(ids_cuentas)
+        importes = cls._ultimos_importes(ids_cuentas, desde)
+        saldos_posteriores = iter(cls.filtro(
+            cuenta_id__in=ids_cuentas,
+            fecha__gt=desde,
+            fecha__lte=hasta,
+        ).values_list("cuenta_id", "fecha", "_importe"))
+
+        resultado = {id_cuenta: [] for id_cuenta in ids_cuentas}
+        siguiente = next(saldos_posteriores, None)
+        for i in range((hasta - desde).days + 1):
+            fecha = desde + timedelta(i)
+            while siguiente is not None and siguiente[1] <= fecha:
+                importes[siguiente[0]] = siguiente[2]
+                siguiente = next(saldos_posteriores, None)
+            for id_cuenta in ids_cuentas:
+                resultado[id_cuenta].append(importes.get(id_cuenta, 0.0))
+
+        return resultado
+
+    @classmethod
+    def ultimo_al(cls, cuenta: Cuenta, fecha: date, inclusive: bool = True) -> Self | None:
+        """ Devuelve el último saldo diario de la cuenta al <fecha> (o anterior
+            a <fecha> si not inclusive). Busca sólo entre los días del mes de
+            <fecha> y, si no encuentra, toma el cierre mensual anterior.
+        """
+        from diario.models import SaldoMensual
+
+        filtro_fecha = {"fecha__lte": fecha} if inclusive else {"fecha__lt": fecha}
+        saldo_diario = cls.filtro(
+            cuenta_id=cuenta.pk,
+            fecha__gte=primero_de_mes(fecha),
+            **filtro_fecha
+        ).last()
+        if saldo_diario is None:
+            try:
+                saldo_diario = SaldoMensual.anterior_a(cuenta, fecha).saldo_diario
+            except AttributeError:  # No hay cierre mensual anterior
+                pass
+
+        return saldo_diario
 
     @classmethod
     def indexar_en_movimiento(
             cls,
             cuentas: Iterable[Cuenta],
             movimiento: Movimiento) -> dict[int, float]:
-        from diario.models import Movimiento
-
-        saldos_diarios = cls.indexar_por_dia(cuentas, movimiento.dia)
-
-        movs_posteriores = list(Movimiento.filtro(
-            dia=movimiento.dia,
-            orden_dia__gt=movimiento.orden_dia,
-        ).select_related('cta_entrada', 'cta_salida'))
-
-        ids_cuentas = {c.pk for c in cuentas}
-        ajustes = {c.pk: 0.0 for c in cuentas}
-        for mov in movs_posteriores:
-            if mov.cta_entrada_id in ids_cuentas:
-                ajustes[mov.cta_entrada_id] -= mov.importe_cta_entrada
-            if mov.cta_salida_id in ids_cuentas:
-                ajustes[mov.cta_salida_id] -= mov.importe_cta_salida
+        """ Devuelve el saldo de cada cuenta al momento del movimiento dado,
+            tomado del saldo guardado en el último movimiento de la cuenta
+            hasta <movimiento> inclusive (ver Cuenta.saldo_en_mov).
+            El último movimiento de cada cuenta en cada sentido se busca con
+            una subconsulta correlacionada, de modo que se hace una sola query.
+        """
+        from diario.models import Cuenta, Movimiento
+
+        anotaciones = dict()
+        for sentido in "entrada", "salida":
+            ultimo_mov = Movimiento.filtro(
+                **{f"cta_{sentido}_id": OuterRef("pk")},
+                _posicion__lte=movimiento._posicion,
+            ).order_by("-_posicion")
+            anotaciones[f"_posicion_{sentido}"] = Subquery(ultimo_mov.values("_posicion")[:1])
+            anotaciones[f"_saldo_{sentido}"] = Subquery(ultimo_mov.values(f"saldo_cta_{sentido}")[:1])
+
+        resultado = dict()
+        for pk, posicion_entrada, saldo_entrada, posicion_salida, saldo_salida in Cuenta.filtro(
+                pk__in=[c.pk for c in cuentas]
+        ).annotate(**anotaciones).values_list(
+            "pk", "_posicion_entrada", "_saldo_entrada", "_posicion_salida", "_saldo_salida"
+        ):
+            if posicion_salida is None or (posicion_entrada is not None and posicion_entrada > posicion_salida):
+                saldo = saldo_entrada
+            else:
+                saldo = saldo_salida
+            resultado[pk] = saldo if saldo is not None else 0.0
 
-        return {
-            cuenta_id: importe + ajustes[cuenta_id]
-            for cuenta_id, importe in {
-                c.pk: saldos_diarios.get(c.pk, 0.0) for c in cuentas
-            }.items()
-        }
+        return resultado
 
     def anterior(self):
         return SaldoDiario.anterior_a(cuenta=self.cuenta, dia=self.dia)
@@ -130,6 +226,14 @@ class SaldoDiario(MiModel):
         self.delete()
         self._actualizar_posteriores(importe_anterior-importe)
 
+    def delete(self, *args, **kwargs):
+        from diario.models import SaldoMensual, VerificacionPendiente
+
+        result = super().delete(*args, **kwargs)
+        SaldoMensual.actualizar(self.cuenta, self.fecha)
+        VerificacionPendiente.marcar([self.cuenta_id])
+        return result
+
     def clean_save(
             self, exclude=None, validate_unique=True, validate_constraints=True,
             force_insert=False, force_update=False, using=None, update_fields=None,
@@ -147,6 +251,7 @@ class SaldoDiario(MiModel):
         # Generar sk si no existe
         if self.sk is None:
             self.sk = f"{self.dia.sk}{self.cuenta.sk}"
+        self.fecha = self.dia.fecha
 
         if self._state.adding:
             try:
@@ -163,19 +268,52 @@ class SaldoDiario(MiModel):
                 if actualizar_posteriores:
                     self._actualizar_posteriores(importe)
 
-        return super().save(
+        adding = self._state.adding
+        super().save(
             force_insert=force_insert,
             force_update=force_update,
             using=using,
             update_fields=update_fields
         )
 
+        from diario.models import SaldoMensual, VerificacionPendiente
+        if adding:
+            SaldoMensual.actualizar(self.cuenta, self.fecha)
+        VerificacionPendiente.marcar([self.cuenta_id])
+
     def tomar_de_bd(self) -> Self:
         return self.get_class().tomar_o_nada(cuenta=self.cuenta, dia=self.dia)
 
     # Métodos protegidos
+    @classmethod
+    def _ultimos_importes(cls, ids_cuentas: Iterable[int], fecha: date) -> dict[int, float]:
+        from diario.models import Cuenta
+
+        ultimo_saldo = cls.filtro(
+            cuenta_id=OuterRef("pk"),
+            fecha__lte=fecha,
+        ).order_by("-fecha").values("pk")[:1]
+        ids_ultimos_saldos = Cuenta.filtro(
+            pk__in=ids_cuentas
+        ).annotate(ultimo_saldo=Subquery(ultimo_saldo)).values("ultimo_saldo")
+
+        return {sd.cuenta_id: sd.importe for sd in cls.filtro(pk__in=ids_ultimos_saldos)}
+
     def _actualizar_posteriores(self, importe):
-        for sd in SaldoDiario.filtro(cuenta=self.cuenta, dia__fecha__gt=self.dia.fecha):
-            sd.importe += importe
+        """ Desplaza en <importe> todos los saldos diarios posteriores de la
+            cuenta con un único UPDATE, redondeando a 2 decimales como
+            SaldoDiario.importe. Hace lo mismo con los saldos de la cuenta
+            guardados en movimientos posteriores.
+        """
+        from diario.models import Movimiento
+
+        SaldoDiario.filtro(
+            cuenta_id=self.cuenta_id,
+            fecha__gt=self.fecha,
+        ).update(_importe=Round(F("_importe") + importe, 2))
 
-            sd.clean_save(actualizar_posteriores=False)
+        for sentido in "entrada", "salida":
+            Movimiento.filtro(
+                **{f"cta_{sentido}_id": self.cuenta_id},
+                _fecha__gt=self.fecha,
+            ).update(**{f"saldo_cta_{sentido}": Round(F(f"saldo_cta_{sentido}") + importe, 2)})
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import TYPE_CHECKING
+
+from django.db import models
+
+from vvmodel.models import MiModel
+
+from diario.models.saldo_diario import SaldoDiario
+from utils.tiempo import primero_de_mes, primero_de_mes_siguiente
+
+if TYPE_CHECKING:
+    from diario.models import Cuenta
+
+
+class SaldoMensual(MiModel):
+    """ Cierre mensual de una cuenta: apunta al último saldo diario del mes,
+        de modo que su importe se mantiene actualizado junto con el del saldo
+        diario.
+    """
+    cuenta = models.ForeignKey('diario.Cuenta', on_delete=models.CASCADE)
+    mes = models.DateField()
+    saldo_diario = models.OneToOneField(
+        'diario.SaldoDiario',
+        related_name='cierre_mensual',
+        on_delete=models.CASCADE,
+    )
+
+    class Meta:
+        unique_together = ['cuenta', 'mes']
+        ordering = ['mes']
+
+    def __str__(self):
+        return f"{self.cuenta} al cierre de {self.mes.strftime('%Y-%m')}: {self.importe}"
+
+    @property
+    def importe(self) -> float:
+        return self.saldo_diario.importe
+
+    @classmethod
+    def actualizar(cls, cuenta: Cuenta, fecha: date):
+        """ Apunta el cierre del mes de <fecha> al último saldo diario de la
+            cuenta en ese mes, o lo elimina si la cuenta no tiene saldos
+            diarios en el mes.
+        """
+        mes = primero_de_mes(fecha)
+        ultimo = SaldoDiario.filtro(
+            cuenta_id=cuenta.pk,
+            fecha__gte=mes,
+            fecha__lt=primero_de_mes_siguiente(fecha),
+        ).last()
+
+        if ultimo is None:
+            cls.filtro(cuenta_id=cuenta.pk, mes=mes).delete()
+        else:
+            cls.objects.update_or_create(cuenta_id=cuenta.pk, mes=mes, defaults={"saldo_diario": ultimo})
+
+    @classmethod
+    def regenerar(cls, cuenta: Cuenta, desde: date | None = None):
+        """ Regenera los cierres mensuales de la cuenta (a partir del mes de
+            <desde>, si se especifica) recorriendo una sola vez sus saldos
+            diarios.
+        """
+        cierres = cls.filtro(cuenta_id=cuenta.pk)
+        saldos = SaldoDiario.filtro(cuenta_id=cuenta.pk)
+        if desde:
+            cierres = cierres.filter(mes__gte=primero_de_mes(desde))
+            saldos = saldos.filter(fecha__gte=primero_de_mes(desde))
+        cierres.delete()
+
+        ultimos = dict()
+        for saldo in saldos:
+            ultimos[primero_de_mes(saldo.fecha)] = saldo
+
+        cls.objects.bulk_create([
+            cls(cuenta_id=cuenta.pk, mes=mes, saldo_diario=saldo)
+            for mes, saldo in ultimos.items()
+        ])
+
+    @classmethod
+    def anterior_a(cls, cuenta: Cuenta, fecha: date) -> SaldoMensual | None:
+        """ Devuelve el último cierre mensual de la cuenta anterior al mes de
+            <fecha>.
+        """
+        return cls.filtro(
+            cuenta_id=cuenta.pk,
+            mes__lt=primero_de_mes(fecha),
+        ).select_related("saldo_diario").last()
@@ -106,7 +106,13 @@ class Titular(MiModel):
         return cuentas
 
     def dias(self) -> models.QuerySet['Dia']:
-        fechas = [mov.dia.fecha for mov in self.movs()]
+        """ Días con movimientos de cuentas del titular, tomados de los saldos
+            diarios de sus cuentas (índice cuenta-fecha).
+        """
+        from diario.models import SaldoDiario
+        fechas = SaldoDiario.filtro(
+            Q(cuenta__in=self.cuentas.all()) | Q(cuenta__in=self.ex_cuentas.all())
+        ).values("fecha")
         return Dia.filtro(fecha__in=fechas)
 
     def movs(self) -> QuerySet['Movimiento']:
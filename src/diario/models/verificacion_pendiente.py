@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db import models
+
+from vvmodel.models import MiModel
+
+
+class VerificacionPendiente(MiModel):
+    """ Registro de cuentas cuyos saldos o movimientos fueron modificados
+        después de su última verificación de saldo exitosa.
+    """
+    cuenta = models.OneToOneField(
+        'diario.Cuenta',
+        related_name='verificacion_pendiente',
+        on_delete=models.CASCADE,
+    )
+
+    def __str__(self):
+        return f"Verificación pendiente de {self.cuenta}"
+
+    @classmethod
+    def marcar(cls, ids_cuentas: Iterable[int]):
+        """ Registra las cuentas como pendientes de verificación, con un solo
+            INSERT que ignora las cuentas ya registradas.
+        """
+        cls.objects.bulk_create(
+            [cls(cuenta_id=pk) for pk in set(ids_cuentas)],
+            ignore_conflicts=True,
+        )
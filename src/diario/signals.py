@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from diario.models import Cotizacion
+from diario.utils.utils_cotizacion import SerieCotizaciones
+
+
+@receiver([post_save, post_delete], sender=Cotizacion)
+def invalidar_serie_cotizaciones(sender, **kwargs):
+    SerieCotizaciones.invalidar()
@@ -1,6 +1,7 @@
 from django import template
 
-from diario.models import Moneda, Cotizacion
+from diario.models import Moneda
+from diario.utils.utils_cotizacion import cotizaciones_vigentes
 from utils.numeros import float_format
 
 register = template.Library()
@@ -8,16 +9,18 @@ register = template.Library()
 
 @register.simple_tag(takes_context=True)
 def cotizacion(context, moneda: Moneda, compra: bool) -> str:
-    tipo = "compra" if compra else "venta"
-    movimiento = context.get("movimiento")
-
-    if movimiento:
-        fecha = movimiento.fecha
-        cot = Cotizacion.tomar(moneda=moneda, fecha=fecha)
-    else:
-        cot = moneda.cotizaciones.last()
+    """ Toma la cotización de la moneda del mapeo "cotizaciones" del
+        context, si lo hay. Si no, la calcula a la fecha del movimiento del
+        context (o la última, si no hay movimiento).
+    """
+    cotizaciones = context.get("cotizaciones") or dict()
 
     try:
-        return float_format(getattr(cot, f"importe_{tipo}"))
-    except AttributeError:  # cot is None
-        return float_format(1)
+        importe_compra, importe_venta = cotizaciones[moneda.sk]
+    except KeyError:
+        movimiento = context.get("movimiento")
+        importe_compra, importe_venta = cotizaciones_vigentes(
+            [moneda], movimiento.fecha if movimiento else None
+        )[moneda.sk]
+
+    return float_format(importe_compra if compra else importe_venta)
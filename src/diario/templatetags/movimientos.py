@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from django import template
-from django.db.models import QuerySet
 
 from diario.models import Dia, Cuenta, Titular, Movimiento
 
@@ -9,5 +8,5 @@ register = template.Library()
 
 
 @register.filter
-def movs_seleccionados(dia: Dia, ente: Cuenta | Titular | None) -> QuerySet[Movimiento]:
-    return dia.movs(ente)
+def movs_seleccionados(dia: Dia, ente: Cuenta | Titular | None) -> list[Movimiento]:
+    return Movimiento.numerar_en_dia(dia.movs(ente))
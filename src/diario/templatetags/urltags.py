@@ -34,8 +34,9 @@ def finperurl(context) -> str:
 
 @register.simple_tag(takes_context=True)
 def movurl(context, mov,
-           page: int | None = None,
-           fecha: date | None = None) -> str:
+           fecha: date | None = None,
+           desde: date | None = None,
+           hasta: date | None = None) -> str:
     cuenta = context.get("cuenta")
     titular = context.get("titular")
     if cuenta:
@@ -47,14 +48,19 @@ def movurl(context, mov,
 
     if fecha:
         return base_url + f"?fecha={fecha}"
-    if page:
-        return base_url + f"?page={page}"
+    if desde:
+        return base_url + f"?desde={desde}"
+    if hasta:
+        return base_url + f"?hasta={hasta}"
 
     return base_url
 
 
 @register.simple_tag(takes_context=True)
-def pageurl(context, page: int | None = None) -> str:
+def pageurl(context,
+            page: int | None = None,
+            desde: date | None = None,
+            hasta: date | None = None) -> str:
     request = context["request"]
     resolver_match = resolve(request.path)
 
@@ -73,6 +79,10 @@ def pageurl(context, page: int | None = None) -> str:
 
     if page:
         querydict = f"?page={page}"
+    elif desde:
+        querydict = f"?desde={desde}"
+    elif hasta:
+        querydict = f"?hasta={hasta}"
     else:
         querydict = ""
 
@@ -48,4 +48,6 @@ urlpatterns = [
     path('corregir_saldo', views.CorregirSaldo.as_view(), name='corregir_saldo'),
     path('modificar_saldo/<slug:sk>', views.modificar_saldo_view, name='modificar_saldo'),
     path('agregar_movimiento/<slug:sk>', views.agregar_movimiento_view,  name='agregar_movimiento'),
+    # Series para gráficos
+    path('serie_capital', views.serie_capital_view, name='serie_capital'),
 ]
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import date
+from typing import Iterable, TYPE_CHECKING
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+if TYPE_CHECKING:
+    from diario.models import Moneda
+
+CLAVE_VERSION = "diario:version_cotizaciones"
+
+
+class SerieCotizaciones:
+    """ Series de cotizaciones por moneda, ordenadas por fecha y guardadas en
+        memoria del proceso. Se cargan con una sola query y responden a
+        "cotización vigente a una fecha" por búsqueda binaria.
+        Se invalidan al guardar o eliminar una cotización. Para que la
+        invalidación alcance a otros procesos, cada carga registra la versión
+        guardada en la caché compartida, y sincronizar() (llamada una vez por
+        request) descarta las series si la versión cambió.
+    """
+    _series: dict[int, tuple[list[date], list[tuple[float, float]]]] | None = None
+    _version: str | None = None
+
+    @classmethod
+    def al(cls, id_moneda: int, fecha: date) -> tuple[float, float] | None:
+        """ Devuelve (importe_compra, importe_venta) de la última cotización
+            de la moneda a la fecha dada (inclusive), o None si no la hay.
+        """
+        fechas, importes = cls._cargar().get(id_moneda, ([], []))
+        posicion = bisect_right(fechas, fecha)
+        return importes[posicion - 1] if posicion else None
+
+    @classmethod
+    def ultima(cls, id_moneda: int) -> tuple[float, float] | None:
+        """ Devuelve (importe_compra, importe_venta) de la última cotización
+            de la moneda, o None si no la hay.
+        """
+        _, importes = cls._cargar().get(id_moneda, ([], []))
+        return importes[-1] if importes else None
+
+    @classmethod
+    def sincronizar(cls):
+        if cls._series is not None and cache.get(CLAVE_VERSION) != cls._version:
+            cls._series = None
+
+    @classmethod
+    def invalidar(cls):
+        cls._series = None
+        cls._nueva_version()
+        # Si la modificación ocurre dentro de una transacción, otro proceso
+        # puede recargar las series antes del commit.
+        transaction.on_commit(cls._nueva_version)
+
+    @classmethod
+    def _nueva_version(cls):
+        cache.set(CLAVE_VERSION, uuid4().hex, timeout=None)
+
+    @classmethod
+    def _cargar(cls) -> dict[int, tuple[list[date], list[tuple[float, float]]]]:
+        if cls._series is None:
+            from diario.models import Cotizacion
+
+            version = cache.get(CLAVE_VERSION)
+            series = dict()
+            for id_moneda, fecha, compra, venta in Cotizacion.objects.order_by(
+                    "moneda_id", "fecha"
+            ).values_list("moneda_id", "fecha", "importe_compra", "importe_venta"):
+                fechas, importes = series.setdefault(id_moneda, ([], []))
+                fechas.append(fecha)
+                importes.append((compra, venta))
+            cls._series, cls._version = series, version
+
+        return cls._series
+
+
+def cotizaciones_vigentes(monedas: Iterable[Moneda], fecha: date | None = None) -> dict[str, tuple[float, float]]:
+    """ Devuelve {moneda.sk: (importe_compra, importe_venta)} con la
+        cotización de cada moneda vigente a <fecha> (o la última, si no se
+        especifica fecha). Para monedas sin cotización devuelve (1, 1).
+    """
+    resultado = dict()
+    for moneda in monedas:
+        importes = SerieCotizaciones.al(moneda.pk, fecha) if fecha else SerieCotizaciones.ultima(moneda.pk)
+        resultado[moneda.sk] = importes or (1, 1)
+    return resultado
@@ -0,0 +1,69 @@
+""" Cálculo de saldos en distintas monedas sobre matrices representadas
+    como filas de floats: saldos (cuentas × días) y cotizaciones
+    (monedas × días). Las filas son listas de Python y se recorren elemento
+    a elemento; lo que se evita es recalcular el factor de conversión entre
+    dos monedas, que se calcula una sola vez por día y par de monedas,
+    independientemente de la cantidad de cuentas.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, Self
+
+from diario.models import Cotizacion
+
+Fila = list[float]
+
+
+def multiplicar_filas(saldos: Fila, factores: Fila) -> Fila:
+    """ Multiplica elemento a elemento dos filas, redondeando a 2 decimales. """
+    return [round(saldo * factor, 2) for saldo, factor in zip(saldos, factores)]
+
+
+class MatrizCotizaciones:
+    """ Importes de compra y venta de cada moneda en cada día de un rango. """
+
+    def __init__(self, importes: dict[int, list[tuple[float, float] | None]]):
+        self._importes = importes
+        self._factores: dict[tuple[int, int], Fila] = dict()
+
+    @classmethod
+    def cargar(cls, ids_monedas: Iterable[int], desde: date, hasta: date) -> Self:
+        """ Carga la matriz con una sola query. """
+        return cls(Cotizacion.importes_por_dia(ids_monedas, desde, hasta))
+
+    def factores(self, id_moneda_origen: int, id_moneda_destino: int) -> Fila:
+        """ Devuelve, para cada día, el factor de conversión de la moneda
+            de origen a la de destino (venta de origen / compra de destino),
+            o 1 si las monedas son iguales o falta alguna cotización.
+        """
+        clave = (id_moneda_origen, id_moneda_destino)
+        if clave not in self._factores:
+            origen = self._importes[id_moneda_origen]
+            if id_moneda_origen == id_moneda_destino:
+                self._factores[clave] = [1.0] * len(origen)
+            else:
+                self._factores[clave] = [
+                    cot_orig[1] / cot_dest[0] if cot_orig and cot_dest else 1.0
+                    for cot_orig, cot_dest in zip(origen, self._importes[id_moneda_destino])
+                ]
+        return self._factores[clave]
+
+    def convertir(
+            self,
+            saldos: dict[int, Fila],
+            monedas_cuentas: dict[int, int],
+            ids_monedas_destino: Iterable[int]) -> dict[tuple[int, int], Fila]:
+        """ Recibe las filas de saldos de cada cuenta en su propia moneda
+            ({id_cuenta: fila}) y la moneda de cada cuenta ({id_cuenta: id_moneda}),
+            y devuelve la fila de saldos de cada cuenta en cada moneda de
+            destino, en la forma {(id_cuenta, id_moneda_destino): fila}.
+        """
+        ids_monedas_destino = list(ids_monedas_destino)
+        return {
+            (id_cuenta, id_moneda): multiplicar_filas(
+                fila, self.factores(monedas_cuentas[id_cuenta], id_moneda)
+            )
+            for id_cuenta, fila in saldos.items()
+            for id_moneda in ids_monedas_destino
+        }
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from functools import cached_property
+from typing import Iterator, TYPE_CHECKING
+
+from django.db.models import QuerySet
+
+if TYPE_CHECKING:
+    from diario.models import Dia
+
+
+class PaginaDias:
+    """ Página de días ordenados de más reciente a más antiguo, obtenida por
+        cursor sobre la fecha en lugar de por número de página:
+        - sin cursor, los <cantidad> días más recientes.
+        - con <hasta>, los <cantidad> días más recientes hasta esa fecha inclusive
+          (página siguiente, con días anteriores).
+        - con <desde>, los <cantidad> días más antiguos desde esa fecha inclusive
+          (página anterior, con días posteriores).
+        Cada página se obtiene con una cantidad fija de queries sobre el índice
+        de fecha, independientemente de su posición. El número de página sólo
+        se calcula si se lo pide.
+        Se mantiene la interfaz de django.core.paginator.Page usada en vistas y
+        templates (iteración, has_next, has_previous, number).
+    """
+    fecha_minima = date.min
+
+    def __init__(
+            self,
+            dias: QuerySet[Dia],
+            hasta: date | None = None,
+            desde: date | None = None,
+            cantidad: int = 7):
+        self._dias = dias
+        self._cantidad = cantidad
+
+        if desde is not None:
+            filas = list(dias.filter(fecha__gte=desde).order_by("fecha")[:cantidad + 1])
+            if len(filas) > cantidad:
+                self.object_list = filas[:cantidad][::-1]
+                self.has_previous = True
+                self.has_next = dias.filter(fecha__lt=desde).exists()
+                return
+            # No hay más días posteriores: se muestra la primera página
+            hasta = None
+
+        filtrados = dias.filter(fecha__lte=hasta) if hasta is not None else dias
+        filas = list(filtrados.order_by("-fecha")[:cantidad + 1])
+        if not filas and hasta is not None:
+            # No hay días anteriores: se muestran los más antiguos
+            filas = list(dias.order_by("fecha")[:cantidad])[::-1]
+            hasta = filas[0].fecha if filas else None
+        self.object_list = filas[:cantidad]
+        self.has_next = len(filas) > cantidad
+        self.has_previous = hasta is not None and dias.filter(fecha__gt=hasta).exists()
+
+    @staticmethod
+    def hasta_centrado(dias: QuerySet[Dia], fecha: date, cantidad: int = 7) -> date:
+        """ Devuelve el cursor <hasta> de la página en la que el día de <fecha>
+            queda en el medio, con sus días aledaños antes y después (o al
+            principio, si no hay suficientes días posteriores).
+        """
+        posteriores = list(
+            dias.filter(fecha__gt=fecha).order_by("fecha").values_list("fecha", flat=True)[:cantidad // 2]
+        )
+        return posteriores[-1] if posteriores else fecha
+
+    @cached_property
+    def number(self) -> int:
+        if not self.object_list:
+            return 1
+        return self._dias.filter(fecha__gt=self.object_list[0].fecha).count() // self._cantidad + 1
+
+    @property
+    def hasta_siguiente(self) -> date | None:
+        """ Cursor de la página siguiente (días anteriores) """
+        return self.object_list[-1].fecha - timedelta(1) if self.has_next else None
+
+    @property
+    def desde_anterior(self) -> date | None:
+        """ Cursor de la página anterior (días posteriores) """
+        return self.object_list[0].fecha + timedelta(1) if self.has_previous else None
+
+    def __iter__(self) -> Iterator[Dia]:
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __contains__(self, dia: Dia) -> bool:
+        return dia in self.object_list
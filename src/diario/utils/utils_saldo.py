@@ -1,22 +1,114 @@
 from __future__ import annotations
 
+from datetime import date, timedelta
 from typing import List, TYPE_CHECKING, Optional, Iterable
 
-from diario.models import Cuenta, Moneda, SaldoDiario, Cotizacion, Movimiento
+from django.db.models import FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Round
+
+from diario.models import Cuenta, CuentaAcumulativa, CuentaInteractiva, Moneda, SaldoDiario, Movimiento, \
+    VerificacionPendiente
+from diario.utils.utils_matriz import MatrizCotizaciones
 from utils.numeros import float_format
 
 if TYPE_CHECKING:
-    from diario.models import Dia
+    from diario.models import Dia, Titular
+
+
+def verificar_saldos(incremental: bool = False) -> List['Cuenta']:
+    """ Devuelve las cuentas cuyo último saldo diario no coincide con la suma
+        de sus movimientos, verificadas todas en una sola query. Cada cuenta
+        se devuelve anotada con la diferencia (saldo - suma de movimientos).
+        Se incluyen las cuentas acumulativas, cuyos saldos diarios
+        corresponden a sus movimientos anteriores a la conversión.
+        Si incremental, verifica sólo las cuentas con verificación pendiente.
+        No modifica la base de datos (ver limpiar_pendientes).
+    """
+    def suma_movs(sentido: str) -> Coalesce:
+        return Coalesce(
+            Subquery(
+                Movimiento.objects.filter(**{f"cta_{sentido}_id": OuterRef("pk")})
+                .order_by()
+                .values(f"cta_{sentido}_id")
+                .annotate(total=Sum(Movimiento.expresion_importe_cta(sentido)))
+                .values("total"),
+                output_field=FloatField()
+            ),
+            0.0
+        )
 
+    ultimo_saldo = Coalesce(
+        Subquery(
+            SaldoDiario.objects.filter(cuenta_id=OuterRef("pk")).order_by("-fecha").values("_importe")[:1],
+            output_field=FloatField()
+        ),
+        0.0
+    )
 
-def verificar_saldos() -> List['Cuenta']:
-    ctas_erroneas = []
-    for cuenta in Cuenta.todes():
-        if not cuenta.saldo_ok():
-            ctas_erroneas.append(cuenta)
+    cuentas = Cuenta.todes()
+    if incremental:
+        cuentas = cuentas.filter(pk__in=VerificacionPendiente.objects.values("cuenta_id"))
+
+    diferencias = dict(
+        cuentas.annotate(
+            diferencia=Round(ultimo_saldo - suma_movs("entrada") - suma_movs("salida"), 2)
+        ).exclude(diferencia=0).values_list("pk", "diferencia")
+    )
+    if not diferencias:
+        return []
+
+    ctas_erroneas = list(Cuenta.todes().filter(pk__in=diferencias.keys()).order_by("pk"))
+    for cuenta in ctas_erroneas:
+        cuenta.diferencia = diferencias[cuenta.pk]
     return ctas_erroneas
 
 
+def limpiar_pendientes(ctas_erroneas: Iterable[Cuenta]):
+    """ Quita de las verificaciones pendientes a todas las cuentas salvo
+        <ctas_erroneas> (el resultado de una verificación de saldos).
+    """
+    VerificacionPendiente.objects.exclude(cuenta_id__in=[c.pk for c in ctas_erroneas]).delete()
+
+
+def serie_capital(
+        desde: date,
+        hasta: date,
+        moneda: Moneda,
+        titular: Titular | None = None,
+        mensual: bool = False) -> list[tuple[date, float]]:
+    """ Devuelve el capital total (o el de un titular) expresado en <moneda>
+        al final de cada día entre <desde> y <hasta>, o sólo al final de cada
+        mes (y del último día) si mensual. Se calcula a partir de los saldos
+        diarios y de las cotizaciones, con una cantidad fija de queries.
+        Se toman los saldos diarios de todas las cuentas (los de las cuentas
+        acumulativas corresponden a sus movimientos anteriores a la
+        conversión), de modo que el capital se conserva a lo largo del tiempo.
+    """
+    if titular:
+        monedas_cuentas = {
+            **dict(CuentaInteractiva.filtro(titular=titular).values_list("pk", "moneda_id")),
+            **dict(CuentaAcumulativa.filtro(titular_original=titular).values_list("pk", "moneda_id")),
+        }
+    else:
+        monedas_cuentas = dict(Cuenta.todes().values_list("pk", "moneda_id"))
+
+    saldos = SaldoDiario.importes_por_dia(monedas_cuentas.keys(), desde, hasta)
+    matriz = MatrizCotizaciones.cargar({*monedas_cuentas.values(), moneda.pk}, desde, hasta)
+    saldos_en_moneda = matriz.convertir(saldos, monedas_cuentas, [moneda.pk])
+
+    cantidad_dias = (hasta - desde).days + 1
+    totales = [0.0] * cantidad_dias
+    for fila in saldos_en_moneda.values():
+        totales = [total + saldo for total, saldo in zip(totales, fila)]
+
+    serie = []
+    for i, total in enumerate(totales):
+        fecha = desde + timedelta(i)
+        if not mensual or i == cantidad_dias - 1 or (fecha + timedelta(1)).month != fecha.month:
+            serie.append((fecha, round(total, 2)))
+    return serie
+
+
 def saldo_general_historico(
         mov: Optional['Movimiento'] = None,
         dia: Optional[Dia] = None,
@@ -49,43 +141,30 @@ def precalcular_saldos_cuentas(
             "para el cálculo de los saldos"
         )
 
-    cotizaciones = Cotizacion.indexar(
-        cuentas,
-        monedas,
-        dia.fecha if dia else movimiento.dia.fecha
+    cuentas = list(cuentas)
+    monedas = list(monedas)
+    fecha = dia.fecha if dia else movimiento.dia.fecha
+    matriz = MatrizCotizaciones.cargar(
+        {*[c.moneda_id for c in cuentas], *[m.pk for m in monedas]}, fecha, fecha
     )
 
-    cuentas_acumulativas = [c for c in cuentas if c.es_acumulativa]
-    cuentas_interactivas = [c for c in cuentas if c not in cuentas_acumulativas]
-
     if movimiento:
+        cuentas_acumulativas = [c for c in cuentas if c.es_acumulativa]
+        cuentas_interactivas = [c for c in cuentas if c not in cuentas_acumulativas]
         saldos = SaldoDiario.indexar_en_movimiento(cuentas_interactivas, movimiento)
         for cuenta in cuentas_acumulativas:
             saldos[cuenta.pk] = cuenta.saldo(movimiento=movimiento)
+    else:
+        saldos = SaldoDiario.indexar_por_dia(cuentas, dia)
 
-        return {
-            cuenta.pk: {
-                moneda.sk: float_format(
-                    round(
-                        saldos.get(cuenta.pk, 0) *
-                        cotizaciones.get((cuenta.moneda_id, moneda.pk), 1.0),
-                        2
-                    )
-                )
-                for moneda in monedas
-            }
-            for cuenta in cuentas
-        }
-
-    saldos_diarios = SaldoDiario.indexar_por_dia(cuentas, dia)
+    saldos_en_monedas = matriz.convertir(
+        {c.pk: [saldos.get(c.pk, 0)] for c in cuentas},
+        {c.pk: c.moneda_id for c in cuentas},
+        [m.pk for m in monedas],
+    )
     return {
         cuenta.pk: {
-            moneda.sk: float_format(
-                round(
-                    saldos_diarios.get(cuenta.pk, 0) *
-                    cotizaciones.get((cuenta.moneda_id, moneda.pk)),
-                    2
-                )
-            ) for moneda in monedas
+            moneda.sk: float_format(saldos_en_monedas[(cuenta.pk, moneda.pk)][0])
+            for moneda in monedas
         } for cuenta in cuentas
     }
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from datetime import date
+from urllib.parse import urlencode
 from typing import Any, cast, Iterable
 
 from django import forms
 from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
 from django.db.models.functions import Lower
-from django.http import HttpResponseRedirect, HttpRequest, HttpResponse
+from django.http import HttpResponseRedirect, HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse, reverse_lazy
 from django.views.generic import CreateView, DeleteView, TemplateView, \
@@ -16,20 +17,16 @@ from django.views.generic import CreateView, DeleteView, TemplateView, \
 from diario.forms import FormCotizacion, FormCuenta, FormMovimiento, \
     FormDividirCuenta, FormCrearSubcuenta, FormTitular, FormMoneda
 from diario.models import Cuenta, CuentaInteractiva, CuentaAcumulativa, Dia, \
-    Movimiento, Titular, Moneda, Cotizacion
+    Movimiento, Titular, Moneda, Cotizacion, SaldoDiario
 from diario.settings_app import TEMPLATE_HOME
-from diario.utils.utils_saldo import saldo_general_historico, verificar_saldos, precalcular_saldos_cuentas
+from diario.utils.utils_cotizacion import cotizaciones_vigentes
+from diario.utils.utils_paginacion import PaginaDias
+from diario.utils.utils_saldo import saldo_general_historico, verificar_saldos, precalcular_saldos_cuentas, \
+    serie_capital
 from utils.numeros import float_format
 from utils.tiempo import str2date
 
 
-def pag_de_fecha(fecha: date, ente: Cuenta | Titular | None) -> int:
-    """ Calcula página a partir de fecha """
-    queryset = ente.dias() if ente else Dia.con_movimientos()
-    posicion = queryset.filter(fecha__gt=fecha).count()
-    return (posicion // 7) + 1
-
-
 class BaseHomeView(TemplateView):
     template_name = TEMPLATE_HOME
     prefijo_url = ""
@@ -56,18 +53,17 @@ class BaseHomeView(TemplateView):
             dia = dia.anterior()
             movs = dia.movs(ente=ente)
 
-        page = pag_de_fecha(str2date(fecha), ente)
         args = self.get_url_args(ente)
         args += [movs.last().sk]
+        hasta = PaginaDias.hasta_centrado(dias_query, dia.fecha)
 
         return redirect(
-            reverse(f"{self.prefijo_url}movimiento", args=args) + f"?page={page}&redirected=1",
+            reverse(f"{self.prefijo_url}movimiento", args=args) + f"?{urlencode({'hasta': hasta})}",
         )
 
     def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
         fecha = request.GET.get("fecha")
-        pag = request.GET.get("page")
-        redirected = request.GET.get("redirected")
+        cursor = {k: request.GET[k] for k in ("desde", "hasta") if request.GET.get(k)}
 
         ente = self.get_ente(kwargs)
         dias = ente.dias() if ente else Dia.con_movimientos()
@@ -75,23 +71,29 @@ class BaseHomeView(TemplateView):
         if fecha:
             return self._redirect_con_fecha(fecha, ente)
 
-        self.dias_pag = Paginator(dias.reverse(), 7).get_page(pag)
+        try:
+            self.dias_pag = PaginaDias(dias, **{k: str2date(v) for k, v in cursor.items()})
+        except ValueError:
+            self.dias_pag = PaginaDias(dias)
+        querystring = f"?{urlencode(cursor)}" if cursor else ""
 
         movimiento = Movimiento.tomar_o_nada(sk=kwargs.get("sk_mov"))
         condition = (
-            (pag and not movimiento) or
+            (cursor and not movimiento) or
             (movimiento and movimiento.dia not in self.dias_pag)
-        ) and not redirected
+        )
 
         if condition:
             mov = self.dias_pag[0].movimientos.last()
             url = mov.get_url(ente)
-            return redirect(url + f"?page={pag}")
+            return redirect(url + querystring)
 
         return super().get(request, *args, **kwargs)
 
     @staticmethod
     def _get_context_comun(ente: Cuenta | Titular | None, movimiento: Movimiento) -> dict[str, Any]:
+        if movimiento:
+            Movimiento.numerar_en_dia([movimiento])
         movimiento_en_titulo = \
             f" en movimiento {movimiento.orden_dia} " \
             f"del {movimiento.fecha} ({movimiento.concepto})" \
@@ -169,6 +171,7 @@ class BaseHomeView(TemplateView):
             Cuenta.filtro(cta_madre=None, activa=True)
                 .select_related("moneda", "content_type")
         )
+        saldos = SaldoDiario.indexar_por_rango(cuentas=cuentas_raiz, dias=self.dias_pag)
         return {
                 "saldo_gral":
                     saldo_general_historico(movimiento) if movimiento
@@ -177,10 +180,7 @@ class BaseHomeView(TemplateView):
                 "titulares": Titular.todes(),
                 "cuentas": cuentas,
                 "saldos_por_dia": {
-                    dia.pk: float_format(saldo_general_historico(
-                        dia=dia,
-                        cuentas=cuentas_raiz,
-                    ))
+                    dia.pk: float_format(round(sum(saldos[(c.pk, dia.pk)] for c in cuentas_raiz), 2))
                     for dia in self.dias_pag
                 },
                 "saldos_cuentas": self._calcular_saldos_cuentas(cuentas, monedas, movimiento),
@@ -194,6 +194,9 @@ class BaseHomeView(TemplateView):
         context.update(self._get_context_comun(ente, movimiento))
         context.update(self.get_context_especifico(ente, movimiento))
         context["dias"] = self.dias_pag
+        context["cotizaciones"] = cotizaciones_vigentes(
+            context["monedas"], movimiento.fecha if movimiento else None
+        )
 
         return context
 
@@ -218,6 +221,7 @@ class CuentaHomeView(BaseHomeView):
         cuentas = self._cuentas_ordenadas(
             list(ente.subcuentas.all()), cta_madre=ente
         ) if ente.es_acumulativa else []
+        saldos = SaldoDiario.indexar_por_rango(cuentas=[ente], dias=self.dias_pag)
 
         return {
             "saldo_gral": ente.saldo(movimiento),
@@ -231,7 +235,7 @@ class CuentaHomeView(BaseHomeView):
             ),
             "cuentas": cuentas,
             "saldos_por_dia": {
-                dia.pk: float_format(ente.saldo(dia=dia))
+                dia.pk: float_format(saldos[(ente.pk, dia.pk)])
                         for dia in self.dias_pag
             },
             "saldos_cuentas": self._calcular_saldos_cuentas(cuentas, monedas, movimiento),
@@ -257,6 +261,8 @@ class TitularHomeView(BaseHomeView):
                 titular=ente
             )
         )
+        cuentas_interactivas = list(ente.cuentas_interactivas())
+        saldos = SaldoDiario.indexar_por_rango(cuentas=cuentas_interactivas, dias=self.dias_pag)
 
         return {
             "saldo_gral": ente.capital(movimiento),
@@ -264,7 +270,7 @@ class TitularHomeView(BaseHomeView):
             "titulares": Titular.todes(),
             "cuentas": cuentas,
             "saldos_por_dia": {
-                dia.pk: float_format(ente.capital(dia=dia))
+                dia.pk: float_format(round(sum(saldos[(c.pk, dia.pk)] for c in cuentas_interactivas), 2))
                         for dia in self.dias_pag
             },
             "saldos_cuentas": self._calcular_saldos_cuentas(cuentas, monedas, movimiento)
@@ -639,7 +645,7 @@ class CorregirSaldo(TemplateView):
 
 
 def verificar_saldos_view(request):
-    ctas_erroneas = verificar_saldos()
+    ctas_erroneas = verificar_saldos(incremental=bool(request.GET.get('incremental')))
     if len(ctas_erroneas) > 0:
         sks = '!'.join([c.sk.lower() for c in ctas_erroneas])
         return redirect(f"{reverse('corregir_saldo')}?ctas={sks}")
@@ -647,6 +653,38 @@ def verificar_saldos_view(request):
     return redirect(reverse('home'))
 
 
+def serie_capital_view(request):
+    """ Devuelve en JSON la serie diaria o mensual del capital total (o de
+        un titular, si se recibe "titular") en la moneda indicada (o en la
+        moneda base) entre las fechas "desde" y "hasta" (hoy por defecto).
+    """
+    try:
+        desde = str2date(request.GET["desde"])
+        hasta = str2date(request.GET["hasta"]) if request.GET.get("hasta") else date.today()
+    except (KeyError, ValueError):
+        return JsonResponse({"error": "Fechas mal formateadas. Deben ser YYYY-MM-DD"}, status=400)
+    if desde > hasta:
+        return JsonResponse({"error": "La fecha inicial es posterior a la final"}, status=400)
+
+    frecuencia = request.GET.get("frecuencia", "diaria")
+    if frecuencia not in ("diaria", "mensual"):
+        return JsonResponse({"error": "La frecuencia debe ser diaria o mensual"}, status=400)
+
+    sk_moneda = request.GET.get("moneda")
+    moneda = get_object_or_404(Moneda, sk=sk_moneda) if sk_moneda else Moneda.base()
+    sk_titular = request.GET.get("titular")
+    titular = get_object_or_404(Titular, sk=sk_titular) if sk_titular else None
+
+    serie = serie_capital(desde, hasta, moneda, titular=titular, mensual=frecuencia == "mensual")
+
+    return JsonResponse({
+        "moneda": moneda.sk,
+        "titular": titular.sk if titular else None,
+        "frecuencia": frecuencia,
+        "serie": [{"fecha": fecha.isoformat(), "saldo": saldo} for fecha, saldo in serie],
+    })
+
+
 def modificar_saldo_view(request, sk):
     cta_a_corregir = Cuenta.tomar(sk=sk)
     cta_a_corregir.recalcular_saldos_diarios()
@@ -59,6 +59,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'diario.middleware.sincronizar_cotizaciones',
 ]
 
 ROOT_URLCONF = 'finper.urls'
@@ -111,6 +112,25 @@ else:
     }
 
 
+# Cache
+# Compartida entre procesos (p.ej. workers de gunicorn). Se usa para sincronizar
+# las series de cotizaciones que cada proceso guarda en memoria.
+
+if TESTING:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': Path(db_path).parent / 'cache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -1,5 +1,7 @@
 import pytest
 
+from diario.utils.utils_cotizacion import SerieCotizaciones
+
 
 pytest_plugins = [
     "tests.fixtures_archivo",
@@ -16,6 +18,12 @@ pytest_plugins = [
 ]
 
 
+@pytest.fixture(autouse=True)
+def serie_cotizaciones_vacia():
+    # Las series en memoria sobreviven al vaciado de la base entre tests
+    SerieCotizaciones.invalidar()
+
+
 @pytest.fixture
 def none():
     return None
@@ -0,0 +1,78 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+from django.core.management import call_command
+
+from diario.models import Cotizacion
+
+
+@pytest.fixture
+def archivo_csv(tmp_path, dolar, euro):
+    archivo = tmp_path / "cotizaciones.csv"
+    archivo.write_text(
+        "fecha,moneda,importe_compra,importe_venta\n"
+        f"2020-01-01,{dolar.sk},100,110\n"
+        f"2020-01-02,{dolar.sk},101,\n"
+        f"2020-01-01,{euro.sk},200,220\n"
+    )
+    return archivo
+
+
+def test_carga_cotizaciones_de_archivo_csv(archivo_csv, dolar, euro):
+    call_command("cargar_cotizaciones", str(archivo_csv))
+    cot = Cotizacion.tomar(moneda=euro, fecha=date(2020, 1, 1))
+    assert (cot.importe_compra, cot.importe_venta) == (200, 220)
+    assert Cotizacion.filtro(moneda=dolar, fecha__year=2020).count() == 2
+
+
+def test_carga_cotizaciones_de_archivo_json(tmp_path, dolar):
+    archivo = tmp_path / "cotizaciones.json"
+    archivo.write_text(json.dumps([
+        {"fecha": "2020-01-01", "moneda": dolar.sk, "importe_compra": 100, "importe_venta": 110},
+    ]))
+    call_command("cargar_cotizaciones", str(archivo))
+    assert Cotizacion.tomar(moneda=dolar, fecha=date(2020, 1, 1)).importe_venta == 110
+
+
+def test_completa_importe_faltante_con_el_existente(archivo_csv, dolar):
+    call_command("cargar_cotizaciones", str(archivo_csv))
+    assert Cotizacion.tomar(moneda=dolar, fecha=date(2020, 1, 2)).importe_venta == 101
+
+
+def test_genera_sk_de_cotizaciones(archivo_csv, dolar):
+    call_command("cargar_cotizaciones", str(archivo_csv))
+    assert Cotizacion.tomar(moneda=dolar, fecha=date(2020, 1, 1)).sk == f"20200101{dolar.sk}"
+
+
+def test_actualiza_cotizaciones_existentes_de_la_misma_fecha_y_moneda(archivo_csv, dolar):
+    Cotizacion.crear(moneda=dolar, fecha=date(2020, 1, 1), importe_compra=1, importe_venta=2)
+    call_command("cargar_cotizaciones", str(archivo_csv))
+    cot = Cotizacion.tomar(moneda=dolar, fecha=date(2020, 1, 1))
+    assert (cot.importe_compra, cot.importe_venta) == (100, 110)
+    assert Cotizacion.filtro(moneda=dolar, fecha=date(2020, 1, 1)).count() == 1
+
+
+def test_cotizaciones_cargadas_se_reflejan_en_cotizacion_al(archivo_csv, dolar):
+    dolar.cotizacion_al(date(2020, 1, 1), compra=True)
+    call_command("cargar_cotizaciones", str(archivo_csv))
+    assert dolar.cotizacion_al(date(2020, 1, 1), compra=True) == 100
+
+
+def test_da_error_si_moneda_no_existe(tmp_path, dolar):
+    archivo = tmp_path / "cotizaciones.csv"
+    archivo.write_text("fecha,moneda,importe_compra,importe_venta\n2020-01-01,xx,100,110\n")
+    with pytest.raises(ValueError, match="Moneda xx no existe"):
+        call_command("cargar_cotizaciones", str(archivo))
+
+
+def test_escribe_cotizaciones_en_lotes(tmp_path, dolar, django_assert_max_num_queries):
+    archivo = tmp_path / "cotizaciones.csv"
+    archivo.write_text(
+        "fecha,moneda,importe_compra,importe_venta\n" + "".join(
+            f"{date(2020, 1, 1) + timedelta(x)},{dolar.sk},{x},{x}\n" for x in range(1, 501)
+        )
+    )
+    with django_assert_max_num_queries(10):
+        call_command("cargar_cotizaciones", str(archivo), "--lote", "200")
+    assert Cotizacion.filtro(moneda=dolar, fecha__year__gte=2020).count() == 500
@@ -1,28 +1,32 @@
+from concurrent.futures import Future
 from datetime import timedelta
+from io import StringIO
 
 import pytest
 from django.core.management import call_command
 
-from diario.models import SaldoDiario, Movimiento
+from diario.management.commands.regenerar_saldos_diarios import _procesar_cuenta, _inicializar_worker, \
+    TIMEOUT_SQLITE
+from diario.models import Cuenta, SaldoDiario, Movimiento
 
 
-def test_borra_saldos_diarios_antes_de_recalcular(
-        entrada, salida, entrada_otra_cuenta, salida_posterior, entrada_tardia_cuenta_ajena, mocker):
-    saldos_diarios = SaldoDiario.todes()
-    mock_delete = mocker.patch("diario.models.SaldoDiario.delete", autospec=True)
+def test_borra_saldos_diarios_sin_movimientos(
+        cuenta, entrada, salida, entrada_otra_cuenta, dia_posterior):
+    SaldoDiario.crear(cuenta=cuenta, dia=dia_posterior, importe=1000)
     call_command("regenerar_saldos_diarios")
-    for sd in saldos_diarios:
-        assert mocker.call(sd) in mock_delete.call_args_list
+    assert not SaldoDiario.filtro(cuenta=cuenta, dia=dia_posterior).exists()
 
 
-def test_calcula_saldos_diarios_a_partir_de_movimientos(
-        entrada, salida, entrada_otra_cuenta, salida_posterior, entrada_tardia_cuenta_ajena, mocker):
-    mock_calcular = mocker.patch("diario.models.SaldoDiario.calcular")
+def test_genera_un_saldo_diario_por_cuenta_y_dia_con_movimientos(
+        entrada, salida, entrada_otra_cuenta, salida_posterior, entrada_tardia_cuenta_ajena):
     call_command("regenerar_saldos_diarios")
-    for mov in Movimiento.todes():
-        campos_cuenta = [x for x in ("cta_entrada", "cta_salida") if getattr(mov, x) is not None]
-        for cc in campos_cuenta:
-            assert mocker.call(mov, cc) in mock_calcular.call_args_list
+    pares_cuenta_dia = {
+        (cuenta_id, mov.dia_id)
+        for mov in Movimiento.todes()
+        for cuenta_id in (mov.cta_entrada_id, mov.cta_salida_id) if cuenta_id is not None
+    }
+    assert set(SaldoDiario.todes().values_list("cuenta_id", "dia_id")) == pares_cuenta_dia
+    assert SaldoDiario.cantidad() == len(pares_cuenta_dia)
 
 
 def test_importe_de_saldos_diarios_calculados_corresponde_a_movimientos(
@@ -74,50 +78,46 @@ def test_permite_recalcular_saldos_diarios_de_una_cuenta_dada(
 
 
 def test_permite_recalcular_saldos_diarios_a_partir_de_una_fecha_dada(
-        mocker, dia_anterior, dia, dia_posterior, cuenta,
+        dia_anterior, dia, dia_posterior, cuenta, cuenta_2,
         entrada_anterior, entrada, salida, traspaso, salida_posterior):
-    mock_delete = mocker.patch("diario.models.SaldoDiario.delete", autospec=True)
-    mock_calcular = mocker.patch("diario.models.SaldoDiario.calcular")
-
-    saldo_dia, saldo_otra_cuenta, saldo_dia_posterior = SaldoDiario.filtro(dia__gte=dia)
+    saldos = list(SaldoDiario.todes())
+    importes = {sd.pk: sd.importe for sd in saldos}
+    for sd in saldos:
+        sd.importe += 10
+        sd.save(actualizar_posteriores=False)
 
     call_command("regenerar_saldos_diarios", desde=str(dia))
 
-    assert mock_delete.call_args_list == [
-        mocker.call(saldo_dia),
-        mocker.call(saldo_dia_posterior),
-        mocker.call(saldo_otra_cuenta),
-    ]
-    assert mock_calcular.call_args_list == [
-        mocker.call(entrada, "cta_entrada"),
-        mocker.call(salida, "cta_salida"),
-        mocker.call(traspaso, "cta_entrada"),
-        mocker.call(salida_posterior, "cta_salida"),
-        mocker.call(traspaso, "cta_salida"),
-    ]
+    for sd in saldos:
+        importe_bd = SaldoDiario.tomar(cuenta=sd.cuenta, dia=sd.dia).importe
+        if sd.dia == dia_anterior:
+            assert importe_bd == importes[sd.pk] + 10
+        elif sd.cuenta == cuenta:
+            # Se recalcula a partir del saldo anterior (alterado)
+            assert importe_bd == importes[sd.pk] + 10
+        else:
+            assert importe_bd == importes[sd.pk]
 
 
 def test_permite_recalcular_saldos_diarios_de_una_cuenta_a_partir_de_una_fecha_dada(
-        mocker, cuenta, cuenta_2, dia_anterior, dia, dia_posterior,
+        cuenta, cuenta_2, dia_anterior, dia, dia_posterior,
         entrada_anterior, entrada_anterior_otra_cuenta, entrada, salida,
         traspaso, entrada_otra_cuenta, salida_posterior, entrada_posterior_otra_cuenta):
-    mock_delete = mocker.patch("diario.models.SaldoDiario.delete", autospec=True)
-    mock_calcular = mocker.patch("diario.models.SaldoDiario.calcular")
-
-    saldo_dia_cuenta, saldo_dia_posterior_cuenta = SaldoDiario.filtro(dia__gte=dia, cuenta=cuenta)
+    saldo_anterior = SaldoDiario.tomar(cuenta=cuenta, dia=dia_anterior)
+    saldo_dia_cuenta = SaldoDiario.tomar(cuenta=cuenta, dia=dia)
+    saldo_dia_cuenta_2 = SaldoDiario.tomar(cuenta=cuenta_2, dia=dia)
+    importe_anterior = saldo_anterior.importe
+    importe_dia_cuenta = saldo_dia_cuenta.importe
+    importe_dia_cuenta_2 = saldo_dia_cuenta_2.importe
+    for sd in saldo_anterior, saldo_dia_cuenta, saldo_dia_cuenta_2:
+        sd.importe += 10
+        sd.save(actualizar_posteriores=False)
 
     call_command("regenerar_saldos_diarios", cuenta=cuenta.sk, desde=str(dia))
 
-    assert mock_delete.call_args_list == [
-        mocker.call(saldo_dia_cuenta),
-        mocker.call(saldo_dia_posterior_cuenta),
-    ]
-    assert mock_calcular.call_args_list == [
-        mocker.call(entrada, "cta_entrada"),
-        mocker.call(salida, "cta_salida"),
-        mocker.call(traspaso, "cta_entrada"),
-        mocker.call(salida_posterior, "cta_salida")
-    ]
+    assert saldo_anterior.tomar_de_bd().importe == importe_anterior + 10
+    assert saldo_dia_cuenta.tomar_de_bd().importe == importe_dia_cuenta + 10
+    assert saldo_dia_cuenta_2.tomar_de_bd().importe == importe_dia_cuenta_2 + 10
 
 
 def test_si_se_pasa_sk_de_cuenta_inexistente_sale_con_error():
@@ -136,3 +136,195 @@ def test_si_se_pasa_fecha_de_dia_inexistente_sale_con_error(
      fecha_desde = dia_anterior.fecha + timedelta(1)
      call_command("regenerar_saldos_diarios", desde=fecha_desde.strftime("%Y-%m-%d"))
      mock_recalcular.assert_called_with(desde=dia)
+
+
+def test_recalcula_saldos_diarios_de_cuentas_acumulativas(cuenta_acumulativa):
+    saldos = list(SaldoDiario.filtro(cuenta=cuenta_acumulativa))
+    importes = {sd.pk: sd.importe for sd in saldos}
+    for sd in saldos:
+        sd.importe += 10
+        sd.save(actualizar_posteriores=False)
+
+    call_command("regenerar_saldos_diarios")
+
+    for sd in saldos:
+        assert SaldoDiario.tomar(cuenta=sd.cuenta, dia=sd.dia).importe == importes[sd.pk]
+
+
+class FakeExecutor:
+    """ Ejecuta las tareas en el mismo proceso, para poder usar la base de
+        datos de test.
+    """
+    def __init__(self, max_workers=None, initializer=None):
+        self.max_workers = max_workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def submit(self, funcion, *args):
+        futuro = Future()
+        futuro.set_result(funcion(*args))
+        return futuro
+
+
+class TestWorkers:
+    @pytest.fixture
+    def mock_executor(self, mocker):
+        mocker.patch("diario.management.commands.regenerar_saldos_diarios.connections")
+        return mocker.patch(
+            "diario.management.commands.regenerar_saldos_diarios.ProcessPoolExecutor",
+            side_effect=FakeExecutor,
+        )
+
+    def test_reparte_cuentas_interactivas_entre_procesos(
+            self, mock_executor, cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+        call_command("regenerar_saldos_diarios", workers=3)
+        assert mock_executor.call_args.kwargs["max_workers"] == 3
+
+    def test_con_un_solo_worker_no_usa_procesos(
+            self, mock_executor, cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+        call_command("regenerar_saldos_diarios")
+        mock_executor.assert_not_called()
+
+    def test_resultado_es_igual_al_de_un_solo_proceso(
+            self, mock_executor, cuenta, cuenta_2, entrada, salida, traspaso,
+            entrada_otra_cuenta, salida_posterior):
+        saldos = list(SaldoDiario.todes())
+        importes = {sd.pk: sd.importe for sd in saldos}
+        for sd in saldos:
+            sd.importe += 10
+            sd.save(actualizar_posteriores=False)
+
+        call_command("regenerar_saldos_diarios", workers=2)
+
+        for sd in saldos:
+            assert SaldoDiario.tomar(cuenta=sd.cuenta, dia=sd.dia).importe == importes[sd.pk]
+
+    def test_procesa_cuentas_acumulativas_despues_de_las_interactivas(
+            self, mock_executor, mocker, cuenta_acumulativa, cuenta_2, entrada_otra_cuenta):
+        spy = mocker.spy(Cuenta, "recalcular_saldos_diarios")
+        call_command("regenerar_saldos_diarios", workers=2)
+        cuentas = [c.args[0] for c in spy.call_args_list]
+        assert cuentas[-1].sk == cuenta_acumulativa.sk
+        assert all(c.es_interactiva for c in cuentas[:-1])
+
+    def test_procesos_esperan_a_que_se_libere_la_base_de_datos_sqlite(self, mocker):
+        mocker.patch("diario.management.commands.regenerar_saldos_diarios.django")
+        mock_connections = mocker.patch("diario.management.commands.regenerar_saldos_diarios.connections")
+        sqlite = mocker.Mock(vendor="sqlite", settings_dict={"OPTIONS": {}})
+        otra = mocker.Mock(vendor="postgresql", settings_dict={"OPTIONS": {}})
+        mock_connections.all.return_value = [sqlite, otra]
+
+        _inicializar_worker()
+
+        assert sqlite.settings_dict["OPTIONS"] == {"timeout": TIMEOUT_SQLITE, "transaction_mode": "IMMEDIATE"}
+        assert otra.settings_dict["OPTIONS"] == {}
+
+
+class TestCheckpoint:
+    def test_si_se_interrumpe_conserva_registro_de_cuentas_procesadas(
+            self, mocker, tmp_path, cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+        archivo = tmp_path / "checkpoint.txt"
+
+        def procesar_o_interrumpir(pk, *args):
+            if pk != cuenta.pk:
+                raise KeyboardInterrupt
+            return _procesar_cuenta(pk, *args)
+
+        mocker.patch(
+            "diario.management.commands.regenerar_saldos_diarios._procesar_cuenta",
+            side_effect=procesar_o_interrumpir,
+        )
+
+        with pytest.raises(KeyboardInterrupt):
+            call_command("regenerar_saldos_diarios", checkpoint=str(archivo))
+
+        assert archivo.read_text().split() == [cuenta.sk]
+
+    def test_al_terminar_elimina_archivo(self, tmp_path, cuenta, entrada):
+        archivo = tmp_path / "checkpoint.txt"
+        call_command("regenerar_saldos_diarios", checkpoint=str(archivo))
+        assert not archivo.exists()
+
+    def test_omite_cuentas_registradas_en_archivo(
+            self, tmp_path, cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+        archivo = tmp_path / "checkpoint.txt"
+        archivo.write_text(f"{cuenta.sk}\n")
+        saldo_cuenta = SaldoDiario.tomar(cuenta=cuenta, dia=entrada.dia)
+        saldo_cuenta_2 = SaldoDiario.tomar(cuenta=cuenta_2, dia=entrada_otra_cuenta.dia)
+        importe_cuenta = saldo_cuenta.importe
+        importe_cuenta_2 = saldo_cuenta_2.importe
+        for sd in saldo_cuenta, saldo_cuenta_2:
+            sd.importe += 10
+            sd.save(actualizar_posteriores=False)
+
+        call_command("regenerar_saldos_diarios", checkpoint=str(archivo))
+
+        assert saldo_cuenta.tomar_de_bd().importe == importe_cuenta + 10
+        assert saldo_cuenta_2.tomar_de_bd().importe == importe_cuenta_2
+
+
+class TestVerifyOnly:
+    def test_no_modifica_saldos_diarios(self, cuenta, entrada, salida):
+        saldo = SaldoDiario.tomar(cuenta=cuenta, dia=entrada.dia)
+        saldo.importe += 10
+        saldo.save(actualizar_posteriores=False)
+
+        call_command("regenerar_saldos_diarios", verify_only=True, stdout=StringIO())
+
+        assert saldo.tomar_de_bd().importe == saldo.importe
+
+    def test_informa_cuentas_con_diferencias(self, cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+        saldo = SaldoDiario.tomar(cuenta=cuenta, dia=entrada.dia)
+        importe = saldo.importe
+        saldo.importe += 10
+        saldo.save(actualizar_posteriores=False)
+        salida = StringIO()
+
+        call_command("regenerar_saldos_diarios", verify_only=True, stdout=salida)
+
+        assert f"{cuenta.sk} {entrada.fecha}: guardado {importe + 10} - calculado {importe}" in salida.getvalue()
+        assert f"{cuenta_2.sk} {entrada_otra_cuenta.fecha}" not in salida.getvalue()
+        assert "1 cuentas con diferencias" in salida.getvalue()
+
+    def test_informa_saldos_diarios_sobrantes(self, cuenta, entrada, dia_posterior):
+        SaldoDiario.crear(cuenta=cuenta, dia=dia_posterior, importe=1000)
+        salida = StringIO()
+
+        call_command("regenerar_saldos_diarios", verify_only=True, stdout=salida)
+
+        assert f"{cuenta.sk} {dia_posterior.fecha}: guardado 1000.0 - calculado None" in salida.getvalue()
+
+    def test_no_informa_ok_en_cuentas_con_diferencias(self, cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+        saldo = SaldoDiario.tomar(cuenta=cuenta, dia=entrada.dia)
+        saldo.importe += 10
+        saldo.save(actualizar_posteriores=False)
+        salida = StringIO()
+
+        call_command("regenerar_saldos_diarios", verify_only=True, stdout=salida)
+
+        lineas = salida.getvalue().splitlines()
+        assert any(linea.endswith(f"{cuenta.sk} - 1 diferencias") for linea in lineas)
+        assert not any(linea.endswith(f"{cuenta.sk} - OK") for linea in lineas)
+        assert any(linea.endswith(f"{cuenta_2.sk} - OK") for linea in lineas)
+
+    def test_no_registra_cuentas_en_checkpoint(self, tmp_path, cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+        archivo = tmp_path / "checkpoint.txt"
+        archivo.write_text(f"{cuenta_2.sk}\n")
+        saldo = SaldoDiario.tomar(cuenta=cuenta, dia=entrada.dia)
+        saldo.importe += 10
+        saldo.save(actualizar_posteriores=False)
+        salida = StringIO()
+
+        call_command("regenerar_saldos_diarios", verify_only=True, checkpoint=str(archivo), stdout=salida)
+
+        assert archivo.read_text() == f"{cuenta_2.sk}\n"
+        assert f"{cuenta.sk} {entrada.fecha}" in salida.getvalue()
+
+    def test_sin_diferencias_lo_informa(self, cuenta, entrada, salida):
+        salida_cmd = StringIO()
+        call_command("regenerar_saldos_diarios", verify_only=True, stdout=salida_cmd)
+        assert "No se encontraron diferencias" in salida_cmd.getvalue()
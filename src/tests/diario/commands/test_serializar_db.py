@@ -161,6 +161,13 @@ def test_serializa_movimientos_con_natural_key_dia(entrada, db_serializada):
     mov = db_serializada.primere("diario.movimiento", concepto="Entrada")
     assert mov.fields["dia"] == [str(entrada.dia)]
 
+
+def test_serializa_movimientos_con_su_orden_dia_dentro_del_dia(entrada, salida, traspaso, db_serializada):
+    for mov in entrada, salida, traspaso:
+        mov_ser = db_serializada.primere("diario.movimiento", concepto=mov.concepto)
+        assert mov_ser.fields["orden_dia"] == mov.orden_dia
+        assert "_orden_dia" not in mov_ser.fields
+
 def test_serializa_saldos_diarios_con_natural_key_cuenta(saldo_diario, db_serializada):
     sd = db_serializada.primere(
         "diario.saldodiario",
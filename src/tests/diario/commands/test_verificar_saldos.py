@@ -0,0 +1,41 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from diario.models import VerificacionPendiente
+
+
+def alterar_saldo(cuenta, importe):
+    saldo = cuenta.ultimo_saldo
+    saldo.importe += importe
+    saldo.save(actualizar_posteriores=False)
+
+
+def test_informa_cuentas_con_saldo_erroneo(cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+    alterar_saldo(cuenta, 10)
+    salida = StringIO()
+    call_command("verificar_saldos", stdout=salida)
+    assert f"{cuenta.sk}: diferencia 10.0" in salida.getvalue()
+    assert cuenta_2.sk not in salida.getvalue()
+
+
+def test_informa_si_no_hay_saldos_erroneos(cuenta, entrada):
+    salida = StringIO()
+    call_command("verificar_saldos", stdout=salida)
+    assert "No se encontraron saldos erróneos" in salida.getvalue()
+
+
+def test_con_argumento_incremental_verifica_solo_cuentas_pendientes(cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+    alterar_saldo(cuenta, 10)
+    alterar_saldo(cuenta_2, 10)
+    VerificacionPendiente.filtro(cuenta=cuenta).delete()
+    salida = StringIO()
+    call_command("verificar_saldos", "--incremental", stdout=salida)
+    assert cuenta.sk not in salida.getvalue()
+    assert cuenta_2.sk in salida.getvalue()
+
+
+def test_quita_verificacion_pendiente_de_cuentas_sin_diferencias(cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+    alterar_saldo(cuenta, 10)
+    call_command("verificar_saldos", stdout=StringIO())
+    assert list(VerificacionPendiente.todes().values_list("cuenta_id", flat=True)) == [cuenta.pk]
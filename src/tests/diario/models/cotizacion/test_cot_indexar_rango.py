@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from diario.models import Cotizacion
+
+
+def test_devuelve_1_para_par_de_monedas_iguales(cuenta, peso, fecha):
+    resultado = Cotizacion.indexar_rango([cuenta], [peso], fecha, fecha + timedelta(2))
+    assert all(resultado[(cuenta.moneda_id, peso.pk, fecha + timedelta(x))] == 1.0 for x in range(3))
+
+
+def test_devuelve_un_factor_por_cada_fecha_del_rango(cuenta_con_saldo_en_dolares, peso, dolar, fecha):
+    resultado = Cotizacion.indexar_rango([cuenta_con_saldo_en_dolares], [peso], fecha, fecha + timedelta(4))
+    assert {k[2] for k in resultado} == {fecha + timedelta(x) for x in range(5)}
+
+
+def test_factor_coincide_con_el_de_indexar_para_cada_fecha(
+        cuenta_con_saldo_en_dolares, peso, dolar, euro, fecha):
+    Cotizacion.crear(moneda=dolar, fecha=fecha + timedelta(2), importe_compra=1200, importe_venta=1250)
+    Cotizacion.crear(moneda=euro, fecha=fecha + timedelta(3), importe_compra=1400, importe_venta=1450)
+    desde, hasta = fecha, fecha + timedelta(4)
+
+    resultado = Cotizacion.indexar_rango([cuenta_con_saldo_en_dolares], [peso, euro], desde, hasta)
+
+    for x in range(5):
+        f = fecha + timedelta(x)
+        en_fecha = Cotizacion.indexar([cuenta_con_saldo_en_dolares], [peso, euro], f)
+        for moneda in peso, euro:
+            assert resultado[(dolar.pk, moneda.pk, f)] == en_fecha[(dolar.pk, moneda.pk)]
+
+
+def test_arrastra_ultima_cotizacion_conocida(cuenta_con_saldo_en_dolares, peso, dolar, fecha):
+    cot_dolar = Cotizacion.crear(moneda=dolar, fecha=fecha + timedelta(1), importe_compra=1200, importe_venta=1250)
+    resultado = Cotizacion.indexar_rango([cuenta_con_saldo_en_dolares], [peso], fecha, fecha + timedelta(3))
+    cot_peso = Cotizacion.tomar(moneda=peso, fecha=fecha)
+    assert resultado[(dolar.pk, peso.pk, fecha + timedelta(3))] == \
+        cot_dolar.importe_venta / cot_peso.importe_compra
+
+
+def test_si_no_hay_cotizacion_devuelve_1(cuenta_con_saldo_en_dolares, peso, dolar, fecha):
+    dolar.cotizaciones.all().delete()
+    resultado = Cotizacion.indexar_rango([cuenta_con_saldo_en_dolares], [peso], fecha, fecha + timedelta(1))
+    assert resultado[(dolar.pk, peso.pk, fecha + timedelta(1))] == 1.0
+
+
+def test_hace_una_sola_query_independientemente_de_la_cantidad_de_dias(
+        django_assert_num_queries, cuenta_con_saldo_en_dolares, cuenta, peso, dolar, euro, fecha):
+    with django_assert_num_queries(1):
+        Cotizacion.indexar_rango(
+            [cuenta_con_saldo_en_dolares, cuenta], [peso, dolar, euro], fecha, fecha + timedelta(60)
+        )
+
+
+def test_importes_por_dia_devuelve_importes_vigentes_en_cada_dia_del_rango(dolar, cotizacion_dolar, fecha):
+    cot = Cotizacion.crear(moneda=dolar, fecha=fecha + timedelta(1), importe_compra=1200, importe_venta=1250)
+    importes = Cotizacion.importes_por_dia([dolar.pk], fecha, fecha + timedelta(2))
+    assert importes[dolar.pk] == [
+        (cotizacion_dolar.importe_compra, cotizacion_dolar.importe_venta),
+        (cot.importe_compra, cot.importe_venta),
+        (cot.importe_compra, cot.importe_venta),
+    ]
+
+
+def test_importes_por_dia_devuelve_none_en_dias_sin_cotizacion_vigente(euro, fecha):
+    euro.cotizaciones.all().delete()
+    assert Cotizacion.importes_por_dia([euro.pk], fecha, fecha + timedelta(1))[euro.pk] == [None, None]
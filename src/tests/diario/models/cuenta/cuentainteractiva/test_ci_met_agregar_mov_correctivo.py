@@ -0,0 +1,38 @@
+from diario.models import SaldoDiario
+
+
+def desajustar_saldo(cuenta, dia, importe: float):
+    SaldoDiario.filtro(cuenta=cuenta, dia=dia).update(_importe=importe)
+
+
+def test_si_el_saldo_es_correcto_no_agrega_movimiento(cuenta, entrada, salida):
+    assert cuenta.agregar_mov_correctivo() is None
+
+
+def test_agrega_movimiento_por_la_diferencia_entre_saldo_y_movimientos(cuenta, entrada, salida, dia):
+    desajustar_saldo(cuenta, dia, 10)
+
+    mov = cuenta.agregar_mov_correctivo()
+
+    assert mov.importe_cta_entrada == 25
+    assert cuenta.saldo_ok()
+
+
+def test_saldo_en_movimiento_correctivo_coincide_con_saldo_diario(cuenta, entrada, salida, dia):
+    desajustar_saldo(cuenta, dia, 10)
+
+    mov = cuenta.agregar_mov_correctivo()
+
+    saldo_diario = SaldoDiario.tomar(cuenta=cuenta, dia=mov.dia)
+    assert saldo_diario.importe == 10
+    assert cuenta.saldo_en_mov(mov) == saldo_diario.importe
+    assert mov.saldo_cta_entrada == saldo_diario.importe
+
+
+def test_corrige_saldos_en_movimientos_anteriores_del_dia(cuenta, entrada, salida, dia):
+    desajustar_saldo(cuenta, dia, 10)
+
+    cuenta.agregar_mov_correctivo()
+
+    assert cuenta.saldo_en_mov(salida) == -15
+    assert cuenta.saldo_en_mov(entrada) == 100
@@ -1,6 +1,34 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from diario.models import Movimiento
+
+
 def test_devuelve_todos_los_dias_en_los_que_una_cuenta_tiene_movimientos(
         cuenta, dia, dia_posterior, dia_tardio, entrada, entrada_tardia):
     dias = cuenta.dias()
     for d in [dia, dia_tardio]:
         assert d in dias
     assert dia_posterior not in dias
+
+
+def test_en_cuenta_acumulativa_incluye_dias_con_movimientos_de_subcuentas(
+        cuenta_acumulativa, dia_anterior, dia_posterior, dia_tardio):
+    sc1, sc2 = cuenta_acumulativa.subcuentas.all()
+    Movimiento.crear(concepto="mov subcuenta", importe=10, cta_entrada=sc2, dia=dia_tardio)
+    dias = cuenta_acumulativa.dias()
+    assert dia_anterior in dias
+    assert dia_tardio in dias
+    assert dia_posterior not in dias
+
+
+def test_si_se_elimina_el_unico_movimiento_de_la_cuenta_en_un_dia_no_incluye_ese_dia(
+        cuenta, dia, dia_tardio, entrada, entrada_tardia):
+    entrada_tardia.delete()
+    assert dia_tardio not in cuenta.dias()
+
+
+def test_no_consulta_movimientos(cuenta, entrada, entrada_tardia):
+    with CaptureQueriesContext(connection) as ctx:
+        list(cuenta.dias())
+    assert not any("diario_movimiento" in q["sql"] for q in ctx.captured_queries)
@@ -48,19 +48,40 @@ def test_no_recalcula_saldo_diario_de_otra_cuenta_en_traspasos(cuenta, cuenta_2,
 
 
 def test_permite_recalcular_desde_una_fecha_especifica(
-        mocker,  cuenta, dia_anterior, dia, dia_posterior, entrada_anterior, entrada, salida, salida_posterior):
-    mock_delete = mocker.patch("diario.models.SaldoDiario.delete", autospec=True)
-    mock_calcular = mocker.patch("diario.models.SaldoDiario.calcular")
-    saldo_dia, saldo_dia_posterior = SaldoDiario.filtro(dia__gte=dia)
+        cuenta, dia_anterior, dia, dia_posterior, entrada_anterior, entrada, salida, salida_posterior):
+    saldo_anterior = SaldoDiario.tomar(cuenta=cuenta, dia=dia_anterior)
+    saldo_dia = SaldoDiario.tomar(cuenta=cuenta, dia=dia)
+    saldo_dia_posterior = SaldoDiario.tomar(cuenta=cuenta, dia=dia_posterior)
+    importe_dia = saldo_dia.importe
+    importe_dia_posterior = saldo_dia_posterior.importe
+    for saldo in saldo_anterior, saldo_dia, saldo_dia_posterior:
+        saldo.importe += 7
+        saldo.save(actualizar_posteriores=False)
 
     cuenta.recalcular_saldos_diarios(desde=dia)
 
-    assert mock_delete.call_args_list == [
-        mocker.call(saldo_dia),
-        mocker.call(saldo_dia_posterior),
-    ]
-    assert mock_calcular.call_args_list == [
-        mocker.call(entrada, "cta_entrada"),
-        mocker.call(salida, "cta_salida"),
-        mocker.call(salida_posterior, "cta_salida")
-    ]
+    assert saldo_anterior.tomar_de_bd().importe == entrada_anterior.importe + 7
+    assert saldo_dia.tomar_de_bd().importe == importe_dia + 7
+    assert saldo_dia_posterior.tomar_de_bd().importe == importe_dia_posterior + 7
+
+
+def test_genera_un_solo_saldo_diario_por_dia_con_movimientos(
+        cuenta, dia, dia_posterior, entrada, salida, traspaso, salida_posterior):
+    cuenta.recalcular_saldos_diarios()
+    assert list(
+        SaldoDiario.filtro(cuenta=cuenta).values_list("dia", flat=True)
+    ) == [dia.pk, dia_posterior.pk]
+
+
+def test_elimina_saldos_diarios_de_dias_sin_movimientos_de_la_cuenta(cuenta, entrada, dia_posterior):
+    SaldoDiario.crear(cuenta=cuenta, dia=dia_posterior, importe=500)
+
+    cuenta.recalcular_saldos_diarios()
+
+    assert not SaldoDiario.filtro(cuenta=cuenta, dia=dia_posterior).exists()
+
+
+def test_no_usa_saldo_diario_calcular(mocker, cuenta, entrada, salida_posterior):
+    mock_calcular = mocker.patch("diario.models.SaldoDiario.calcular")
+    cuenta.recalcular_saldos_diarios()
+    mock_calcular.assert_not_called()
@@ -2,7 +2,7 @@ from datetime import timedelta
 
 import pytest
 
-from diario.models import SaldoDiario
+from diario.models import Movimiento, SaldoDiario
 
 
 def test_devuelve_importe_de_saldo_de_la_cuenta_tomado_al_momento_del_movimiento_dado(
@@ -33,3 +33,10 @@ def test_calcula_importe_a_partir_de_saldo_anterior(cuenta, entrada_temprana, en
     assert \
         cuenta.saldo_en_mov(mov) == \
         cuenta.saldo_en_mov(entrada_temprana) + mov.importe_cta(sentido)
+
+
+def test_no_recorre_movimientos_posteriores_del_dia(cuenta, entrada, dia, django_assert_num_queries):
+    for x in range(10):
+        Movimiento.crear(concepto=f"Salida {x}", importe=1, cta_salida=cuenta, dia=dia)
+    with django_assert_num_queries(1):
+        cuenta.saldo_en_mov(entrada)
@@ -0,0 +1,48 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from diario.models import Dia, Movimiento
+
+
+def test_dia_nuevo_tiene_cantidad_movs_cero(dia):
+    assert dia.cantidad_movs == 0
+
+
+def test_al_crear_movimiento_suma_uno_a_cantidad_movs_del_dia(entrada, salida):
+    assert Dia.tomar(pk=entrada.dia.pk).cantidad_movs == 2
+
+
+def test_al_eliminar_movimiento_resta_uno_a_cantidad_movs_del_dia(entrada, salida):
+    dia = entrada.dia
+    salida.delete()
+    dia.refresh_from_db()
+    assert dia.cantidad_movs == 1
+
+
+def test_al_cambiar_dia_de_movimiento_pasa_la_cuenta_al_dia_nuevo(entrada, salida, fecha_posterior):
+    dia = entrada.dia
+    entrada.fecha = fecha_posterior
+    entrada.clean_save()
+    dia.refresh_from_db()
+    assert dia.cantidad_movs == 1
+    assert Dia.tomar(fecha=fecha_posterior).cantidad_movs == 1
+
+
+def test_al_modificar_movimiento_sin_cambiar_dia_no_modifica_cantidad_movs(entrada):
+    entrada.concepto = "Otro concepto"
+    entrada.clean_save()
+    assert Dia.tomar(pk=entrada.dia.pk).cantidad_movs == 1
+
+
+def test_guardar_instancia_desactualizada_de_dia_no_pisa_cantidad_movs(dia, cuenta):
+    Movimiento.crear(concepto="mov", importe=10, cta_entrada=cuenta, dia=dia)
+    dia.save()
+    dia.refresh_from_db()
+    assert dia.cantidad_movs == 1
+
+
+def test_con_movimientos_no_hace_join_con_movimiento(entrada):
+    with CaptureQueriesContext(connection) as ctx:
+        list(Dia.con_movimientos())
+    assert len(ctx.captured_queries) == 1
+    assert "diario_movimiento" not in ctx.captured_queries[0]["sql"]
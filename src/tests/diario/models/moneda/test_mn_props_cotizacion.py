@@ -43,3 +43,11 @@ def test_prop_cotizacion_devuelve_cotizacion_venta(dolar, mocker):
         new_callable=mocker.PropertyMock,
     )
     assert dolar.cotizacion == 2.5
+
+
+def test_cotizaciones_de_varias_monedas_se_obtienen_con_una_sola_query(
+        django_assert_num_queries, peso, dolar, euro, cotizacion_posterior_dolar, cotizacion_posterior_euro):
+    with django_assert_num_queries(1):
+        for moneda in peso, dolar, euro:
+            moneda.cotizacion_compra
+            moneda.cotizacion_venta
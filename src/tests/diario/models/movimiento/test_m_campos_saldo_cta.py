@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+import pytest
+
+from diario.models import Cuenta, Movimiento
+
+
+def saldos_esperados(cuenta: Cuenta) -> dict[int, float]:
+    """ Saldo de la cuenta después de cada uno de sus movimientos,
+        calculado recorriéndolos en orden.
+    """
+    total = 0
+    saldos = dict()
+    for mov in Cuenta.movs(cuenta):
+        total = round(total + mov.importe_cta("entrada" if mov.cta_entrada_id == cuenta.pk else "salida"), 2)
+        saldos[mov.pk] = total
+    return saldos
+
+
+def saldos_guardados(cuenta: Cuenta) -> dict[int, float]:
+    return {
+        mov.pk: mov.saldo_cta_entrada if mov.cta_entrada_id == cuenta.pk else mov.saldo_cta_salida
+        for mov in Cuenta.movs(cuenta)
+    }
+
+
+def test_movimiento_nuevo_guarda_saldo_de_sus_cuentas(traspaso, cuenta, cuenta_2):
+    traspaso.refresh_from_db()
+    assert traspaso.saldo_cta_entrada == cuenta.saldo()
+    assert traspaso.saldo_cta_salida == cuenta_2.saldo()
+
+
+def test_movimiento_nuevo_actualiza_saldo_en_objeto_en_memoria(cuenta, dia):
+    mov = Movimiento.crear(concepto="Entrada", importe=20, cta_entrada=cuenta, dia=dia)
+    assert mov.saldo_cta_entrada == 20
+
+
+def test_movimiento_anterior_desplaza_saldos_de_movimientos_posteriores(
+        cuenta, entrada, salida, salida_posterior, entrada_anterior):
+    assert saldos_guardados(cuenta) == saldos_esperados(cuenta)
+
+
+def test_movimiento_nuevo_en_medio_del_dia_actualiza_saldos_de_movimientos_siguientes_del_dia(
+        cuenta, entrada, salida, dia):
+    Movimiento.crear(concepto="Entrada intermedia", importe=7, cta_entrada=cuenta, dia=dia, orden_dia=0)
+    assert saldos_guardados(cuenta) == saldos_esperados(cuenta)
+
+
+def test_modificar_importe_actualiza_saldos(cuenta, entrada, salida, salida_posterior):
+    entrada.importe = 250
+    entrada.clean_save()
+    assert saldos_guardados(cuenta) == saldos_esperados(cuenta)
+
+
+@pytest.mark.parametrize("dias", [1, -400])
+def test_modificar_fecha_actualiza_saldos(cuenta, entrada, salida, salida_posterior, entrada_anterior, dias):
+    salida.fecha = salida.fecha + timedelta(dias)
+    salida.clean_save()
+    assert saldos_guardados(cuenta) == saldos_esperados(cuenta)
+
+
+def test_modificar_cuenta_actualiza_saldos_de_cuenta_vieja_y_nueva(
+        cuenta, cuenta_2, entrada, salida, entrada_otra_cuenta, salida_posterior):
+    entrada.cta_entrada = cuenta_2
+    entrada.clean_save()
+    assert saldos_guardados(cuenta) == saldos_esperados(cuenta)
+    assert saldos_guardados(cuenta_2) == saldos_esperados(cuenta_2)
+
+
+def test_modificar_orden_dia_actualiza_saldos(cuenta, entrada, salida, traspaso):
+    traspaso.orden_dia = 0
+    traspaso.clean_save()
+    assert saldos_guardados(cuenta) == saldos_esperados(cuenta)
+
+
+def test_guardar_instancia_desactualizada_no_pisa_saldos_guardados(
+        cuenta, entrada, salida, salida_posterior, dia):
+    Movimiento.crear(concepto="Entrada anterior", importe=30, cta_entrada=cuenta, dia=dia, orden_dia=0)
+    salida_posterior.concepto = "Otro concepto"
+    salida_posterior.clean_save()
+    assert saldos_guardados(cuenta) == saldos_esperados(cuenta)
+
+
+def test_guardar_instancia_desactualizada_no_pisa_orden_en_el_dia(cuenta, entrada, salida, traspaso, dia):
+    Movimiento.objects.filter(pk=salida.pk).update(_orden_dia=entrada._orden_dia + 1)
+    mov = Movimiento.crear(concepto="Intercalado", importe=5, cta_entrada=cuenta, dia=dia, orden_dia=1)
+    orden_guardado, posicion_guardada = Movimiento.objects.filter(
+        pk=traspaso.pk).values_list("_orden_dia", "_posicion").get()
+
+    traspaso.concepto = "Otro concepto"
+    traspaso.clean_save()
+
+    assert Movimiento.objects.filter(pk=traspaso.pk).values_list("_orden_dia", "_posicion").get() == \
+        (orden_guardado, posicion_guardada)
+    assert list(Movimiento.todes()) == [entrada, mov, salida, traspaso]
+
+
+def test_eliminar_movimiento_actualiza_saldos(cuenta, entrada_anterior, entrada, salida, salida_posterior):
+    entrada.delete()
+    assert saldos_guardados(cuenta) == saldos_esperados(cuenta)
+
+
+def test_recalcular_saldos_diarios_regenera_saldos_en_movimientos(cuenta, entrada, salida, salida_posterior):
+    Movimiento.filtro(cta_salida=cuenta).update(saldo_cta_salida=1000)
+    cuenta.recalcular_saldos_diarios()
+    assert saldos_guardados(cuenta) == saldos_esperados(cuenta)
@@ -0,0 +1,165 @@
+from datetime import date
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from diario.models import Dia, Movimiento, SaldoDiario
+from utils import errors
+
+
+def test_crea_los_movimientos_en_el_orden_recibido(cuenta, cuenta_2, fecha):
+    movs = Movimiento.crear_muchos([
+        {"concepto": "Entrada", "importe": 100, "cta_entrada": cuenta, "fecha": fecha},
+        {"concepto": "Traspaso", "importe": 30, "cta_entrada": cuenta_2, "cta_salida": cuenta, "fecha": fecha},
+    ])
+    assert [m.concepto for m in Movimiento.filtro(fecha=fecha)] == ["Entrada", "Traspaso"]
+    assert [m.orden_dia for m in movs] == [0, 1]
+
+
+def test_agrega_los_movimientos_al_final_de_los_dias_existentes(entrada, salida, cuenta, fecha):
+    mov, = Movimiento.crear_muchos([{"concepto": "Otra", "importe": 10, "cta_entrada": cuenta, "fecha": fecha}])
+    assert mov.orden_dia == salida.orden_dia + 1
+
+
+def test_asigna_sk_como_movimiento_save(cuenta, fecha):
+    mov, = Movimiento.crear_muchos([{"concepto": "Entrada", "importe": 100, "cta_entrada": cuenta, "fecha": fecha}])
+    assert mov.sk == f"{fecha.strftime('%Y%m%d')}{mov.orden_dia:02d}"
+
+
+def test_crea_dias_inexistentes(cuenta, fecha_tardia):
+    Movimiento.crear_muchos([{"concepto": "Entrada", "importe": 100, "cta_entrada": cuenta, "fecha": fecha_tardia}])
+    dia = Dia.tomar(fecha=fecha_tardia)
+    assert dia.sk == fecha_tardia.strftime("%Y%m%d")
+    assert dia.cantidad_movs == 1
+
+
+def test_importe_negativo_intercambia_cuentas(cuenta, fecha):
+    mov, = Movimiento.crear_muchos([{"concepto": "Pago", "importe": -100, "cta_entrada": cuenta, "fecha": fecha}])
+    assert mov.cta_entrada is None
+    assert mov.cta_salida == cuenta
+    assert mov.importe == 100
+
+
+def test_genera_los_mismos_saldos_que_movimiento_crear(cuenta, cuenta_2, entrada_anterior, fecha, fecha_posterior):
+    datos = [
+        {"concepto": "Entrada", "importe": 100, "cta_entrada": cuenta, "fecha": fecha_posterior},
+        {"concepto": "Salida", "importe": 40, "cta_salida": cuenta, "fecha": fecha},
+        {"concepto": "Traspaso", "importe": 25, "cta_entrada": cuenta_2, "cta_salida": cuenta, "fecha": fecha},
+    ]
+    movs = Movimiento.crear_muchos(datos)
+
+    assert cuenta.saldo() == 3 + 100 - 40 - 25
+    assert cuenta_2.saldo() == 25
+    assert SaldoDiario.tomar(cuenta=cuenta, dia=Dia.tomar(fecha=fecha)).importe == 3 - 40 - 25
+    for mov in movs:
+        mov.refresh_from_db()
+    assert movs[1].saldo_cta_salida == 3 - 40
+    assert movs[2].saldo_cta_salida == 3 - 40 - 25
+    assert movs[2].saldo_cta_entrada == 25
+
+
+def test_movimientos_devueltos_traen_sus_saldos_en_movimiento(cuenta, cuenta_2, entrada_anterior, fecha):
+    movs = Movimiento.crear_muchos([
+        {"concepto": "Salida", "importe": 40, "cta_salida": cuenta, "fecha": fecha},
+        {"concepto": "Traspaso", "importe": 25, "cta_entrada": cuenta_2, "cta_salida": cuenta, "fecha": fecha},
+    ])
+    assert movs[0].saldo_cta_salida == 3 - 40
+    assert movs[1].saldo_cta_salida == 3 - 40 - 25
+    assert movs[1].saldo_cta_entrada == 25
+
+
+def test_modificar_movimiento_creado_en_bloque_conserva_saldos(cuenta, cuenta_2, entrada_anterior, fecha):
+    salida, traspaso = Movimiento.crear_muchos([
+        {"concepto": "Salida", "importe": 40, "cta_salida": cuenta, "fecha": fecha},
+        {"concepto": "Traspaso", "importe": 25, "cta_entrada": cuenta_2, "cta_salida": cuenta, "fecha": fecha},
+    ])
+
+    traspaso.concepto = "Traspaso modificado"
+    traspaso.clean_save()
+
+    assert cuenta.saldo(movimiento=salida) == 3 - 40
+    assert cuenta.saldo(movimiento=traspaso) == 3 - 40 - 25
+    assert cuenta_2.saldo(movimiento=traspaso) == 25
+
+
+def test_actualiza_saldos_diarios_posteriores_existentes(cuenta, entrada, salida_posterior, fecha):
+    importe_posterior = SaldoDiario.tomar(cuenta=cuenta, dia=salida_posterior.dia).importe
+    Movimiento.crear_muchos([{"concepto": "Entrada", "importe": 50, "cta_entrada": cuenta, "fecha": fecha}])
+    assert SaldoDiario.tomar(cuenta=cuenta, dia=salida_posterior.dia).importe == importe_posterior + 50
+
+
+def test_calcula_cotizacion_de_movimientos_entre_cuentas_en_distinta_moneda(
+        cuenta, cuenta_en_dolares, cotizacion_dolar, fecha):
+    mov, = Movimiento.crear_muchos([{
+        "concepto": "Compra de dólares", "importe": 10,
+        "cta_entrada": cuenta_en_dolares, "cta_salida": cuenta, "fecha": fecha,
+    }])
+    assert mov.cotizacion == cuenta_en_dolares.moneda.cotizacion_en_al(cuenta.moneda, fecha, compra=False)
+
+
+@pytest.mark.parametrize("datos, excepcion, mensaje", [
+    ({"importe": 0}, errors.ErrorImporteCero, errors.IMPORTE_CERO),
+    ({"cta_entrada": None}, ValidationError, errors.CUENTA_INEXISTENTE),
+])
+def test_valida_movimientos_sin_guardar_ninguno(cuenta, fecha, datos, excepcion, mensaje):
+    valido = {"concepto": "Entrada", "importe": 100, "cta_entrada": cuenta, "fecha": fecha}
+    with pytest.raises(excepcion, match=mensaje):
+        Movimiento.crear_muchos([valido, {**valido, **datos}])
+    assert Movimiento.cantidad() == 0
+
+
+def test_no_admite_cuentas_acumulativas(cuenta_acumulativa, fecha):
+    with pytest.raises(errors.ErrorCuentaEsAcumulativa, match=errors.CUENTA_ACUMULATIVA_EN_MOVIMIENTO):
+        Movimiento.crear_muchos([{"concepto": "Mov", "importe": 10, "cta_entrada": cuenta_acumulativa, "fecha": fecha}])
+
+
+def test_no_admite_cuentas_inactivas(cuenta_inactiva, fecha):
+    with pytest.raises(errors.ErrorMovimientoConCuentaInactiva):
+        Movimiento.crear_muchos([{"concepto": "Mov", "importe": 10, "cta_entrada": cuenta_inactiva, "fecha": fecha}])
+
+
+def test_no_admite_fecha_anterior_a_creacion_de_cuenta(cuenta):
+    with pytest.raises(errors.ErrorMovimientoAnteriorAFechaCreacion):
+        Movimiento.crear_muchos([{"concepto": "Mov", "importe": 10, "cta_entrada": cuenta, "fecha": date(2000, 1, 1)}])
+
+
+class TestCrearMuchosEntreTitulares:
+    def test_genera_contramovimiento_de_credito(self, cuenta, cuenta_ajena, fecha):
+        mov, = Movimiento.crear_muchos([{
+            "concepto": "Préstamo", "importe": 30, "cta_entrada": cuenta_ajena, "cta_salida": cuenta, "fecha": fecha
+        }])
+        contramov = Movimiento.tomar(id=mov.id_contramov)
+        assert contramov.es_automatico
+        assert contramov.importe == 30
+        assert contramov.detalle == "Constitución de crédito"
+        assert contramov.orden_dia == mov.orden_dia - 1
+
+    def test_contramovimientos_sucesivos_toman_el_saldo_de_credito_acumulado(self, cuenta, cuenta_ajena, fecha):
+        mov1, mov2 = Movimiento.crear_muchos([
+            {"concepto": "Préstamo", "importe": 30, "cta_entrada": cuenta_ajena, "cta_salida": cuenta, "fecha": fecha},
+            {"concepto": "Devolución", "importe": 30, "cta_entrada": cuenta, "cta_salida": cuenta_ajena, "fecha": fecha},
+        ])
+        assert Movimiento.tomar(id=mov2.id_contramov).detalle == "Cancelación de crédito"
+
+    def test_actualiza_relacion_deudor_acreedor_entre_titulares(self, cuenta, cuenta_ajena, fecha):
+        Movimiento.crear_muchos([{
+            "concepto": "Préstamo", "importe": 30, "cta_entrada": cuenta_ajena, "cta_salida": cuenta, "fecha": fecha
+        }])
+        assert cuenta_ajena.titular.es_deudor_de(cuenta.titular)
+
+    def test_si_se_cancela_el_credito_desactiva_cuentas_credito(self, cuenta, cuenta_ajena, fecha):
+        mov, _ = Movimiento.crear_muchos([
+            {"concepto": "Préstamo", "importe": 30, "cta_entrada": cuenta_ajena, "cta_salida": cuenta, "fecha": fecha},
+            {"concepto": "Devolución", "importe": 30, "cta_entrada": cuenta, "cta_salida": cuenta_ajena, "fecha": fecha},
+        ])
+        contramov = Movimiento.tomar(id=mov.id_contramov)
+        assert not contramov.cta_entrada.tomar_de_bd().activa
+        assert not cuenta_ajena.titular.es_deudor_de(cuenta.titular)
+
+    def test_no_genera_contramovimiento_si_esgratis(self, cuenta, cuenta_ajena, fecha):
+        mov, = Movimiento.crear_muchos([{
+            "concepto": "Regalo", "importe": 30, "cta_entrada": cuenta_ajena, "cta_salida": cuenta,
+            "fecha": fecha, "esgratis": True,
+        }])
+        assert mov.id_contramov is None
+        assert Movimiento.cantidad() == 1
@@ -14,3 +14,15 @@ def test_si_no_existe_dia_de_la_fecha_dada_lo_crea(entrada, fecha_posterior):
     entrada.fecha = fecha_posterior
     dia_posterior = Dia.tomar(fecha=fecha_posterior)
     assert entrada.dia == dia_posterior
+
+
+def test_al_guardar_movimiento_nuevo_se_guarda_la_fecha_del_dia(entrada):
+    entrada.refresh_from_db()
+    assert entrada._fecha == entrada.dia.fecha
+
+
+def test_al_cambiar_fecha_de_movimiento_existente_se_actualiza_la_fecha_guardada(entrada, fecha_posterior):
+    entrada.fecha = fecha_posterior
+    entrada.clean_save()
+    entrada.refresh_from_db()
+    assert entrada._fecha == fecha_posterior
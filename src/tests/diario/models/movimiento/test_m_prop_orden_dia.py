@@ -0,0 +1,110 @@
+import pytest
+
+from diario.consts import PASO_ORDEN_DIA
+from diario.models import Movimiento
+
+
+def ordenes_guardados(*movs: Movimiento) -> list[int]:
+    return [Movimiento.objects.get(pk=mov.pk)._orden_dia for mov in movs]
+
+
+def test_movimientos_agregados_al_final_del_dia_toman_orden_dia_consecutivos(entrada, salida, traspaso):
+    assert [entrada.orden_dia, salida.orden_dia, traspaso.orden_dia] == [0, 1, 2]
+
+
+def test_movimientos_agregados_al_final_del_dia_dejan_huecos_entre_si(entrada, salida):
+    assert salida._orden_dia - entrada._orden_dia == PASO_ORDEN_DIA
+
+
+def test_intercalar_movimiento_no_modifica_los_demas_movimientos_del_dia(entrada, salida, traspaso, cuenta, dia):
+    ordenes = ordenes_guardados(entrada, salida, traspaso)
+
+    mov = Movimiento.crear(concepto="Intercalado", importe=5, cta_entrada=cuenta, dia=dia, orden_dia=1)
+
+    assert ordenes_guardados(entrada, salida, traspaso) == ordenes
+    assert entrada._orden_dia < mov._orden_dia < salida._orden_dia
+
+
+def test_intercalar_movimiento_desplaza_el_orden_dia_de_los_movimientos_posteriores(
+        entrada, salida, traspaso, cuenta, dia):
+    mov = Movimiento.crear(concepto="Intercalado", importe=5, cta_entrada=cuenta, dia=dia, orden_dia=1)
+    for m in entrada, salida, traspaso:
+        m.refresh_from_db()
+
+    assert mov.orden_dia == 1
+    assert [entrada.orden_dia, salida.orden_dia, traspaso.orden_dia] == [0, 2, 3]
+
+
+def test_mover_movimiento_dentro_del_dia_no_modifica_los_demas_movimientos(entrada, salida, traspaso):
+    ordenes = ordenes_guardados(entrada, salida)
+
+    traspaso.orden_dia = 0
+    traspaso.clean_save()
+
+    assert ordenes_guardados(entrada, salida) == ordenes
+    assert list(Movimiento.todes()) == [traspaso, entrada, salida]
+
+
+def test_eliminar_movimiento_no_modifica_los_demas_movimientos_del_dia(entrada, salida, traspaso):
+    ordenes = ordenes_guardados(entrada, traspaso)
+
+    salida.delete()
+    traspaso.refresh_from_db()
+
+    assert ordenes_guardados(entrada, traspaso) == ordenes
+    assert traspaso.orden_dia == 1
+
+
+def test_si_no_queda_lugar_entre_movimientos_vecinos_renumera_el_dia(entrada, salida, traspaso, cuenta, dia):
+    Movimiento.objects.filter(pk=salida.pk).update(_orden_dia=entrada._orden_dia + 1)
+
+    mov = Movimiento.crear(concepto="Intercalado", importe=5, cta_entrada=cuenta, dia=dia, orden_dia=1)
+
+    assert list(Movimiento.todes()) == [entrada, mov, salida, traspaso]
+    assert [m.orden_dia for m in Movimiento.todes()] == [0, 1, 2, 3]
+    ordenes = ordenes_guardados(entrada, mov, salida, traspaso)
+    assert all(b - a == PASO_ORDEN_DIA for a, b in zip(ordenes, ordenes[1:]))
+
+
+def test_movimiento_leido_de_la_base_de_datos_calcula_su_orden_dia_una_sola_vez(
+        entrada, salida, django_assert_num_queries):
+    mov = Movimiento.objects.get(pk=salida.pk)
+    with django_assert_num_queries(1):
+        assert mov.orden_dia == 1
+    with django_assert_num_queries(0):
+        assert mov.orden_dia == 1
+
+
+def test_movimiento_leido_de_la_base_de_datos_muestra_su_orden_dia(entrada, salida):
+    mov = Movimiento.objects.get(pk=salida.pk)
+    assert mov.natural_key() == (salida.dia.fecha, 1)
+    assert str(mov).startswith(f"{salida.fecha} 1 ")
+
+
+def test_movimiento_recien_guardado_no_consulta_la_base_de_datos(entrada, salida, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        assert [entrada.orden_dia, salida.orden_dia] == [0, 1]
+
+
+def test_numerar_en_dia_numera_movimientos_de_varios_dias_con_una_sola_query(
+        entrada, salida, traspaso, entrada_posterior_otra_cuenta, django_assert_num_queries):
+    movs = [Movimiento.objects.get(pk=m.pk) for m in (traspaso, entrada_posterior_otra_cuenta, salida)]
+    with django_assert_num_queries(1):
+        Movimiento.numerar_en_dia(movs)
+    with django_assert_num_queries(0):
+        assert [m.orden_dia for m in movs] == [2, 0, 1]
+
+
+def test_numerar_en_dia_cuenta_movimientos_del_dia_que_no_se_numeran(entrada, salida, traspaso):
+    mov, = Movimiento.numerar_en_dia(Movimiento.objects.filter(pk=traspaso.pk))
+    assert mov.orden_dia == 2
+
+
+@pytest.mark.parametrize("orden_dia", [0, 1, 2])
+def test_permite_filtrar_por_orden_dia(orden_dia, entrada, salida, traspaso, dia):
+    movs = [entrada, salida, traspaso]
+    assert list(Movimiento.filtro(dia=dia, orden_dia=orden_dia)) == [movs[orden_dia]]
+
+
+def test_permite_filtrar_por_orden_dia_en_todos_los_dias(entrada, salida, entrada_posterior_otra_cuenta):
+    assert list(Movimiento.filtro(orden_dia=0)) == [entrada, entrada_posterior_otra_cuenta]
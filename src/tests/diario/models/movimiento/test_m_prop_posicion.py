@@ -0,0 +1,57 @@
+from diario.models import Movimiento
+
+
+def posiciones(*movs: Movimiento) -> list[int]:
+    return [Movimiento.objects.get(pk=mov.pk)._posicion for mov in movs]
+
+
+def test_movimientos_de_dias_posteriores_tienen_posicion_mayor(entrada_anterior, entrada, salida_posterior):
+    anterior, actual, posterior = posiciones(entrada_anterior, entrada, salida_posterior)
+    assert anterior < actual < posterior
+
+
+def test_dentro_del_dia_la_posicion_sigue_el_orden_dia(entrada, salida, traspaso):
+    assert posiciones(entrada, salida, traspaso) == sorted(posiciones(entrada, salida, traspaso))
+
+
+def test_movimiento_ubicado_al_principio_de_un_dia_queda_despues_de_los_dias_anteriores(
+        entrada_anterior, entrada, salida, cuenta, dia):
+    mov = Movimiento.crear(concepto="Primero", importe=5, cta_entrada=cuenta, dia=dia, orden_dia=0)
+    assert posiciones(entrada_anterior)[0] < posiciones(mov)[0] < posiciones(entrada)[0]
+
+
+def test_al_cambiar_fecha_de_movimiento_se_actualiza_su_posicion(entrada, salida_posterior, fecha_tardia):
+    entrada.fecha = fecha_tardia
+    entrada.clean_save()
+    assert posiciones(salida_posterior)[0] < posiciones(entrada)[0]
+
+
+def test_al_mover_movimiento_dentro_del_dia_se_actualiza_su_posicion(entrada, salida):
+    salida.orden_dia = 0
+    salida.clean_save()
+    assert posiciones(salida)[0] < posiciones(entrada)[0]
+
+
+def test_al_renumerar_el_dia_se_actualiza_la_posicion_de_los_demas_movimientos(
+        entrada, salida, traspaso, cuenta, dia):
+    Movimiento.objects.filter(pk=salida.pk).update(
+        _orden_dia=entrada._orden_dia + 1,
+        _posicion=entrada._posicion + 1,
+    )
+    mov = Movimiento.crear(concepto="Intercalado", importe=5, cta_entrada=cuenta, dia=dia, orden_dia=1)
+    assert posiciones(entrada, mov, salida, traspaso) == sorted(posiciones(entrada, mov, salida, traspaso))
+
+
+def test_crear_muchos_asigna_posicion(entrada, cuenta, fecha, fecha_posterior):
+    mov_posterior, mov = Movimiento.crear_muchos([
+        {"concepto": "Posterior", "importe": 10, "cta_entrada": cuenta, "fecha": fecha_posterior},
+        {"concepto": "Mismo día", "importe": 10, "cta_entrada": cuenta, "fecha": fecha},
+    ])
+    assert posiciones(entrada)[0] < mov._posicion < mov_posterior._posicion
+    assert posiciones(mov, mov_posterior) == [mov._posicion, mov_posterior._posicion]
+
+
+def test_es_anterior_a_compara_posiciones(entrada, salida, entrada_posterior_otra_cuenta):
+    assert entrada.es_anterior_a(salida)
+    assert salida.es_anterior_a(entrada_posterior_otra_cuenta)
+    assert not entrada_posterior_otra_cuenta.es_anterior_a(entrada)
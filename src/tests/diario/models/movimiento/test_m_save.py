@@ -1605,12 +1605,9 @@ class TestSaveCambiaImporteYCuentas:
 @pytest.mark.parametrize('sentido', ['entrada', 'salida'])
 class TestSaveCambiaFecha:
 
-    @pytest.mark.parametrize("otros_movs", [[], ["traspaso"]])
-    def test_si_cambia_dia_a_dia_posterior_en_mov_unico_de_cuenta_en_el_dia_resta_importe_a_saldo_de_cuenta_en_el_dia(
-            self, entrada_anterior, sentido, otros_movs, dia_posterior, request):
+    def test_si_cambia_dia_a_dia_posterior_con_mas_movs_de_cuenta_en_el_dia_resta_importe_a_saldo_de_cuenta_en_el_dia(
+            self, entrada_anterior, sentido, traspaso, dia_posterior, request):
         mov = request.getfixturevalue(sentido)
-        for otro_mov in otros_movs:
-            request.getfixturevalue(otro_mov)
         saldo_diario = SaldoDiario.tomar(cuenta=getattr(mov, f"cta_{sentido}"), dia=mov.dia)
         importe_sd = saldo_diario.importe
 
@@ -1619,8 +1616,19 @@ class TestSaveCambiaFecha:
 
         saldo_diario.refresh_from_db()
         assert saldo_diario.importe == importe_sd - mov.importe_cta(sentido)
-        if otros_movs == []:
-            assert saldo_diario.importe == saldo_diario.anterior().importe
+
+    @pytest.mark.parametrize("fixt_dia_nuevo", ["dia_anterior", "dia_posterior"])
+    def test_si_cambia_dia_de_mov_unico_de_cuenta_en_el_dia_elimina_saldo_diario_de_cuenta_en_el_dia_viejo(
+            self, entrada_anterior, sentido, fixt_dia_nuevo, request):
+        mov = request.getfixturevalue(sentido)
+        cuenta = getattr(mov, f"cta_{sentido}")
+        dia_viejo = mov.dia
+
+        mov.dia = request.getfixturevalue(fixt_dia_nuevo)
+        mov.clean_save()
+
+        assert not SaldoDiario.filtro(cuenta=cuenta, dia=dia_viejo).exists()
+        assert dia_viejo not in cuenta.dias()
 
     def test_si_cambia_dia_a_dia_posterior_resta_importe_a_saldos_diarios_intermedios_de_cuenta_entre_dia_antiguo_y_dia_nuevo(
             self, sentido, salida_posterior, entrada_tardia, dia_tardio, request):
@@ -1679,12 +1687,9 @@ class TestSaveCambiaFecha:
         saldo_posterior.refresh_from_db()
         assert saldo_posterior.importe == importe_sp
 
-    @pytest.mark.parametrize("otros_mov", [[], ["traspaso"]])
     def test_si_cambia_dia_a_dia_anterior_no_modifica_importe_del_saldo_diario_del_dia_viejo(
-            self, sentido, otros_mov, dia_anterior, request):
+            self, sentido, traspaso, dia_anterior, request):
         mov = request.getfixturevalue(sentido)
-        for otro_mov in otros_mov:
-            request.getfixturevalue(otro_mov)
         cuenta = getattr(mov, f"cta_{sentido}")
         saldo_diario = SaldoDiario.tomar(cuenta=cuenta, dia=mov.dia)
         importe_sd = saldo_diario.importe
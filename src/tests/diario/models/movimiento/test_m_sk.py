@@ -1,3 +1,6 @@
+from diario.models import Dia, Movimiento
+
+
 def test_devuelve_identificador(entrada):
     assert entrada.sk is not None
 
@@ -16,3 +19,29 @@ def test_devuelve_str_con_fecha_y_orden_dia(entrada):
     assert \
         entrada.sk == \
         f"{entrada.fecha.year}{entrada.fecha.month:02d}{entrada.fecha.day:02d}{entrada.orden_dia:02d}"
+
+
+def test_no_reutiliza_sk_de_movimiento_eliminado(entrada, salida, cuenta, dia):
+    sk_salida = salida.sk
+    salida.delete()
+    mov = Movimiento.crear(concepto="Otro", importe=5, cta_entrada=cuenta, dia=dia)
+    assert mov.sk == str(int(sk_salida) + 1)
+
+
+def test_movimiento_intercalado_toma_la_siguiente_sk_del_dia(entrada, salida, cuenta, dia):
+    mov = Movimiento.crear(concepto="Intercalado", importe=5, cta_entrada=cuenta, dia=dia, orden_dia=0)
+    assert mov.sk == f"{dia.sk}02"
+
+
+def test_conserva_sk_al_cambiar_de_dia(entrada, fecha_posterior):
+    sk = entrada.sk
+    entrada.fecha = fecha_posterior
+    entrada.clean_save()
+    entrada.refresh_from_db()
+    assert entrada.sk == sk
+
+
+def test_respeta_sk_asignada(cuenta, dia):
+    mov = Movimiento.crear(concepto="Mov", importe=5, cta_entrada=cuenta, dia=dia, sk="mov_sk")
+    assert mov.sk == "mov_sk"
+    assert Dia.tomar(pk=dia.pk).sks_reservadas == 0
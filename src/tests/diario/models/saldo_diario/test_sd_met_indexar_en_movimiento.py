@@ -1,4 +1,4 @@
-from diario.models import SaldoDiario
+from diario.models import Movimiento, SaldoDiario
 
 
 def test_devuelve_dict_con_cuenta_id_como_clave(cuenta, entrada):
@@ -22,3 +22,20 @@ def test_si_cuenta_no_tiene_sd_en_dia_del_movimiento_usa_ultimo_sd_anterior(
         cuenta, cuenta_2, entrada, entrada_anterior_otra_cuenta):
     resultado = SaldoDiario.indexar_en_movimiento([cuenta, cuenta_2], entrada)
     assert resultado[cuenta_2.pk] == cuenta_2.saldo(movimiento=entrada)
+
+
+def test_toma_saldo_guardado_en_el_ultimo_movimiento_de_la_cuenta(cuenta, entrada, salida):
+    Movimiento.filtro(pk=entrada.pk).update(saldo_cta_entrada=1234)
+    resultado = SaldoDiario.indexar_en_movimiento([cuenta], entrada)
+    assert resultado[cuenta.pk] == 1234
+
+
+def test_si_cuenta_no_tiene_movimientos_hasta_el_movimiento_devuelve_cero(
+        cuenta, cuenta_2, entrada, entrada_posterior_otra_cuenta):
+    resultado = SaldoDiario.indexar_en_movimiento([cuenta, cuenta_2], entrada)
+    assert resultado[cuenta_2.pk] == 0
+
+
+def test_hace_una_sola_query(cuenta, cuenta_2, entrada, salida, traspaso, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        SaldoDiario.indexar_en_movimiento([cuenta, cuenta_2], salida)
@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from diario.models import Movimiento, SaldoDiario
+
+
+def test_devuelve_saldo_de_cada_cuenta_en_cada_dia(
+        cuenta, cuenta_2, dia_anterior, dia, dia_posterior,
+        entrada_anterior, entrada, entrada_otra_cuenta, salida_posterior):
+    resultado = SaldoDiario.indexar_por_rango([cuenta, cuenta_2], [dia_anterior, dia, dia_posterior])
+    for c in cuenta, cuenta_2:
+        for d in dia_anterior, dia, dia_posterior:
+            assert resultado[(c.pk, d.pk)] == c.saldo(dia=d)
+
+
+def test_si_cuenta_no_tiene_saldo_diario_en_un_dia_usa_el_ultimo_anterior(
+        cuenta, dia, dia_posterior, dia_tardio, entrada, salida_posterior):
+    resultado = SaldoDiario.indexar_por_rango([cuenta], [dia, dia_tardio])
+    assert resultado[(cuenta.pk, dia_tardio.pk)] == cuenta.saldo(dia=dia_posterior)
+
+
+def test_si_cuenta_no_tiene_saldos_diarios_anteriores_devuelve_0(cuenta, dia_anterior, dia, entrada):
+    resultado = SaldoDiario.indexar_por_rango([cuenta], [dia_anterior, dia])
+    assert resultado[(cuenta.pk, dia_anterior.pk)] == 0
+
+
+def test_no_depende_del_orden_de_los_dias(cuenta, dia_anterior, dia, entrada_anterior, entrada):
+    resultado = SaldoDiario.indexar_por_rango([cuenta], [dia, dia_anterior])
+    assert resultado[(cuenta.pk, dia_anterior.pk)] == cuenta.saldo(dia=dia_anterior)
+    assert resultado[(cuenta.pk, dia.pk)] == cuenta.saldo(dia=dia)
+
+
+def test_saldo_de_cuenta_acumulativa_es_la_suma_de_los_de_sus_subcuentas(cuenta_acumulativa, dia, fecha):
+    resultado = SaldoDiario.indexar_por_rango([cuenta_acumulativa], [dia])
+    assert resultado[(cuenta_acumulativa.pk, dia.pk)] == cuenta_acumulativa.saldo(dia=dia)
+
+
+def test_sin_dias_devuelve_dict_vacio(cuenta, entrada):
+    assert SaldoDiario.indexar_por_rango([cuenta], []) == dict()
+
+
+def test_cantidad_de_queries_no_depende_de_cantidad_de_cuentas_ni_de_dias(
+        cuenta, cuenta_2, cuenta_3, fecha):
+    dias = []
+    for x in range(10):
+        for c in cuenta, cuenta_2, cuenta_3:
+            mov = Movimiento.crear(concepto=f"Entrada {x}", importe=x+1, cta_entrada=c, fecha=fecha + timedelta(x))
+        dias.append(mov.dia)
+
+    with CaptureQueriesContext(connection) as ctx_corta:
+        SaldoDiario.indexar_por_rango([cuenta], dias[:2])
+    with CaptureQueriesContext(connection) as ctx_larga:
+        SaldoDiario.indexar_por_rango([cuenta, cuenta_2, cuenta_3], dias)
+
+    assert len(ctx_larga.captured_queries) == len(ctx_corta.captured_queries) == 3
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from diario.models import Movimiento, SaldoDiario
+
+
+def test_devuelve_saldo_diario_de_la_cuenta_en_la_fecha_dada(saldo_diario_anterior, saldo_diario):
+    assert SaldoDiario.ultimo_al(saldo_diario.cuenta, saldo_diario.dia.fecha) == saldo_diario
+
+
+def test_si_no_es_inclusive_devuelve_saldo_diario_anterior_a_la_fecha_dada(saldo_diario_anterior, saldo_diario):
+    assert SaldoDiario.ultimo_al(saldo_diario.cuenta, saldo_diario.dia.fecha, inclusive=False) == \
+           saldo_diario_anterior
+
+
+def test_si_no_hay_saldo_diario_en_la_fecha_devuelve_el_ultimo_anterior_del_mismo_mes(cuenta, saldo_diario):
+    assert SaldoDiario.ultimo_al(cuenta, saldo_diario.dia.fecha + timedelta(1)) == saldo_diario
+
+
+def test_si_no_hay_saldos_diarios_en_el_mes_devuelve_el_ultimo_de_meses_anteriores(
+        cuenta, saldo_diario_anterior, saldo_diario):
+    assert SaldoDiario.ultimo_al(cuenta, saldo_diario.dia.fecha + timedelta(60)) == saldo_diario
+
+
+def test_no_devuelve_saldos_diarios_posteriores_del_mismo_mes(cuenta, saldo_diario):
+    assert SaldoDiario.ultimo_al(cuenta, saldo_diario.dia.fecha - timedelta(1)) is None
+
+
+def test_si_no_hay_saldos_diarios_anteriores_devuelve_None(cuenta, saldo_diario_anterior):
+    assert SaldoDiario.ultimo_al(cuenta, saldo_diario_anterior.dia.fecha - timedelta(60)) is None
+
+
+def test_no_devuelve_saldos_diarios_de_otras_cuentas(cuenta, saldo_diario_otra_cuenta):
+    assert SaldoDiario.ultimo_al(cuenta, saldo_diario_otra_cuenta.dia.fecha) is None
+
+
+def test_importe_refleja_movimientos_agregados_despues_de_creado_el_cierre_mensual(
+        cuenta, saldo_diario_anterior, saldo_diario):
+    Movimiento.crear(
+        concepto="Entrada retroactiva", importe=33, cta_entrada=cuenta,
+        fecha=saldo_diario_anterior.dia.fecha - timedelta(60)
+    )
+    assert SaldoDiario.ultimo_al(cuenta, saldo_diario.dia.fecha + timedelta(60)).importe == \
+           saldo_diario.tomar_de_bd().importe
+
+
+def test_cantidad_de_queries_no_depende_de_la_cantidad_de_saldos_diarios_anteriores(cuenta, fecha):
+    for x in range(3):
+        Movimiento.crear(concepto=f"Entrada {x}", importe=10, cta_entrada=cuenta, fecha=fecha - timedelta(x*40))
+    with CaptureQueriesContext(connection) as ctx_corta:
+        SaldoDiario.ultimo_al(cuenta, fecha + timedelta(60))
+
+    for x in range(3, 30):
+        Movimiento.crear(concepto=f"Entrada {x}", importe=10, cta_entrada=cuenta, fecha=fecha - timedelta(x*40))
+    with CaptureQueriesContext(connection) as ctx_larga:
+        SaldoDiario.ultimo_al(cuenta, fecha + timedelta(60))
+
+    assert len(ctx_larga.captured_queries) == len(ctx_corta.captured_queries) == 2
+
+
+def test_no_hace_join_con_dia(cuenta, saldo_diario_anterior, saldo_diario):
+    with CaptureQueriesContext(connection) as ctx:
+        SaldoDiario.ultimo_al(cuenta, saldo_diario.dia.fecha + timedelta(60))
+    assert all("diario_dia" not in q["sql"] for q in ctx.captured_queries)
@@ -78,3 +78,10 @@ def test_recorre_una_sola_vez_saldos_posteriores_de_la_cuenta(
     saldo_diario_anterior.eliminar()
 
     assert calls == 1
+
+
+def test_guarda_fecha_del_dia(cuenta, dia):
+    saldo = SaldoDiario(cuenta=cuenta, dia=dia, importe=100)
+    saldo.full_clean()
+    saldo.save()
+    assert saldo.tomar_de_bd().fecha == dia.fecha
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from diario.models import Movimiento, SaldoMensual
+
+
+def test_se_crea_al_crear_primer_saldo_diario_del_mes_de_una_cuenta(cuenta, saldo_diario):
+    cierre = SaldoMensual.tomar(cuenta=cuenta, mes=saldo_diario.dia.fecha.replace(day=1))
+    assert cierre.saldo_diario == saldo_diario
+
+
+def test_apunta_al_ultimo_saldo_diario_del_mes(cuenta, saldo_diario, fecha):
+    mov = Movimiento.crear(concepto="Entrada", importe=5, cta_entrada=cuenta, fecha=fecha + timedelta(1))
+    cierre = SaldoMensual.tomar(cuenta=cuenta, mes=fecha.replace(day=1))
+    assert cierre.saldo_diario.dia == mov.dia
+
+
+def test_no_cambia_si_se_agrega_saldo_diario_anterior_en_el_mismo_mes(cuenta, saldo_diario, fecha):
+    Movimiento.crear(concepto="Entrada", importe=5, cta_entrada=cuenta, fecha=fecha - timedelta(1))
+    cierre = SaldoMensual.tomar(cuenta=cuenta, mes=fecha.replace(day=1))
+    assert cierre.saldo_diario == saldo_diario
+
+
+def test_importe_es_el_del_ultimo_saldo_diario_del_mes(cuenta, saldo_diario, fecha):
+    Movimiento.crear(concepto="Entrada", importe=5, cta_entrada=cuenta, fecha=fecha - timedelta(1))
+    cierre = SaldoMensual.tomar(cuenta=cuenta, mes=fecha.replace(day=1))
+    assert cierre.importe == saldo_diario.tomar_de_bd().importe
+
+
+def test_si_se_elimina_ultimo_saldo_diario_del_mes_apunta_al_anterior(cuenta, saldo_diario, fecha):
+    mov = Movimiento.crear(concepto="Entrada", importe=5, cta_entrada=cuenta, fecha=fecha + timedelta(1))
+    mov.delete()
+    cierre = SaldoMensual.tomar(cuenta=cuenta, mes=fecha.replace(day=1))
+    assert cierre.saldo_diario == saldo_diario
+
+
+def test_si_se_elimina_unico_saldo_diario_del_mes_se_elimina(cuenta, entrada, fecha):
+    entrada.delete()
+    assert not SaldoMensual.filtro(cuenta=cuenta, mes=fecha.replace(day=1)).exists()
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from diario.models import Movimiento, SaldoDiario, SaldoMensual
+
+
+def test_genera_un_cierre_por_mes_con_saldos_diarios(cuenta, saldo_diario_anterior, saldo_diario, fecha):
+    Movimiento.crear(concepto="Entrada", importe=5, cta_entrada=cuenta, fecha=fecha + timedelta(1))
+    SaldoMensual.filtro(cuenta=cuenta).delete()
+
+    SaldoMensual.regenerar(cuenta)
+
+    assert {
+        (c.mes, c.saldo_diario) for c in SaldoMensual.filtro(cuenta=cuenta)
+    } == {
+        (saldo_diario_anterior.dia.fecha.replace(day=1), saldo_diario_anterior),
+        (fecha.replace(day=1), SaldoDiario.tomar(cuenta=cuenta, dia__fecha=fecha + timedelta(1))),
+    }
+
+
+def test_si_recibe_fecha_solo_regenera_cierres_a_partir_del_mes_de_esa_fecha(
+        cuenta, saldo_diario_anterior, saldo_diario):
+    SaldoMensual.filtro(cuenta=cuenta).delete()
+
+    SaldoMensual.regenerar(cuenta, desde=saldo_diario.dia.fecha)
+
+    assert list(SaldoMensual.filtro(cuenta=cuenta).values_list("saldo_diario", flat=True)) == [saldo_diario.pk]
+
+
+def test_recalcular_saldos_diarios_regenera_cierres_mensuales(cuenta, saldo_diario_anterior, saldo_diario):
+    cuenta.recalcular_saldos_diarios()
+    assert [c.saldo_diario.dia for c in SaldoMensual.filtro(cuenta=cuenta)] == \
+           [saldo_diario_anterior.dia, saldo_diario.dia]
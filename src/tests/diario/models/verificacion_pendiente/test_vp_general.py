@@ -0,0 +1,45 @@
+from diario.models import SaldoDiario, VerificacionPendiente
+
+
+def test_se_registra_cuenta_al_crear_saldo_diario(cuenta, dia):
+    VerificacionPendiente.todes().delete()
+    SaldoDiario.crear(cuenta=cuenta, dia=dia, importe=100)
+    assert VerificacionPendiente.filtro(cuenta=cuenta).exists()
+
+
+def test_se_registra_cuenta_al_modificar_saldo_diario(cuenta, entrada):
+    VerificacionPendiente.todes().delete()
+    saldo_diario = SaldoDiario.tomar(cuenta=cuenta, dia=entrada.dia)
+    saldo_diario.importe += 10
+    saldo_diario.clean_save()
+    assert VerificacionPendiente.filtro(cuenta=cuenta).exists()
+
+
+def test_se_registra_cuenta_al_eliminar_saldo_diario(cuenta, entrada):
+    VerificacionPendiente.todes().delete()
+    SaldoDiario.tomar(cuenta=cuenta, dia=entrada.dia).delete()
+    assert VerificacionPendiente.filtro(cuenta=cuenta).exists()
+
+
+def test_se_registran_cuentas_de_movimiento_modificado(cuenta, cuenta_2, traspaso):
+    VerificacionPendiente.todes().delete()
+    traspaso.importe += 10
+    traspaso.clean_save()
+    assert set(VerificacionPendiente.todes().values_list("cuenta_id", flat=True)) == {cuenta.pk, cuenta_2.pk}
+
+
+def test_se_registra_cuenta_al_recalcular_saldos_diarios(cuenta, entrada):
+    VerificacionPendiente.todes().delete()
+    cuenta.recalcular_saldos_diarios()
+    assert VerificacionPendiente.filtro(cuenta=cuenta).exists()
+
+
+def test_no_se_registra_dos_veces_la_misma_cuenta(cuenta, entrada, salida):
+    assert VerificacionPendiente.filtro(cuenta=cuenta).count() == 1
+
+
+def test_marcar_registra_varias_cuentas_con_un_solo_insert(
+        django_assert_num_queries, cuenta, cuenta_2, cuenta_3):
+    with django_assert_num_queries(1):
+        VerificacionPendiente.marcar([cuenta.pk, cuenta_2.pk, cuenta_3.pk])
+    assert VerificacionPendiente.cantidad() == 3
@@ -34,3 +34,11 @@ def test_si_no_hay_cotizaciones_de_la_moneda_devuelve_1(dolar, compra):
     context = dict()
     dolar.cotizaciones.all().delete()
     assert cotizacion(context, moneda=dolar, compra=compra) == float_format(1)
+
+
+@pytest.mark.parametrize("compra", (True, False))
+def test_si_hay_cotizaciones_en_el_context_las_toma_de_ahi_sin_consultar_la_base_de_datos(
+        dolar, cotizacion_dolar, compra, django_assert_num_queries):
+    context = {"cotizaciones": {dolar.sk: (7.5, 8.5)}}
+    with django_assert_num_queries(0):
+        assert cotizacion(context, moneda=dolar, compra=compra) == float_format(7.5 if compra else 8.5)
@@ -1,3 +1,6 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from diario.templatetags.movimientos import movs_seleccionados
 
 
@@ -19,3 +22,11 @@ class TestFilterMovsSeleccionados:
             self, dia, titular, entrada, salida, entrada_anterior, salida_posterior,
             entrada_otra_cuenta, entrada_cuenta_ajena):
         assert list(movs_seleccionados(dia, None)) == [entrada, salida, entrada_otra_cuenta, entrada_cuenta_ajena]
+
+    def test_movimientos_devueltos_traen_su_orden_dia_en_el_dia_aunque_se_filtren_por_cuenta(
+            self, dia, cuenta, entrada, entrada_otra_cuenta, salida):
+        movs = list(movs_seleccionados(dia, cuenta))
+        with CaptureQueriesContext(connection) as ctx:
+            ordenes = [mov.orden_dia for mov in movs]
+        assert ordenes == [0, 2]
+        assert len(ctx.captured_queries) == 0
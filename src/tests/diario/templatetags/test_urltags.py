@@ -100,18 +100,6 @@ class TestMovUrl:
         context = {"titular": titular, "cuenta": cuenta}
         assert movurl(context, entrada) == cuenta.get_url_with_mov(entrada)
 
-    @pytest.mark.parametrize("origen", [None, "titular", "cuenta"])
-    def test_si_recibe_nro_de_pagina_agrega_querystring_con_pagina_al_url_devuelto(
-            self, origen, entrada, request):
-        if origen:
-            ente = request.getfixturevalue(origen)
-            context = {origen: ente}
-            base_url = ente.get_url_with_mov(entrada)
-        else:
-            context = dict()
-            base_url = entrada.get_absolute_url()
-        assert movurl(context, entrada, page=2) == base_url + "?page=2"
-
     @pytest.mark.parametrize("origen", [None, "titular", "cuenta"])
     def test_si_recibe_fecha_agrega_querystring_con_fecha_al_url_devuelto(self, origen, entrada, fecha, request):
         if origen:
@@ -123,10 +111,18 @@ class TestMovUrl:
             base_url = entrada.get_absolute_url()
         assert movurl(context, entrada, fecha=fecha) == base_url + f"?fecha={fecha}"
 
-    def test_si_recibe_fecha_y_pagina_prioriza_fecha(self, entrada, fecha):
+    def test_si_recibe_fecha_y_cursor_prioriza_fecha(self, entrada, fecha, fecha_anterior):
         context = dict()
         assert \
-            movurl(context, entrada, fecha=fecha, page=2) == entrada.get_absolute_url() + f"?fecha={fecha}"
+            movurl(context, entrada, fecha=fecha, hasta=fecha_anterior) == \
+            entrada.get_absolute_url() + f"?fecha={fecha}"
+
+    @pytest.mark.parametrize("cursor", ["desde", "hasta"])
+    def test_si_recibe_cursor_de_fecha_agrega_querystring_con_cursor_al_url_devuelto(
+            self, cursor, entrada, fecha):
+        context = dict()
+        assert \
+            movurl(context, entrada, **{cursor: fecha}) == entrada.get_absolute_url() + f"?{cursor}={fecha}"
 
 
 class TestPageUrl:
@@ -137,6 +133,15 @@ class TestPageUrl:
         context = Context({"request": request})
         assert pageurl(context, 2) == f"{url_actual}?page=2#id_section_movimientos"
 
+    @pytest.mark.parametrize("cursor", ["desde", "hasta"])
+    @pytest.mark.parametrize("url_actual", ["/", "/diario/c/c/", "/diario/t/titular/"])
+    def test_si_recibe_cursor_de_fecha_devuelve_url_actual_con_querystring_indicando_cursor_y_marcador(
+            self, url_actual, cursor, fecha):
+        factory = RequestFactory()
+        request = factory.get(url_actual)
+        context = Context({"request": request})
+        assert pageurl(context, **{cursor: fecha}) == f"{url_actual}?{cursor}={fecha}#id_section_movimientos"
+
     @pytest.mark.parametrize("url_actual", ["/", "/diario/c/c/", "/diario/t/titular/"])
     def test_si_no_recibe_nro_de_pagina_devuelve_url_actual_con_marcador(self, url_actual):
         factory = RequestFactory()
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+import pytest
+
+from diario.models import Cotizacion
+from diario.utils.utils_matriz import MatrizCotizaciones, multiplicar_filas
+
+
+@pytest.fixture
+def matriz() -> MatrizCotizaciones:
+    return MatrizCotizaciones({
+        1: [(1.0, 1.0), (1.0, 1.0), (1.0, 1.0)],
+        2: [None, (100.0, 110.0), (200.0, 220.0)],
+        3: [(1000.0, 1050.0), (1000.0, 1050.0), (1200.0, 1250.0)],
+    })
+
+
+def test_multiplicar_filas_multiplica_elemento_a_elemento_y_redondea():
+    assert multiplicar_filas([1.0, 2.0, 3.333], [2.0, 0.5, 3.0]) == [2.0, 1.0, 10.0]
+
+
+def test_factores_entre_misma_moneda_son_1(matriz):
+    assert matriz.factores(2, 2) == [1.0, 1.0, 1.0]
+
+
+def test_factores_son_venta_de_origen_sobre_compra_de_destino(matriz):
+    assert matriz.factores(3, 2)[1:] == [1050 / 100, 1250 / 200]
+
+
+def test_factor_es_1_en_dias_sin_cotizacion(matriz):
+    assert matriz.factores(3, 2)[0] == 1.0
+
+
+def test_convertir_devuelve_fila_de_saldos_de_cada_cuenta_en_cada_moneda(matriz):
+    resultado = matriz.convertir({10: [1.0, 2.0, 3.0], 20: [5.0, 5.0, 5.0]}, {10: 2, 20: 1}, [1, 3])
+    assert resultado == {
+        (10, 1): [1.0, round(2 * 110 / 1, 2), round(3 * 220 / 1, 2)],
+        (10, 3): [1.0, round(2 * 110 / 1000, 2), round(3 * 220 / 1200, 2)],
+        (20, 1): [5.0, 5.0, 5.0],
+        (20, 3): [round(5 / 1000, 2), round(5 / 1000, 2), round(5 / 1200, 2)],
+    }
+
+
+def test_cargar_toma_factores_de_cada_dia_del_rango(cuenta_con_saldo_en_dolares, dolar, peso, fecha):
+    Cotizacion.crear(moneda=dolar, fecha=fecha + timedelta(1), importe_compra=1200, importe_venta=1250)
+    desde, hasta = fecha, fecha + timedelta(2)
+    indice = Cotizacion.indexar_rango([cuenta_con_saldo_en_dolares], [peso], desde, hasta)
+
+    matriz = MatrizCotizaciones.cargar([dolar.pk, peso.pk], desde, hasta)
+
+    assert matriz.factores(dolar.pk, peso.pk) == [
+        indice[(dolar.pk, peso.pk, fecha + timedelta(x))] for x in range(3)
+    ]
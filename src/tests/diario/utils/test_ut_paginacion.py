@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from diario.models import Dia
+from diario.utils.utils_paginacion import PaginaDias
+
+
+@pytest.fixture
+def dias(muchos_dias):
+    return Dia.con_movimientos()
+
+
+def fechas(pagina: PaginaDias) -> list:
+    return [d.fecha for d in pagina]
+
+
+def test_sin_cursor_devuelve_los_7_dias_mas_recientes_en_orden_descendente(dias):
+    pagina = PaginaDias(dias)
+    assert fechas(pagina) == [d.fecha for d in dias.order_by("-fecha")[:7]]
+
+
+def test_sin_cursor_no_tiene_pagina_anterior_y_tiene_pagina_siguiente(dias):
+    pagina = PaginaDias(dias)
+    assert not pagina.has_previous
+    assert pagina.has_next
+
+
+def test_con_hasta_devuelve_7_dias_hasta_la_fecha_inclusive(dias):
+    hasta = dias.order_by("-fecha")[10].fecha
+    pagina = PaginaDias(dias, hasta=hasta)
+    assert fechas(pagina) == [d.fecha for d in dias.order_by("-fecha")[10:17]]
+    assert pagina.has_previous
+
+
+def test_hasta_siguiente_devuelve_pagina_siguiente(dias):
+    pagina = PaginaDias(dias)
+    siguiente = PaginaDias(dias, hasta=pagina.hasta_siguiente)
+    assert fechas(siguiente) == [d.fecha for d in dias.order_by("-fecha")[7:14]]
+
+
+def test_desde_anterior_devuelve_pagina_anterior(dias):
+    pagina = PaginaDias(dias, hasta=dias.order_by("-fecha")[10].fecha)
+    anterior = PaginaDias(dias, desde=pagina.desde_anterior)
+    assert fechas(anterior) == [d.fecha for d in dias.order_by("-fecha")[3:10]]
+    assert anterior.has_previous
+    assert anterior.has_next
+
+
+def test_si_no_hay_mas_dias_posteriores_a_desde_devuelve_la_primera_pagina(dias):
+    pagina = PaginaDias(dias, desde=dias.order_by("-fecha")[3].fecha)
+    assert fechas(pagina) == fechas(PaginaDias(dias))
+    assert not pagina.has_previous
+
+
+def test_con_desde_fecha_minima_devuelve_los_7_dias_mas_antiguos(dias):
+    pagina = PaginaDias(dias, desde=PaginaDias.fecha_minima)
+    assert fechas(pagina) == [d.fecha for d in dias.order_by("fecha")[:7]][::-1]
+    assert not pagina.has_next
+    assert pagina.has_previous
+
+
+def test_si_no_hay_dias_hasta_la_fecha_devuelve_los_dias_mas_antiguos(dias):
+    pagina = PaginaDias(dias, hasta=dias.first().fecha - timedelta(1))
+    assert fechas(pagina) == [d.fecha for d in dias.order_by("fecha")[:7]][::-1]
+    assert not pagina.has_next
+
+
+def test_hasta_centrado_deja_el_dia_de_la_fecha_en_el_medio_de_la_pagina(dias):
+    ordenados = list(dias.order_by("-fecha"))
+    pagina = PaginaDias(dias, hasta=PaginaDias.hasta_centrado(dias, ordenados[10].fecha))
+    assert fechas(pagina) == [d.fecha for d in ordenados[7:14]]
+
+
+def test_hasta_centrado_sin_dias_posteriores_suficientes_devuelve_el_ultimo_dia(dias):
+    ordenados = list(dias.order_by("-fecha"))
+    assert PaginaDias.hasta_centrado(dias, ordenados[1].fecha) == ordenados[0].fecha
+
+
+def test_number_se_calcula_a_partir_de_los_dias_posteriores(dias):
+    pagina = PaginaDias(dias, hasta=dias.order_by("-fecha")[14].fecha)
+    assert pagina.number == 3
+
+
+def test_permite_verificar_si_un_dia_esta_en_la_pagina(dias):
+    pagina = PaginaDias(dias)
+    assert dias.last() in pagina
+    assert dias.first() not in pagina
+
+
+class TestPaginaDiasPerformance:
+    def test_cantidad_de_queries_no_depende_de_la_posicion_de_la_pagina(self, dias):
+        with CaptureQueriesContext(connection) as ctx_reciente:
+            PaginaDias(dias, hasta=dias.order_by("-fecha")[1].fecha)
+        with CaptureQueriesContext(connection) as ctx_antigua:
+            PaginaDias(dias, hasta=dias.order_by("fecha")[8].fecha)
+
+        assert len(ctx_antigua.captured_queries) == len(ctx_reciente.captured_queries)
+
+    def test_no_cuenta_la_cantidad_total_de_dias(self, dias):
+        with CaptureQueriesContext(connection) as ctx:
+            PaginaDias(dias, hasta=dias.order_by("-fecha")[10].fecha)
+            PaginaDias(dias, desde=dias.order_by("-fecha")[20].fecha)
+
+        assert not any("COUNT(" in q["sql"] for q in ctx.captured_queries)
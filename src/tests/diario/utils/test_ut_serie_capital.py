@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+
+from diario.models import Movimiento
+from diario.utils.utils_saldo import serie_capital
+
+
+def test_devuelve_capital_al_final_de_cada_dia_del_rango(peso, cuenta, entrada, salida, salida_posterior, fecha):
+    serie = serie_capital(fecha - timedelta(1), fecha + timedelta(1), peso)
+    assert serie == [
+        (fecha - timedelta(1), 0),
+        (fecha, entrada.importe - salida.importe),
+        (fecha + timedelta(1), entrada.importe - salida.importe),
+    ]
+
+
+def test_arrastra_saldo_anterior_al_rango(peso, cuenta, entrada, fecha):
+    serie = serie_capital(fecha + timedelta(10), fecha + timedelta(11), peso)
+    assert [saldo for _, saldo in serie] == [entrada.importe, entrada.importe]
+
+
+def test_suma_saldos_de_todas_las_cuentas(peso, cuenta, cuenta_ajena, entrada, entrada_tardia_cuenta_ajena, fecha_tardia):
+    assert serie_capital(fecha_tardia, fecha_tardia, peso) == [
+        (fecha_tardia, entrada.importe + entrada_tardia_cuenta_ajena.importe)
+    ]
+
+
+def test_con_titular_suma_solo_saldos_de_cuentas_del_titular(
+        peso, titular, cuenta, cuenta_ajena, entrada, entrada_tardia_cuenta_ajena, fecha_tardia):
+    assert serie_capital(fecha_tardia, fecha_tardia, peso, titular=titular) == [(fecha_tardia, entrada.importe)]
+
+
+def test_conserva_capital_de_cuenta_convertida_en_acumulativa(peso, cuenta, entrada, fecha):
+    cuenta.dividir_y_actualizar(
+        ["subcuenta 1", "sc1", 30],
+        ["subcuenta 2", "sc2"],
+        fecha=fecha + timedelta(1),
+    )
+    serie = serie_capital(fecha, fecha + timedelta(2), peso)
+    assert [saldo for _, saldo in serie] == [entrada.importe] * 3
+
+
+def test_convierte_saldos_a_la_moneda_dada(peso, dolar, cuenta, entrada, fecha):
+    cot_peso = peso.cotizacion_al(fecha, compra=False)
+    cot_dolar = dolar.cotizacion_al(fecha, compra=True)
+    assert serie_capital(fecha, fecha, dolar) == [(fecha, round(entrada.importe * cot_peso / cot_dolar, 2))]
+
+
+def test_mensual_devuelve_solo_ultimo_dia_de_cada_mes_y_ultimo_dia_del_rango(peso, cuenta, entrada):
+    serie = serie_capital(date(2004, 4, 1), date(2004, 6, 15), peso, mensual=True)
+    assert [fecha for fecha, _ in serie] == [date(2004, 4, 30), date(2004, 5, 31), date(2004, 6, 15)]
+
+
+def test_cantidad_de_queries_no_crece_con_dias_ni_cuentas(
+        django_assert_max_num_queries, peso, dolar, cuenta, cuenta_2, fecha):
+    for x in range(1, 20):
+        Movimiento.crear(concepto=f"Entrada {x}", importe=x, cta_entrada=cuenta, fecha=fecha + timedelta(x))
+        Movimiento.crear(concepto=f"Salida {x}", importe=x, cta_salida=cuenta_2, fecha=fecha + timedelta(x))
+    with django_assert_max_num_queries(4):
+        serie_capital(fecha, fecha + timedelta(365), dolar)
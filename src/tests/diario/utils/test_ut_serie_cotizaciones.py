@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+
+from diario.models import Cotizacion
+from diario.utils.utils_cotizacion import SerieCotizaciones, CLAVE_VERSION
+
+
+def test_devuelve_importes_de_cotizacion_vigente_a_la_fecha(
+        dolar, cotizacion_dolar, cotizacion_posterior_dolar, fecha):
+    assert SerieCotizaciones.al(dolar.pk, fecha) == (
+        cotizacion_dolar.importe_compra, cotizacion_dolar.importe_venta
+    )
+
+
+def test_incluye_cotizacion_de_la_fecha_dada(dolar, cotizacion_posterior_dolar, fecha_posterior):
+    assert SerieCotizaciones.al(dolar.pk, fecha_posterior) == (
+        cotizacion_posterior_dolar.importe_compra, cotizacion_posterior_dolar.importe_venta
+    )
+
+
+def test_devuelve_none_si_no_hay_cotizaciones_anteriores_a_la_fecha(dolar, cotizacion_dolar, fecha_anterior):
+    assert SerieCotizaciones.al(dolar.pk, fecha_anterior - timedelta(1)) is None
+
+
+def test_se_actualiza_al_guardar_cotizacion(dolar, cotizacion_dolar, fecha):
+    SerieCotizaciones.al(dolar.pk, fecha)
+    Cotizacion.crear(moneda=dolar, fecha=fecha, importe_compra=500, importe_venta=550)
+    assert SerieCotizaciones.al(dolar.pk, fecha) == (500, 550)
+
+
+def test_se_actualiza_al_eliminar_cotizacion(dolar, cotizacion_dolar, cotizacion_posterior_dolar, fecha_posterior):
+    SerieCotizaciones.al(dolar.pk, fecha_posterior)
+    cotizacion_posterior_dolar.delete()
+    assert SerieCotizaciones.al(dolar.pk, fecha_posterior) == (
+        cotizacion_dolar.importe_compra, cotizacion_dolar.importe_venta
+    )
+
+
+def test_carga_cotizaciones_de_todas_las_monedas_en_una_sola_query(
+        django_assert_num_queries, dolar, euro, cotizacion_dolar, cotizacion_posterior_dolar,
+        cotizacion_posterior_euro, fecha, fecha_posterior):
+    with django_assert_num_queries(1):
+        for f in fecha, fecha_posterior:
+            SerieCotizaciones.al(dolar.pk, f)
+            SerieCotizaciones.al(euro.pk, f)
+
+
+def test_sincronizar_descarta_series_si_cambio_la_version_compartida(
+        dolar, cotizacion_dolar, fecha, django_assert_num_queries):
+    SerieCotizaciones.al(dolar.pk, fecha)
+    cache.set(CLAVE_VERSION, "modificada en otro proceso")
+    SerieCotizaciones.sincronizar()
+    with django_assert_num_queries(1):
+        SerieCotizaciones.al(dolar.pk, fecha)
+
+
+def test_sincronizar_no_descarta_series_si_no_cambio_la_version(
+        dolar, cotizacion_dolar, fecha, django_assert_num_queries):
+    SerieCotizaciones.al(dolar.pk, fecha)
+    SerieCotizaciones.sincronizar()
+    with django_assert_num_queries(0):
+        SerieCotizaciones.al(dolar.pk, fecha)
+
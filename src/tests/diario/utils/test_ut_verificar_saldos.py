@@ -1,30 +1,97 @@
-from unittest.mock import MagicMock
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-import pytest
+from diario.models import SaldoDiario, VerificacionPendiente
+from diario.utils.utils_saldo import limpiar_pendientes, verificar_saldos
+from utils.helpers_tests import queries_a_tabla
 
-from diario.utils.utils_saldo import verificar_saldos
 
+# Funciones auxiliares
 
-# Fixtures
-
-@pytest.fixture
-def mock_saldo_ok(mocker) -> MagicMock:
-    return mocker.patch('diario.models.CuentaInteractiva.saldo_ok')
+def alterar_saldo(cuenta, importe):
+    saldo = cuenta.ultimo_saldo
+    saldo.importe += importe
+    saldo.save(actualizar_posteriores=False)
 
 
 # Tests
 
 def test_devuelve_lista_vacia_si_todos_los_saldos_ok(
-        cuenta, cuenta_con_saldo, cuenta_con_saldo_negativo, mock_saldo_ok):
-    mock_saldo_ok.return_value = True
+        cuenta, cuenta_con_saldo, cuenta_con_saldo_negativo, entrada, salida, traspaso):
     ctas_erroneas = verificar_saldos()
     assert ctas_erroneas == []
 
 
 def test_devuelve_lista_de_cuentas_con_saldos_incorrectos(
-        cuenta, cuenta_con_saldo, cuenta_con_saldo_negativo, mock_saldo_ok):
-    mock_saldo_ok.side_effect = [False, False, True]
+        cuenta, cuenta_con_saldo, cuenta_con_saldo_negativo, entrada):
+    alterar_saldo(cuenta, 10)
+    alterar_saldo(cuenta_con_saldo, -5)
     ctas_erroneas = verificar_saldos()
     assert cuenta in ctas_erroneas
     assert cuenta_con_saldo in ctas_erroneas
     assert cuenta_con_saldo_negativo not in ctas_erroneas
+
+
+def test_cuentas_devueltas_indican_diferencia_entre_saldo_y_suma_de_movimientos(
+        cuenta, cuenta_con_saldo, entrada, salida):
+    alterar_saldo(cuenta, 10)
+    alterar_saldo(cuenta_con_saldo, -5.5)
+    diferencias = {c.pk: c.diferencia for c in verificar_saldos()}
+    assert diferencias == {cuenta.pk: 10, cuenta_con_saldo.pk: -5.5}
+
+
+def test_toma_en_cuenta_movimientos_entre_cuentas_en_distinta_moneda(
+        mov_distintas_monedas_en_moneda_cta_salida, mov_distintas_monedas_en_moneda_cta_entrada):
+    assert verificar_saldos() == []
+
+
+def test_detecta_cuenta_con_movimientos_y_sin_saldos_diarios(cuenta, entrada):
+    SaldoDiario.filtro(cuenta=cuenta).delete()
+    assert [c.diferencia for c in verificar_saldos()] == [-entrada.importe]
+
+
+def test_hace_una_sola_query_de_verificacion(cuenta, cuenta_2, cuenta_3, entrada, entrada_otra_cuenta, traspaso):
+    alterar_saldo(cuenta, 10)
+    with CaptureQueriesContext(connection) as ctx:
+        verificar_saldos()
+    assert queries_a_tabla(ctx.captured_queries, "diario_movimiento") == 1
+
+
+def test_verifica_saldos_de_cuentas_acumulativas(cuenta_acumulativa):
+    assert verificar_saldos() == []
+    SaldoDiario.filtro(cuenta=cuenta_acumulativa).update(_importe=10)
+    assert [(c.pk, c.diferencia) for c in verificar_saldos()] == [(cuenta_acumulativa.pk, 10)]
+
+
+def test_no_modifica_verificaciones_pendientes(cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+    alterar_saldo(cuenta, 10)
+    with CaptureQueriesContext(connection) as ctx:
+        verificar_saldos()
+    assert VerificacionPendiente.cantidad() == 2
+    assert not any(
+        q["sql"].startswith(("INSERT", "UPDATE", "DELETE")) for q in ctx.captured_queries
+    )
+
+
+def test_limpiar_pendientes_quita_verificacion_pendiente_de_cuentas_sin_diferencias(
+        cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+    alterar_saldo(cuenta, 10)
+    limpiar_pendientes(verificar_saldos())
+    assert list(VerificacionPendiente.todes().values_list("cuenta_id", flat=True)) == [cuenta.pk]
+
+
+class TestVerificarSaldosIncremental:
+    def test_verifica_solo_cuentas_con_verificacion_pendiente(self, cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+        alterar_saldo(cuenta, 10)
+        alterar_saldo(cuenta_2, 10)
+        VerificacionPendiente.filtro(cuenta=cuenta_2).delete()
+        assert verificar_saldos(incremental=True) == [cuenta]
+
+    def test_detecta_cuenta_modificada_despues_de_verificacion(self, cuenta, cuenta_2, entrada, entrada_otra_cuenta):
+        limpiar_pendientes(verificar_saldos())
+        alterar_saldo(cuenta_2, 10)
+        assert verificar_saldos(incremental=True) == [cuenta_2]
+
+    def test_si_no_hay_cuentas_pendientes_no_devuelve_nada(self, cuenta, entrada):
+        limpiar_pendientes(verificar_saldos())
+        assert verificar_saldos(incremental=True) == []
@@ -16,7 +16,12 @@ def mock_verificar_saldos(mocker) -> MagicMock:
 
 def test_verifica_saldo_de_cuentas(client, mock_verificar_saldos):
     client.get(reverse('verificar_saldos'))
-    mock_verificar_saldos.assert_called_once()
+    mock_verificar_saldos.assert_called_once_with(incremental=False)
+
+
+def test_con_argumento_incremental_verifica_solo_cuentas_pendientes(client, mock_verificar_saldos):
+    client.get(reverse('verificar_saldos') + '?incremental=1')
+    mock_verificar_saldos.assert_called_once_with(incremental=True)
 
 
 def test_redirige_a_home_si_no_hay_saldos_erroneos(client, mock_verificar_saldos):
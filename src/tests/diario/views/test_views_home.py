@@ -1,15 +1,15 @@
 from datetime import timedelta
-from unittest.mock import call, ANY
+from unittest.mock import call
 
 import pytest
 from django.template.response import TemplateResponse
 from django.urls import reverse
 from pytest_django import asserts
 
-from diario.models import Dia, Movimiento
+from diario.models import Dia, Movimiento, SaldoDiario
 from diario.settings_app import TEMPLATE_HOME
 from diario.utils.utils_saldo import saldo_general_historico
-from utils.helpers_tests import fecha2page
+from utils.helpers_tests import fecha2hasta
 from utils.numeros import float_format
 
 
@@ -92,6 +92,21 @@ class TestBaseHome:
         for moneda in (peso, dolar, euro):
             assert moneda in response.context.get('monedas')
 
+    def test_pasa_cotizaciones_vigentes_de_monedas_a_template(
+            self, peso, dolar, cotizacion_dolar, cotizacion_posterior_dolar, response):
+        cotizaciones = response.context["cotizaciones"]
+        assert cotizaciones[dolar.sk] == (
+            cotizacion_posterior_dolar.importe_compra, cotizacion_posterior_dolar.importe_venta
+        )
+        assert peso.sk in cotizaciones
+
+    def test_si_hay_movimiento_seleccionado_pasa_cotizaciones_a_la_fecha_del_movimiento(
+            self, dolar, entrada, cotizacion_dolar, cotizacion_posterior_dolar, client):
+        response = client.get(reverse("movimiento", args=[entrada.sk]))
+        assert response.context["cotizaciones"][dolar.sk] == (
+            cotizacion_dolar.importe_compra, cotizacion_dolar.importe_venta
+        )
+
     def test_pasa_dias_a_template(self, dia_con_movs, dia_anterior_con_movs, dia_posterior_con_movs, dia_tardio_con_movs, response):
         for d in (dia_con_movs, dia_anterior_con_movs, dia_posterior_con_movs, dia_tardio_con_movs):
             assert d in response.context.get('dias')
@@ -108,7 +123,7 @@ class TestBaseHome:
         assert dia_anterior not in response.context.get('dias')
 
     def test_puede_pasar_movimientos_posteriores(self, mas_de_7_dias, client):
-        response = client.get('/?page=2', follow=True)
+        response = client.get(f'/?hasta={list(mas_de_7_dias)[-8].fecha}', follow=True)
         assert mas_de_7_dias.first() in response.context.get('dias')
         assert mas_de_7_dias.last() not in response.context.get('dias')
 
@@ -183,9 +198,9 @@ class TestBaseHome:
 
     def test_no_usa_subcuentas_en_calculo_de_saldo_general_historico(
             self, cuenta_acumulativa, cuenta, client, mocker):
-        mock_sgh = mocker.patch("diario.views.saldo_general_historico")
+        spy = mocker.spy(SaldoDiario, "indexar_por_rango")
         client.get(reverse("home"))
-        mock_sgh.assert_called_with(dia=ANY, cuentas={cuenta, cuenta_acumulativa})
+        assert set(spy.call_args.kwargs["cuentas"]) == {cuenta, cuenta_acumulativa}
 
 
 class TestGet:
@@ -194,15 +209,22 @@ class TestGet:
             self, mas_de_7_dias, client):
         dia = mas_de_7_dias.first()
         response = client.get(f"{reverse('home')}?fecha={str(dia)}", follow=True)
-        assert response.context["dias"].number == fecha2page(Dia.con_movimientos(), dia.fecha)
+        assert dia in response.context["dias"]
+
+    def test_si_recibe_querydict_con_fecha_muestra_dias_posteriores_a_la_fecha_recibida(
+            self, mas_de_7_dias, client):
+        dias = list(Dia.con_movimientos())
+        response = client.get(f"{reverse('home')}?fecha={dias[-8].fecha}", follow=True)
+        for dia in dias[-8:-4]:
+            assert dia in response.context["dias"]
 
     def test_si_recibe_querydict_con_fecha_redirige_a_pagina_con_la_fecha_recibida_con_ultimo_movimiento_de_la_fecha_seleccionado(
             self, mas_de_7_dias, client):
         dia = mas_de_7_dias.first()
         mov = dia.movimientos.last()
-        pag = fecha2page(Dia.con_movimientos(), dia.fecha)
+        hasta = fecha2hasta(Dia.con_movimientos(), dia.fecha)
         response = client.get(f"{reverse('home')}?fecha={str(dia)}")
-        asserts.assertRedirects(response, mov.get_absolute_url() + f"?page={pag}&redirected=1")
+        asserts.assertRedirects(response, mov.get_absolute_url() + f"?hasta={hasta}")
 
     @pytest.mark.parametrize("origen", ["titular", "cuenta"])
     def test_si_recibe_url_con_titular_o_cuenta_y_querydict_con_fecha_redirige_a_url_con_titular_o_cuenta_y_movimiento(
@@ -214,7 +236,7 @@ class TestGet:
         response = client.get(ente.get_absolute_url() + f"?fecha={dia.fecha}")
         asserts.assertRedirects(
             response,
-            ente.get_url_with_mov(mov) + f"?page={fecha2page(dias, dia.fecha)}&redirected=1"
+            ente.get_url_with_mov(mov) + f"?hasta={fecha2hasta(dias, dia.fecha)}"
         )
 
     @pytest.mark.parametrize("origen", [None, "titular", "cuenta"])
@@ -234,7 +256,7 @@ class TestGet:
         url_destino = ultimo_mov_dia.get_url(ente)
         response = client.get(url_origen + f"?fecha={dia.fecha}")
 
-        asserts.assertRedirects(response, url_destino + f"?page={fecha2page(dias, dia.fecha)}&redirected=1")
+        asserts.assertRedirects(response, url_destino + f"?hasta={fecha2hasta(dias, dia.fecha)}")
 
     def test_si_la_fecha_recibida_en_el_querydict_no_corresponde_a_un_dia_existente_redirige_a_fecha_de_dia_anterior(
             self, mas_de_7_dias, client):
@@ -252,7 +274,7 @@ class TestGet:
         response = client.get(f"{reverse('home')}?fecha={fecha}")
         asserts.assertRedirects(
             response,
-            mov.get_absolute_url() + f"?page={fecha2page(mas_de_7_dias, dia.fecha)}&redirected=1"
+            mov.get_absolute_url() + f"?hasta={fecha2hasta(mas_de_7_dias, dia.fecha)}"
         )
 
     def test_si_la_fecha_recibida_en_el_querydict_corresponde_a_un_dia_sin_movimientos_redirige_a_dia_con_movimientos_anterior(
@@ -283,7 +305,7 @@ class TestGet:
         response = client.get(f"{url_origen}?fecha={dia.fecha - timedelta(1)}")
         asserts.assertRedirects(
             response,
-            url_destino + f"?page={fecha2page(dias, dia.fecha)}&redirected=1"
+            url_destino + f"?hasta={fecha2hasta(dias, dia.fecha)}"
         )
 
     def test_si_la_fecha_recibida_en_el_querydict_corresponde_a_un_dia_sin_movimientos_redirige_a_ultimo_movimiento_de_dia_anterior_con_movimientos(
@@ -297,7 +319,7 @@ class TestGet:
         response = client.get(f"{reverse('home')}?fecha={fecha}")
         asserts.assertRedirects(
             response,
-            mov.get_absolute_url() + f"?page={fecha2page(Dia.con_movimientos(), dia_anterior.fecha)}&redirected=1"
+            mov.get_absolute_url() + f"?hasta={fecha2hasta(Dia.con_movimientos(), dia_anterior.fecha)}"
         )
 
     @pytest.mark.parametrize("origen", ["titular", "cuenta"])
@@ -325,43 +347,50 @@ class TestGet:
         response = client.get(ente.get_absolute_url() + f"?fecha={fecha_sin_movs_de_ente}")
         asserts.assertRedirects(
             response,
-            ente.get_url_with_mov(mov_dia_anterior) + f"?page={fecha2page(dias, dia_anterior.fecha)}&redirected=1"
+            ente.get_url_with_mov(mov_dia_anterior) + f"?hasta={fecha2hasta(dias, dia_anterior.fecha)}"
         )
 
     @pytest.mark.parametrize("origen", [None, "titular", "cuenta"])
-    def test_si_recibe_querydict_con_pagina_y_movimiento_no_redirige_a_otra_url(
+    def test_si_recibe_querydict_con_cursor_y_movimiento_no_redirige_a_otra_url(
             self, mas_de_7_dias, client, origen, request):
         ente = request.getfixturevalue(origen) if origen else None
         dias = ente.dias() if ente else mas_de_7_dias
         mov = dias.first().movimientos.last()
         url_origen = mov.get_url(ente)
 
-        response = client.get(url_origen + "?page=2")
+        response = client.get(url_origen + f"?hasta={list(dias)[-8].fecha}")
 
         assert response.status_code == 200          # Response sin redirección
         assert "Location" not in response.headers
         assert response.context["movimiento"] == mov
 
     @pytest.mark.parametrize("origen", [None, "titular", "cuenta"])
-    def test_si_recibe_querydict_con_pagina_redirige_a_url_con_ultimo_mov_de_la_pagina_y_querydict_con_pagina(
+    def test_si_recibe_querydict_con_cursor_redirige_a_url_con_ultimo_mov_de_la_pagina_y_querydict_con_cursor(
             self, mas_de_7_dias, client, origen, request):
         ente = request.getfixturevalue(origen) if origen else None
         dias = ente.dias() if ente else mas_de_7_dias
         mov = list(dias)[-8].movimientos.last()
         url_origen = ente.get_absolute_url() if ente else reverse("home")
         url_destino = mov.get_url(ente)
-        response = client.get(url_origen + "?page=2")
+        querystring = f"?hasta={mov.fecha}"
+        response = client.get(url_origen + querystring)
         asserts.assertRedirects(
             response,
-            url_destino + "?page=2"
+            url_destino + querystring
         )
 
-    def test_si_recibe_querydict_con_pagina_y_movimiento_que_no_este_en_la_pagina_redirige_a_url_con_ultimo_mov_de_la_pagina_y_querydict_con_pagina(
+    def test_si_recibe_querydict_con_cursor_y_movimiento_que_no_este_en_la_pagina_redirige_a_url_con_ultimo_mov_de_la_pagina_y_querydict_con_cursor(
             self, mas_de_7_dias, client):
         mov_recibido = mas_de_7_dias.last().movimientos.last()
         mov_devuelto = list(mas_de_7_dias)[-8].movimientos.last()
-        response = client.get(mov_recibido.get_absolute_url() + "?page=2")
+        querystring = f"?hasta={mov_devuelto.fecha}"
+        response = client.get(mov_recibido.get_absolute_url() + querystring)
         asserts.assertRedirects(
             response,
-            mov_devuelto.get_absolute_url() + "?page=2"
+            mov_devuelto.get_absolute_url() + querystring
         )
+
+    def test_ignora_numero_de_pagina(self, mas_de_7_dias, client):
+        response = client.get(f"{reverse('home')}?page=2")
+        assert response.status_code == 200
+        assert response.context["dias"][0] == mas_de_7_dias.last()
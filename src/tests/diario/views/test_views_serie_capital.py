@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+
+
+@pytest.fixture
+def url() -> str:
+    return reverse("serie_capital")
+
+
+def test_devuelve_serie_diaria_de_capital_en_moneda_base(client, url, peso, cuenta, entrada, fecha):
+    response = client.get(url, {"desde": str(fecha - timedelta(1)), "hasta": str(fecha)})
+    assert response.json() == {
+        "moneda": peso.sk,
+        "titular": None,
+        "frecuencia": "diaria",
+        "serie": [
+            {"fecha": str(fecha - timedelta(1)), "saldo": 0},
+            {"fecha": str(fecha), "saldo": entrada.importe},
+        ],
+    }
+
+
+def test_devuelve_serie_en_la_moneda_indicada(client, url, peso, dolar, cuenta, entrada, fecha):
+    response = client.get(url, {"desde": str(fecha), "hasta": str(fecha), "moneda": dolar.sk})
+    assert response.json()["moneda"] == dolar.sk
+    assert response.json()["serie"][0]["saldo"] == round(
+        entrada.importe / dolar.cotizacion_al(fecha, compra=True), 2
+    )
+
+
+def test_devuelve_serie_de_capital_del_titular_indicado(
+        client, url, peso, titular, cuenta, cuenta_ajena, entrada, entrada_cuenta_ajena, fecha):
+    response = client.get(url, {"desde": str(fecha), "hasta": str(fecha), "titular": titular.sk})
+    assert response.json()["serie"] == [{"fecha": str(fecha), "saldo": entrada.importe}]
+
+
+def test_con_frecuencia_mensual_devuelve_serie_mensual(client, url, peso, cuenta, entrada):
+    response = client.get(url, {"desde": "2004-04-01", "hasta": "2004-06-15", "frecuencia": "mensual"})
+    assert [punto["fecha"] for punto in response.json()["serie"]] == ["2004-04-30", "2004-05-31", "2004-06-15"]
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"desde": "fecha"},
+    {"desde": "2004-04-04", "hasta": "2004-04-01"},
+    {"desde": "2004-04-04", "frecuencia": "anual"},
+])
+def test_devuelve_error_400_con_parametros_erroneos(client, url, peso, params):
+    assert client.get(url, params).status_code == 400
+
+
+def test_devuelve_404_si_la_moneda_no_existe(client, url, peso):
+    assert client.get(url, {"desde": "2004-04-04", "moneda": "xx"}).status_code == 404
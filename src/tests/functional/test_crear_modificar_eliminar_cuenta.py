@@ -67,7 +67,7 @@ def test_crear_o_modificar_cuenta_desde_pagina_posterior_redirige_a_esa_pagina_c
     if destino == "id_link_cta_mod_":
         destino = f"{destino}{cuenta.sk}"
 
-    browser.ir_a_pag(url_origen + "?page=2")
+    browser.ir_a_pag(url_origen + f"?hasta={dias[-8].fecha}")
     browser.pulsar(destino)
     browser.completar_form(
         nombre="cuenta nueva",
@@ -76,7 +76,7 @@ def test_crear_o_modificar_cuenta_desde_pagina_posterior_redirige_a_esa_pagina_c
         fecha_creacion=fecha,
     )
 
-    browser.assert_url(url_final + "?page=2")
+    browser.assert_url(url_final + f"?hasta={dias[-8].fecha}")
 
 
 def test_crear_cuenta_en_otra_moneda(browser, titular, fecha, dolar):
@@ -145,11 +145,11 @@ def test_eliminar_cuenta_desde_pagina_posterior_redirige_a_esa_pagina_con_el_ult
     movimiento = dias[-8].movimientos.last()
     url_destino = movimiento.get_url(ente)
 
-    browser.ir_a_pag(url_origen + "?page=2")
+    browser.ir_a_pag(url_origen + f"?hasta={dias[-8].fecha}")
     browser.pulsar(f"id_link_cta_elim_{cuenta_3.sk}")
     browser.pulsar("id_btn_confirm")
 
-    browser.assert_url(url_destino + "?page=2")
+    browser.assert_url(url_destino + f"?hasta={dias[-8].fecha}")
 
 def test_eliminar_cuenta_con_movimientos(browser, cuenta_con_saldo):
     """ Dada una cuenta con saldo cero pero con movimientos,
@@ -561,10 +561,10 @@ def test_crear_o_modificar_movimiento_desde_pagina_anterior_redirige_a_esa_pagin
         destino = destino.replace("xxx", mov.sk)
         valores.pop("fecha")
 
-    browser.ir_a_pag(url_origen + "?page=2")
+    browser.ir_a_pag(url_origen + f"?hasta={dias[-8].fecha}")
     browser.pulsar(destino, By.CSS_SELECTOR)
     browser.completar_form(**valores)
-    browser.assert_url(url_final + "?page=2")
+    browser.assert_url(url_final + f"?hasta={dias[-8].fecha}")
 
 def test_eliminar_movimiento(browser, entrada, salida):
     # Cuando se elimina un movimiento desaparece de la página principal
@@ -609,8 +609,8 @@ def test_eliminar_movimiento_desde_pagina_posterior_redirige_a_esa_pagina_con_el
     url_destino = movimiento.get_url(ente)
     mov_a_eliminar = dias[0].movimientos.first()
 
-    browser.ir_a_pag(url_origen + "?page=2")
+    browser.ir_a_pag(url_origen + f"?hasta={dias[-8].fecha}")
     browser.pulsar(f"#id_row_mov_{mov_a_eliminar.sk} .class_link_elim_mov", By.CSS_SELECTOR)
     browser.pulsar("id_btn_confirm")
 
-    browser.assert_url(url_destino + "?page=2")
+    browser.assert_url(url_destino + f"?hasta={dias[-8].fecha}")
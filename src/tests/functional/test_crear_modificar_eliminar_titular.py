@@ -72,7 +72,7 @@ def test_crear_o_modificar_titular_desde_pagina_posterior_redirige_a_esa_pagina_
     if destino == "id_link_tit_mod_":
         destino = f"{destino}{titular.sk}"
 
-    browser.ir_a_pag(url_origen + "?page=2")
+    browser.ir_a_pag(url_origen + f"?hasta={dias[-8].fecha}")
     browser.pulsar(destino)
     browser.completar_form(
         nombre="titular nuevo",
@@ -80,7 +80,7 @@ def test_crear_o_modificar_titular_desde_pagina_posterior_redirige_a_esa_pagina_
         fecha_alta=fecha,
     )
 
-    browser.assert_url(url_final + "?page=2")
+    browser.assert_url(url_final + f"?hasta={dias[-8].fecha}")
 
 
 def test_eliminar_titular(browser, titular, otro_titular):
@@ -117,8 +117,8 @@ def test_eliminar_cuenta_desde_pagina_posterior_redirige_a_esa_pagina_con_el_ult
     movimiento = dias[-8].movimientos.last()
     url_destino = movimiento.get_url(ente)
 
-    browser.ir_a_pag(url_origen + "?page=2")
+    browser.ir_a_pag(url_origen + f"?hasta={dias[-8].fecha}")
     browser.pulsar(f"id_link_tit_elim_{titular_gordo.sk}")
     browser.pulsar("id_btn_confirm")
 
-    browser.assert_url(url_destino + "?page=2")
+    browser.assert_url(url_destino + f"?hasta={dias[-8].fecha}")
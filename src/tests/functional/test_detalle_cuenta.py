@@ -7,7 +7,7 @@ from selenium.webdriver.common.by import By
 
 from diario.models import CuentaAcumulativa, CuentaInteractiva, Dia, Movimiento
 from tests.functional.helpers import texto_en_hijos_respectivos
-from utils.helpers_tests import fecha2page
+from utils.helpers_tests import fecha2hasta
 from utils.numeros import float_format
 from utils.tiempo import str2date
 
@@ -308,7 +308,7 @@ def test_detalle_de_cuenta_acumulativa(
     # Y vemos que en el saldo general de la página aparece el saldo histórico
     # de la cuenta acumulativa al momento del movimiento
     movimiento = cuenta_de_dos_titulares.movs().order_by(
-        '-dia', 'orden_dia')[1]
+        '-dia', '_orden_dia')[1]
     assert movimiento.concepto == movimientos[1].encontrar_elemento(
         "class_td_concepto",
         By.CLASS_NAME
@@ -430,7 +430,7 @@ def test_busqueda_de_fecha_en_detalle_de_cuenta(browser, cuenta, cuenta_2, mucho
     # con la fecha ingresada. El último movimiento del titular del día de la fecha
     # aparece seleccionado.
     mov = dia.movimientos.last()
-    browser.assert_url(cuenta.get_url_with_mov(mov) + f"?page={fecha2page(cuenta.dias(), dia.fecha)}&redirected=1")
+    browser.assert_url(cuenta.get_url_with_mov(mov) + f"?hasta={fecha2hasta(cuenta.dias(), dia.fecha)}")
 
     # En la página se muestran solamente los días con movimientos de la cuenta.
     # No se muestran los demás días.
@@ -459,5 +459,5 @@ def test_busqueda_de_fecha_en_detalle_de_cuenta(browser, cuenta, cuenta_2, mucho
     browser.completar_form(boton="id_btn_buscar_dia_init", input_dia_init=dia_no_cuenta.fecha)
     browser.assert_url(
         cuenta.get_url_with_mov(mov_cuenta_dia_anterior) +
-        f"?page={fecha2page(cuenta.dias(), dia_anterior_cuenta.fecha)}&redirected=1"
+        f"?hasta={fecha2hasta(cuenta.dias(), dia_anterior_cuenta.fecha)}"
     )
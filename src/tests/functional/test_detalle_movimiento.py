@@ -1,12 +1,12 @@
+from datetime import timedelta
 from urllib.parse import urlparse
 
 import pytest
 
 from django.urls import reverse
 
-from diario.models import Cuenta, Titular, Movimiento
+from diario.models import Cuenta, Dia, Titular, Movimiento
 from diario.utils.utils_saldo import saldo_general_historico
-from utils.helpers_tests import fecha2page
 from utils.numeros import float_format
 
 
@@ -120,8 +120,10 @@ def test_detalle_movimiento_en_paginas_anteriores(
         browser, muchos_dias, origen_template, fixt_args, destino_template, request):
     args = [request.getfixturevalue(x).sk for x in fixt_args]
     origen = reverse(origen_template, args=args)
+    ente = request.getfixturevalue(fixt_args[0]) if fixt_args else None
+    hasta = list(ente.dias() if ente else Dia.con_movimientos())[-8].fecha
     # Cuando estando en una página anterior cliqueamos en un movimiento...
-    browser.ir_a_pag(origen + "?page=2")
+    browser.ir_a_pag(origen + f"?hasta={hasta}")
 
     movimientos = browser.encontrar_elementos("class_row_mov")
     assert "mov_selected" not in movimientos[1].get_attribute("class")
@@ -134,7 +136,7 @@ def test_detalle_movimiento_en_paginas_anteriores(
     links_movimiento[1].click()
 
     # ...permanecemos en la página en la que estábamos...
-    browser.assert_url(f"{destino}?page=2")
+    browser.assert_url(f"{destino}?hasta={hasta}")
 
     # ...y el movimiento aparece resaltado.
     movimientos = browser.encontrar_elementos("class_row_mov")
@@ -149,7 +151,7 @@ def test_detalle_movimiento_en_paginas_anteriores(
     viewname = "movimiento" if origen_template == "home" else f"{origen_template}_movimiento"
     destino = reverse(viewname, args=args + [pk])
 
-    browser.assert_url(f"{destino}?page=1")
+    browser.assert_url(f"{destino}?desde={hasta + timedelta(1)}")
 
 
 @pytest.mark.parametrize("origen", [None, "cuenta", "titular"])
@@ -170,7 +172,7 @@ def test_detalle_movimiento_en_fechas_anteriores(browser, muchos_dias, fecha, or
     links_movimiento[1].click()
 
     # ...permanecemos en la página en la que estábamos...
-    browser.assert_url(f"{url_destino}?page={fecha2page(dias, fecha)}")
+    browser.assert_url(f"{url_destino}?hasta={dias.filter(fecha__lte=fecha).last().fecha}")
 
     # ...y el movimiento aparece resaltado...
     movimientos = browser.encontrar_elementos("class_row_mov")
@@ -2,7 +2,7 @@ import pytest
 from django.urls import reverse
 from selenium.webdriver.common.by import By
 
-from utils.helpers_tests import fecha2page
+from utils.helpers_tests import fecha2hasta
 from utils.numeros import float_format
 from utils.tiempo import str2date
 from .helpers import texto_en_hijos_respectivos
@@ -196,7 +196,7 @@ def test_busqueda_de_fecha_en_detalle_de_titular(browser, titular, cuenta_ajena,
     # aparece seleccionado.
     mov = dia.movimientos.last()
     browser.assert_url(
-        titular.get_url_with_mov(mov) + f"?page={fecha2page(titular.dias(), dia.fecha)}&redirected=1"
+        titular.get_url_with_mov(mov) + f"?hasta={fecha2hasta(titular.dias(), dia.fecha)}"
     )
 
     # En la página se muestran solamente los días con movimientos de la cuenta.
@@ -226,5 +226,5 @@ def test_busqueda_de_fecha_en_detalle_de_titular(browser, titular, cuenta_ajena,
     browser.completar_form(boton="id_btn_buscar_dia_init", input_dia_init=dia_no_titular.fecha)
     browser.assert_url(
         titular.get_url_with_mov(mov_titular_dia_anterior) +
-        f"?page={fecha2page(titular.dias(), dia_anterior_titular.fecha)}&redirected=1"
+        f"?hasta={fecha2hasta(titular.dias(), dia_anterior_titular.fecha)}"
     )
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
 from datetime import date, timedelta
-from urllib.parse import urlparse
 
 from django.urls import reverse
 from selenium.webdriver.common.by import By
 
 from diario.models import Dia
-from utils.helpers_tests import fecha2page
+from utils.helpers_tests import fecha2hasta
 from utils.tiempo import str2date
 from .helpers import texto_en_hijos_respectivos
 from utils.numeros import float_format
@@ -102,11 +101,11 @@ def test_home(
     link_posteriores = navigator.encontrar_elemento("id_link_anterior_init")
     assert link_posteriores.get_attribute("aria-disabled") == "false"
 
-    # Si cliqueamos en el link que dice "Primeros días", veremos solamente los días anteriores restantes,
-    # que pueden ser menos de 7, y el último día de la página será el primer día con movimientos.
+    # Si cliqueamos en el link que dice "Primeros días", veremos los 7 primeros días
+    # con movimientos, y el último día de la página será el primer día con movimientos.
     navigator.encontrar_elemento("id_link_ultima_init").click()
     divs_dia = browser.encontrar_elementos("class_div_dia")
-    assert len(divs_dia) == Dia.con_movimientos().count() % 7
+    assert len(divs_dia) == min(7, Dia.con_movimientos().count())
     primer_dia_pag = divs_dia[-1].encontrar_elemento("class_span_fecha_dia", By.CLASS_NAME).text[-10:]
     assert str2date(primer_dia_pag) == Dia.con_movimientos().first().fecha
 
@@ -132,27 +131,10 @@ def test_home(
     ultimo_dia_pag = divs_dia[0].encontrar_elemento("class_span_fecha_dia", By.CLASS_NAME).text[-10:]
     assert str2date(ultimo_dia_pag) == Dia.con_movimientos().last().fecha
 
-    # La barra de navegación incluye un número por cada página de 7 días.
+    # La barra de navegación de días no incluye números de página: se navega
+    # por fecha.
     navigator = browser.encontrar_elemento("id_div_navigator_init")
-    nros_pagina = navigator.encontrar_elementos("class_li_pagina_nro")
-    assert len(nros_pagina) == (Dia.con_movimientos().count() // 7) + 1
-
-    # El número de página que coincide con la página activa se muestra destacado
-    # entre los otros números de página, y su link está desactivado.
-    pag_actual = nros_pagina[0]
-    assert "active" in pag_actual.get_attribute("class")
-    link_pag_actual = pag_actual.encontrar_elemento("class_link_pagina", By.CLASS_NAME)
-    assert link_pag_actual.get_attribute("aria-disabled") == "true"
-    for np in nros_pagina[1:]:
-        assert "active" not in np.get_attribute("class")
-        link_pag = np.encontrar_elemento("class_link_pagina", By.CLASS_NAME)
-        assert link_pag.get_attribute("aria-disabled") == "false"
-
-    # Si cliqueamos en un número de página, seremos dirigidos a la página con los
-    # 7 (o menos si es la última) días correspondientes.
-    nro_pag = nros_pagina[2].text
-    nros_pagina[2].click()
-    assert urlparse(browser.current_url).query == f"page={nro_pag}"
+    assert len(navigator.encontrar_elementos("class_li_pagina_nro")) == 0
 
     # Al final de la barra de navegación por páginas hay un campo en el cual
     # podemos seleccionar un día y seremos dirigidos a la página que contenga
@@ -164,7 +146,7 @@ def test_home(
     assert fecha in fechas
     dia = Dia.tomar(fecha=fecha)
     mov = dia.movimientos.last()
-    browser.assert_url(mov.get_absolute_url() + f"?page={fecha2page(Dia.todes(), fecha)}&redirected=1")
+    browser.assert_url(mov.get_absolute_url() + f"?hasta={fecha2hasta(Dia.con_movimientos(), fecha)}")
 
     # Si seleccionamos un día inexistente, seremos llevados a la página que contengan
     # los días aledaños al seleccionado.
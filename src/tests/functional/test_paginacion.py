@@ -36,11 +36,11 @@ def test_navegacion_paginas(browser, muchos_dias):
     link_posteriores = navigator.encontrar_elemento("id_link_anterior_init")
     assert link_posteriores.get_attribute("aria-disabled") == "false"
 
-    # Si cliqueamos en el link que dice "Primeros días", veremos solamente los días anteriores restantes,
-    # que pueden ser menos de 7, y el último día de la página será el primer día con movimientos.
+    # Si cliqueamos en el link que dice "Primeros días", veremos los 7 primeros días
+    # con movimientos, y el último día de la página será el primer día con movimientos.
     navigator.encontrar_elemento("id_link_ultima_init").click()
     divs_dia = browser.encontrar_elementos("class_div_dia")
-    assert len(divs_dia) == Dia.con_movimientos().count() % 7
+    assert len(divs_dia) == min(7, Dia.con_movimientos().count())
     primer_dia_pag = divs_dia[-1].encontrar_elemento("class_span_fecha_dia", By.CLASS_NAME).text[-10:]
     assert str2date(primer_dia_pag) == Dia.con_movimientos().first().fecha
 
@@ -66,27 +66,12 @@ def test_navegacion_paginas(browser, muchos_dias):
     ultimo_dia_pag = divs_dia[0].encontrar_elemento("class_span_fecha_dia", By.CLASS_NAME).text[-10:]
     assert str2date(ultimo_dia_pag) == Dia.con_movimientos().last().fecha
 
-    # La barra de navegación incluye un número por cada página de 7 días.
+    # La barra de navegación de días no incluye números de página: se navega
+    # por fecha.
     navigator = browser.encontrar_elemento("id_div_navigator_init")
-    nros_pagina = navigator.encontrar_elementos("class_li_pagina_nro")
-    assert len(nros_pagina) == (Dia.con_movimientos().count() // 7) + 1
-
-    # El número de página que coincide con la página activa se muestra destacado
-    # entre los otros números de página, y su link está desactivado.
-    pag_actual = nros_pagina[0]
-    assert "active" in pag_actual.get_attribute("class")
-    link_pag_actual = pag_actual.encontrar_elemento("class_link_pagina", By.CLASS_NAME)
-    assert link_pag_actual.get_attribute("aria-disabled") == "true"
-    for np in nros_pagina[1:]:
-        assert "active" not in np.get_attribute("class")
-        link_pag = np.encontrar_elemento("class_link_pagina", By.CLASS_NAME)
-        assert link_pag.get_attribute("aria-disabled") == "false"
-
-    # Si cliqueamos en un número de página, seremos dirigidos a la página con los
-    # 7 (o menos si es la última) días correspondientes.
-    nro_pag = nros_pagina[2].text
-    nros_pagina[2].click()
-    assert urlparse(browser.current_url).query == f"page={nro_pag}"
+    assert len(navigator.encontrar_elementos("class_li_pagina_nro")) == 0
+    navigator.encontrar_elemento("id_link_siguiente_init").click()
+    assert urlparse(browser.current_url).query.startswith("hasta=")
 
 
 @pytest.mark.parametrize("origen, fixt_dias, fecha_en_la_misma_pag", [
@@ -148,11 +133,12 @@ def test_busqueda_fecha(browser, origen, fixt_dias, fecha, fecha_tardia, fecha_e
     # Lo mismo si lo hacemos con un titular seleccionado.
 
 
-@pytest.mark.parametrize("page", ["", "?page=2"])
-def test_saldo_diario_en_paginas(browser, mas_de_7_dias, page):
+@pytest.mark.parametrize("pagina_siguiente", [False, True])
+def test_saldo_diario_en_paginas(browser, mas_de_7_dias, pagina_siguiente):
     # Si vamos a una página posterior a la primera, cada día muestra el saldo
     # general diario
-    browser.ir_a_pag(reverse("home") + page)
+    cursor = f"?hasta={list(mas_de_7_dias)[-8].fecha}" if pagina_siguiente else ""
+    browser.ir_a_pag(reverse("home") + cursor)
     dias_pag = browser.encontrar_elementos("class_titulo_dia")
     for dia_pag in dias_pag:
         fecha = str2date(dia_pag.encontrar_elemento("class_span_fecha_dia", By.CLASS_NAME).text[-10:])
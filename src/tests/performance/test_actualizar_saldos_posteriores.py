@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from diario.models import Movimiento, SaldoDiario
+from utils.helpers_tests import crear_historia, queries_a_tabla
+
+
+class TestActualizarPosterioresPerformance:
+    @pytest.mark.parametrize("cantidad_dias", [2, 25])
+    def test_hace_una_sola_query_a_saldo_diario_sin_importar_cantidad_de_saldos_posteriores(
+            self, cuenta, entrada, fecha, cantidad_dias):
+        crear_historia(cuenta, fecha, cantidad_dias)
+        saldo_diario = SaldoDiario.tomar(cuenta=cuenta, dia=entrada.dia)
+
+        with CaptureQueriesContext(connection) as ctx:
+            saldo_diario._actualizar_posteriores(15)
+
+        assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 1
+
+    def test_movimiento_retroactivo_no_multiplica_queries_con_cantidad_de_saldos_posteriores(
+            self, cuenta, fecha):
+        crear_historia(cuenta, fecha, 3)
+        with CaptureQueriesContext(connection) as ctx_corta:
+            Movimiento.crear(concepto="Retroactivo", importe=5, cta_entrada=cuenta, fecha=fecha)
+
+        crear_historia(cuenta, fecha + timedelta(3), 25)
+        with CaptureQueriesContext(connection) as ctx_larga:
+            Movimiento.crear(
+                concepto="Retroactivo 2", importe=5, cta_entrada=cuenta, fecha=fecha - timedelta(1)
+            )
+
+        assert \
+            queries_a_tabla(ctx_larga.captured_queries, "diario_saldodiario") == \
+            queries_a_tabla(ctx_corta.captured_queries, "diario_saldodiario")
+
+    def test_mantiene_redondeo_a_dos_decimales(self, cuenta, entrada, fecha):
+        crear_historia(cuenta, fecha, 3)
+        SaldoDiario.filtro(cuenta=cuenta, fecha__gt=entrada.fecha).update(_importe=0.1)
+        Movimiento.filtro(cta_entrada=cuenta, _fecha__gt=entrada.fecha).update(saldo_cta_entrada=0.1)
+        saldo_diario = SaldoDiario.tomar(cuenta=cuenta, dia=entrada.dia)
+        assert 0.1 + 0.2 != 0.3
+
+        saldo_diario._actualizar_posteriores(0.2)
+
+        assert list(
+            SaldoDiario.filtro(cuenta=cuenta, fecha__gt=entrada.fecha).values_list("_importe", flat=True)
+        ) == [0.3] * 3
+        assert list(
+            Movimiento.filtro(cta_entrada=cuenta, _fecha__gt=entrada.fecha).values_list("saldo_cta_entrada", flat=True)
+        ) == [0.3] * 3
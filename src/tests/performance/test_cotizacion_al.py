@@ -0,0 +1,27 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from diario.models import Movimiento
+from utils.helpers_tests import queries_a_tabla
+
+
+class TestCotizacionAlPerformance:
+    def test_saldos_en_otra_moneda_en_varios_dias_hacen_una_sola_query_de_cotizacion(
+            self, cuenta_con_saldo_en_dolares, peso, dolar, cotizacion_dolar, dia, dia_posterior, dia_tardio):
+        with CaptureQueriesContext(connection) as ctx:
+            for d in dia, dia_posterior, dia_tardio:
+                cuenta_con_saldo_en_dolares.saldo(dia=d, moneda=peso)
+
+        assert queries_a_tabla(ctx.captured_queries, "diario_cotizacion") == 1
+
+
+class TestCotizacionActualPerformance:
+    def test_importes_de_movimientos_en_otras_monedas_hacen_una_sola_query_de_cotizacion(
+            self, entrada, salida, mov_distintas_monedas_en_moneda_cta_salida, peso, dolar, euro):
+        movimientos = list(Movimiento.todes().select_related("moneda"))
+        with CaptureQueriesContext(connection) as ctx:
+            for mov in movimientos:
+                for moneda in peso, dolar, euro:
+                    mov.importe_en(moneda)
+
+        assert queries_a_tabla(ctx.captured_queries, "diario_cotizacion") == 1
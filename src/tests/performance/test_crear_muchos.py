@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from diario.models import Movimiento
+
+
+def datos_de_prueba(cuenta, cuenta_2, fecha, cantidad, dias=5):
+    return [
+        {
+            "concepto": f"Mov {x}",
+            "importe": x + 1,
+            "cta_entrada": cuenta if x % 2 else cuenta_2,
+            "cta_salida": cuenta_2 if x % 2 else None,
+            "fecha": fecha + timedelta(x % dias),
+        } for x in range(cantidad)
+    ]
+
+
+class TestCrearMuchosPerformance:
+    def test_cantidad_de_queries_no_depende_de_la_cantidad_de_movimientos(self, cuenta, cuenta_2, fecha):
+        with CaptureQueriesContext(connection) as ctx_pocos:
+            Movimiento.crear_muchos(datos_de_prueba(cuenta, cuenta_2, fecha, 10))
+        with CaptureQueriesContext(connection) as ctx_muchos:
+            Movimiento.crear_muchos(datos_de_prueba(cuenta, cuenta_2, fecha + timedelta(100), 200))
+
+        assert len(ctx_muchos.captured_queries) == len(ctx_pocos.captured_queries)
+
+    def test_hace_menos_queries_que_crear_de_a_uno(self, cuenta, cuenta_2, fecha, fecha_tardia):
+        with CaptureQueriesContext(connection) as ctx_de_a_uno:
+            for kwargs in datos_de_prueba(cuenta, cuenta_2, fecha, 100):
+                Movimiento.crear(**kwargs)
+        with CaptureQueriesContext(connection) as ctx_en_bloque:
+            Movimiento.crear_muchos(datos_de_prueba(cuenta, cuenta_2, fecha_tardia, 100))
+
+        # Menos queries en total que las de crear 5 movimientos de a uno
+        assert len(ctx_en_bloque.captured_queries) * 20 < len(ctx_de_a_uno.captured_queries)
@@ -0,0 +1,95 @@
+from random import Random
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from diario.models import Cotizacion, SaldoDiario
+from diario.utils.utils_matriz import MatrizCotizaciones
+from diario.utils.utils_saldo import precalcular_saldos_cuentas
+from utils.helpers_tests import queries_a_tabla
+from utils.numeros import float_format
+
+
+CUENTAS = 200
+MONEDAS = 5
+DIAS = 60
+
+
+def datos_de_prueba():
+    rnd = Random(1)
+    importes = {
+        id_moneda: [
+            (1.0, 1.0) if id_moneda == 0 else (rnd.uniform(100, 200), rnd.uniform(200, 300))
+            for _ in range(DIAS)
+        ] for id_moneda in range(MONEDAS)
+    }
+    saldos = {id_cuenta: [rnd.uniform(-1000, 1000) for _ in range(DIAS)] for id_cuenta in range(CUENTAS)}
+    monedas_cuentas = {id_cuenta: id_cuenta % MONEDAS for id_cuenta in range(CUENTAS)}
+    return importes, saldos, monedas_cuentas
+
+
+def por_diccionarios(importes, saldos, monedas_cuentas):
+    """ Camino anterior: un diccionario de factores por día (como
+        Cotizacion.indexar) y una multiplicación por cuenta, moneda y día.
+    """
+    resultado = dict()
+    for dia in range(DIAS):
+        factores = dict()
+        for id_moneda_origen in set(monedas_cuentas.values()):
+            for id_moneda_destino in range(MONEDAS):
+                if id_moneda_origen == id_moneda_destino:
+                    factores[(id_moneda_origen, id_moneda_destino)] = 1.0
+                else:
+                    factores[(id_moneda_origen, id_moneda_destino)] = \
+                        importes[id_moneda_origen][dia][1] / importes[id_moneda_destino][dia][0]
+        for id_cuenta, fila in saldos.items():
+            for id_moneda in range(MONEDAS):
+                resultado.setdefault((id_cuenta, id_moneda), []).append(
+                    round(fila[dia] * factores.get((monedas_cuentas[id_cuenta], id_moneda), 1.0), 2)
+                )
+    return resultado
+
+
+def por_matriz(importes, saldos, monedas_cuentas):
+    return MatrizCotizaciones(importes).convertir(saldos, monedas_cuentas, range(MONEDAS))
+
+
+class TestMatrizCotizacionesContraDiccionarios:
+    def test_da_el_mismo_resultado_que_el_camino_por_diccionarios(self):
+        datos = datos_de_prueba()
+        assert por_matriz(*datos) == por_diccionarios(*datos)
+
+    def test_calcula_los_factores_una_vez_por_par_de_monedas(self):
+        importes, saldos, monedas_cuentas = datos_de_prueba()
+        matriz = MatrizCotizaciones(importes)
+        matriz.convertir(saldos, monedas_cuentas, range(MONEDAS))
+        assert len(matriz._factores) == MONEDAS * MONEDAS
+
+
+class TestMatrizCotizacionesEnPrecalcularSaldosCuentas:
+    def test_da_el_mismo_resultado_que_el_camino_por_diccionarios_con_cuentas_en_distintas_monedas(
+            self, cuenta_con_saldo, cuenta_con_saldo_en_dolares, cuenta_con_saldo_en_euros,
+            peso, dolar, euro, cotizacion_posterior_dolar, cotizacion_posterior_euro, dia_posterior):
+        cuentas = [cuenta_con_saldo, cuenta_con_saldo_en_dolares, cuenta_con_saldo_en_euros]
+        monedas = [peso, dolar, euro]
+        cotizaciones = Cotizacion.indexar(cuentas, monedas, dia_posterior.fecha)
+        saldos = SaldoDiario.indexar_por_dia(cuentas, dia_posterior)
+
+        assert precalcular_saldos_cuentas(cuentas, monedas, dia=dia_posterior) == {
+            cuenta.pk: {
+                moneda.sk: float_format(
+                    round(saldos.get(cuenta.pk, 0) * cotizaciones.get((cuenta.moneda_id, moneda.pk), 1.0), 2)
+                ) for moneda in monedas
+            } for cuenta in cuentas
+        }
+
+    def test_carga_las_cotizaciones_de_todas_las_monedas_en_una_sola_query(
+            self, cuenta_con_saldo, cuenta_con_saldo_en_dolares, cuenta_con_saldo_en_euros,
+            peso, dolar, euro, cotizacion_posterior_dolar, cotizacion_posterior_euro, dia_posterior):
+        with CaptureQueriesContext(connection) as ctx:
+            precalcular_saldos_cuentas(
+                [cuenta_con_saldo, cuenta_con_saldo_en_dolares, cuenta_con_saldo_en_euros],
+                [peso, dolar, euro],
+                dia=dia_posterior
+            )
+        assert queries_a_tabla(ctx.captured_queries, "diario_cotizacion") == 1
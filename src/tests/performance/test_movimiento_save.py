@@ -0,0 +1,110 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from diario.models import Movimiento
+from utils.helpers_tests import crear_historia
+
+
+def lecturas_del_movimiento(queries: list[dict], mov: Movimiento) -> int:
+    """ Cantidad de queries que leen la fila del movimiento por su pk """
+    return sum(1 for q in queries if f'WHERE "diario_movimiento"."id" = {mov.pk} ' in q["sql"])
+
+
+class TestSaveMovimientoExistentePerformance:
+    @pytest.mark.parametrize("campo, valor", [("concepto", "Otro concepto"), ("importe", 250)])
+    def test_no_vuelve_a_leer_el_movimiento_de_la_base_de_datos(self, entrada, campo, valor):
+        setattr(entrada, campo, valor)
+        with CaptureQueriesContext(connection) as ctx:
+            entrada.clean_save()
+
+        assert lecturas_del_movimiento(ctx.captured_queries, entrada) == 0
+
+    def test_cambia_campo_no_consulta_la_base_de_datos(self, entrada, cuenta_2):
+        entrada.cta_entrada = cuenta_2
+        with CaptureQueriesContext(connection) as ctx:
+            entrada.cambia_campo("concepto", "_importe", "dia", "moneda", "cta_entrada", "cta_salida")
+
+        assert len(ctx.captured_queries) == 0
+
+    @pytest.mark.parametrize("campo, valor", [("concepto", "Otro concepto"), ("importe", 250)])
+    def test_cantidad_de_queries_no_depende_de_movimientos_anteriores(
+            self, cuenta, dia, campo, valor):
+        cantidades = []
+        for cantidad_historia in 2, 40:
+            crear_historia(cuenta, dia.fecha, cantidad_historia, hacia_atras=True)
+            mov = Movimiento.crear(concepto="Entrada", importe=100, cta_entrada=cuenta, dia=dia)
+            setattr(mov, campo, valor)
+            with CaptureQueriesContext(connection) as ctx:
+                mov.clean_save()
+            cantidades.append(len(ctx.captured_queries))
+            mov.delete()
+
+        assert cantidades[0] == cantidades[1]
+
+
+class TestSaveMovimientoNuevoPerformance:
+    def test_cantidad_de_queries_no_depende_de_movimientos_anteriores(self, cuenta, dia):
+        cantidades = []
+        for cantidad_historia in 2, 40:
+            crear_historia(cuenta, dia.fecha, cantidad_historia, hacia_atras=True)
+            with CaptureQueriesContext(connection) as ctx:
+                mov = Movimiento.crear(concepto="Entrada", importe=100, cta_entrada=cuenta, dia=dia)
+            cantidades.append(len(ctx.captured_queries))
+            mov.delete()
+
+        assert cantidades[0] == cantidades[1]
+
+
+class TestPresupuestoDeQueriesMovimiento:
+    def test_crear_entrada_en_dia_sin_saldo_de_la_cuenta(self, cuenta, dia, django_assert_num_queries):
+        mov = Movimiento(concepto="Entrada", importe=100, cta_entrada=cuenta, moneda=cuenta.moneda, dia=dia)
+        with django_assert_num_queries(31):
+            mov.save()
+
+    def test_modificar_concepto(self, entrada, django_assert_num_queries):
+        entrada.concepto = "Otro concepto"
+        with django_assert_num_queries(4):
+            entrada.save()
+
+
+class TestIntercalarMovimientoPerformance:
+    def test_cantidad_de_queries_no_depende_de_la_cantidad_de_movimientos_del_dia(self, cuenta, cuenta_2, dia):
+        cantidades = []
+        for cantidad_dia in 3, 40:
+            Movimiento.crear_muchos([
+                {"concepto": f"Mov {x}", "importe": 10, "cta_entrada": cuenta_2, "dia": dia}
+                for x in range(cantidad_dia - Movimiento.filtro(dia=dia).count())
+            ])
+            with CaptureQueriesContext(connection) as ctx:
+                mov = Movimiento.crear(concepto="Intercalado", importe=100, cta_entrada=cuenta, dia=dia, orden_dia=1)
+            cantidades.append(len(ctx.captured_queries))
+            mov.delete()
+
+        assert cantidades[0] == cantidades[1]
+
+    def test_no_modifica_el_orden_de_los_demas_movimientos_del_dia(self, cuenta, cuenta_2, dia):
+        Movimiento.crear_muchos([
+            {"concepto": f"Mov {x}", "importe": 10, "cta_entrada": cuenta_2, "dia": dia} for x in range(20)
+        ])
+        with CaptureQueriesContext(connection) as ctx:
+            Movimiento.crear(concepto="Intercalado", importe=100, cta_entrada=cuenta, dia=dia, orden_dia=1)
+
+        assert not any(
+            q["sql"].startswith('UPDATE "diario_movimiento"') and '"_orden_dia"' in q["sql"]
+            for q in ctx.captured_queries
+        )
+
+
+class TestSkMovimientoPerformance:
+    def test_no_actualiza_sk_despues_de_insertar_el_movimiento(self, entrada, salida, cuenta, dia):
+        with CaptureQueriesContext(connection) as ctx:
+            Movimiento.crear(concepto="Nuevo", importe=100, cta_entrada=cuenta, dia=dia)
+
+        assert not any(q["sql"].startswith('UPDATE "diario_movimiento" SET "sk"') for q in ctx.captured_queries)
+
+    def test_no_busca_sk_libres_entre_los_movimientos_existentes(self, entrada, salida, cuenta, dia):
+        with CaptureQueriesContext(connection) as ctx:
+            Movimiento.crear(concepto="Nuevo", importe=100, cta_entrada=cuenta, dia=dia)
+
+        assert not any('WHERE "diario_movimiento"."sk"' in q["sql"] for q in ctx.captured_queries)
@@ -1,11 +1,11 @@
+from datetime import timedelta
+
 from django.db import connection
 from django.test.utils import CaptureQueriesContext
 
+from diario.models import Movimiento, SaldoDiario
 from diario.utils.utils_saldo import precalcular_saldos_cuentas
-
-
-def queries_a_tabla(queries, tabla):
-    return sum(1 for q in queries if tabla in q["sql"])
+from utils.helpers_tests import queries_a_tabla
 
 
 class TestPrecalcularSaldosCuentasPorDiaPerformance:
@@ -25,12 +25,12 @@ class TestPrecalcularSaldosCuentasPorDiaPerformance:
 
         assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 1
 
-    def test_con_multiples_cuentas_sin_saldo_en_dia_exacto_hace_dos_queries_a_saldo_diario(
+    def test_con_multiples_cuentas_sin_saldo_en_dia_exacto_hace_una_sola_query_a_saldo_diario(
             self, cuenta, cuenta_2, entrada, entrada_otra_cuenta, dia_posterior, peso):
         with CaptureQueriesContext(connection) as ctx:
             precalcular_saldos_cuentas([cuenta, cuenta_2], [peso], dia=dia_posterior)
 
-        assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 2
+        assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 1
 
     def test_numero_de_queries_no_crece_con_cantidad_de_cuentas(
             self, cuenta, cuenta_2, cuenta_3, entrada, entrada_otra_cuenta,
@@ -41,36 +41,51 @@ class TestPrecalcularSaldosCuentasPorDiaPerformance:
                 [peso],
                 dia=dia_posterior
             )
-        assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 2
+        assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 1
+
+    def test_trae_una_sola_fila_de_saldo_diario_por_cuenta(
+            self, mocker, cuenta, cuenta_2, fecha, dia_tardio, peso):
+        for x in range(1, 21):
+            Movimiento.crear(concepto=f"Entrada {x}", importe=x, cta_entrada=cuenta, fecha=fecha + timedelta(x))
+            Movimiento.crear(concepto=f"Salida {x}", importe=x, cta_salida=cuenta_2, fecha=fecha + timedelta(x))
+        spy = mocker.spy(SaldoDiario, "from_db")
+
+        precalcular_saldos_cuentas([cuenta, cuenta_2], [peso], dia=dia_tardio)
+
+        assert spy.call_count == 2
 
 
 class TestPrecalcularSaldosCuentasPorMovimientoPerformance:
 
-    def test_con_una_cuenta_hace_una_sola_query_a_saldo_diario(
+    def test_con_una_cuenta_toma_saldos_de_movimientos_en_una_sola_query(
             self, cuenta, entrada, salida, peso):
         with CaptureQueriesContext(connection) as ctx:
             precalcular_saldos_cuentas([cuenta], [peso], movimiento=entrada)
-        assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 1
+        assert queries_a_tabla(ctx.captured_queries, "diario_movimiento") == 1
+        assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 0
 
-    def test_con_multiples_cuentas_hace_una_sola_query_a_saldo_diario(
+    def test_con_multiples_cuentas_toma_saldos_de_movimientos_en_una_sola_query(
             self, cuenta, cuenta_2, entrada, entrada_otra_cuenta, peso):
         with CaptureQueriesContext(connection) as ctx:
             precalcular_saldos_cuentas([cuenta, cuenta_2], [peso], movimiento=entrada)
-        assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 1
+        assert queries_a_tabla(ctx.captured_queries, "diario_movimiento") == 1
+        assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 0
 
     def test_numero_de_queries_no_crece_con_cantidad_de_cuentas(
             self, cuenta, cuenta_2, cuenta_3, entrada, entrada_otra_cuenta,
             entrada_tercera_cuenta, peso):
         with CaptureQueriesContext(connection) as ctx:
             precalcular_saldos_cuentas([cuenta, cuenta_2, cuenta_3], [peso], movimiento=entrada)
-        assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 1
+        assert queries_a_tabla(ctx.captured_queries, "diario_movimiento") == 1
+        assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 0
 
-    def test_con_multiples_cuentas_sin_saldo_en_dia_del_movimiento_hace_dos_queries_a_saldo_diario(
+    def test_con_multiples_cuentas_sin_saldo_en_dia_del_movimiento_toma_saldos_de_movimientos_en_una_sola_query(
             self, cuenta, cuenta_2, cuenta_3, entrada, entrada_otra_cuenta,
             salida_tardia_tercera_cuenta, peso):
         with CaptureQueriesContext(connection) as ctx:
             precalcular_saldos_cuentas([cuenta, cuenta_2, cuenta_3], [peso], movimiento=entrada)
-        assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 2
+        assert queries_a_tabla(ctx.captured_queries, "diario_movimiento") == 1
+        assert queries_a_tabla(ctx.captured_queries, "diario_saldodiario") == 0
 
 
 class TestPrecalcularSaldosCuentasCotizacionesPerformance:
@@ -0,0 +1,26 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from utils.helpers_tests import crear_historia, queries_a_tabla
+
+
+class TestRecalcularSaldosDiariosPerformance:
+    def test_numero_de_queries_no_crece_con_cantidad_de_dias(self, cuenta, cuenta_2, fecha):
+        crear_historia(cuenta, fecha, 3)
+        crear_historia(cuenta_2, fecha, 25)
+
+        with CaptureQueriesContext(connection) as ctx_corta:
+            cuenta.recalcular_saldos_diarios()
+        with CaptureQueriesContext(connection) as ctx_larga:
+            cuenta_2.recalcular_saldos_diarios()
+
+        assert len(ctx_larga.captured_queries) == len(ctx_corta.captured_queries)
+
+    def test_escribe_saldos_diarios_con_un_solo_insert(self, cuenta, fecha):
+        crear_historia(cuenta, fecha, 25)
+
+        with CaptureQueriesContext(connection) as ctx:
+            cuenta.recalcular_saldos_diarios()
+
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        assert queries_a_tabla(inserts, "diario_saldodiario") == 1
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from datetime import date
+from datetime import date, timedelta
 
 from django.db.models import QuerySet
 
@@ -11,6 +11,18 @@ def cambiar_fecha(mov: Movimiento, fecha: date):
     mov.clean_save()
 
 
+def crear_historia(
+        cuenta: CuentaInteractiva, fecha: date, cantidad_dias: int, hacia_atras: bool = False) -> list[Movimiento]:
+    """ Crea una entrada de <cuenta> en cada uno de los <cantidad_dias> días
+        posteriores a <fecha> (o anteriores, si hacia_atras es True).
+    """
+    paso = -1 if hacia_atras else 1
+    return Movimiento.crear_muchos([
+        {"concepto": f"Entrada {x}", "importe": 10.1, "cta_entrada": cuenta, "fecha": fecha + timedelta(paso * x)}
+        for x in range(1, cantidad_dias + 1)
+    ])
+
+
 def dividir_en_dos_subcuentas(cuenta: CuentaInteractiva, saldo: float = 0, fecha: date = None) -> CuentaAcumulativa:
     return cuenta.dividir_y_actualizar(
         ['subcuenta 1', 'sc1', saldo],
@@ -19,8 +31,13 @@ def dividir_en_dos_subcuentas(cuenta: CuentaInteractiva, saldo: float = 0, fecha
     )
 
 
-def fecha2page(queryset: QuerySet[Dia], fecha):
-    return (queryset.filter(fecha__gt=fecha).count() // 7) + 1
+def fecha2hasta(queryset: QuerySet[Dia], fecha) -> date:
+    posteriores = [d.fecha for d in queryset.filter(fecha__gt=fecha).order_by("fecha")[:3]]
+    return posteriores[-1] if posteriores else fecha
+
+
+def queries_a_tabla(queries: list[dict], tabla: str) -> int:
+    return sum(1 for q in queries if tabla in q["sql"])
 
 
 def signo(condicion: bool) -> int:
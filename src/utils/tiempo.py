@@ -57,3 +57,13 @@ def str2date(string: str) -> date:
         return datetime.strptime(string, "%Y%m%d").date()
 
     raise ValueError("Cadena mal formateada")
+
+
+def primero_de_mes(fecha: date) -> date:
+    return fecha.replace(day=1)
+
+
+def primero_de_mes_siguiente(fecha: date) -> date:
+    if fecha.month == 12:
+        return date(fecha.year + 1, 1, 1)
+    return date(fecha.year, fecha.month + 1, 1)